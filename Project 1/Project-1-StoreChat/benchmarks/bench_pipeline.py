@@ -0,0 +1,272 @@
+"""
+Scale benchmark for the StoreChat ETL pipeline.
+
+Generates synthetic datasets at each requested scale (see src/generate_data.py),
+times every extract.py function, validateService.clean_dataframe and, with
+--with-db, the repo.py loaders. Results are written as a markdown comparison
+table plus JSON. When --baseline is given the run exits with status 1 if any
+step's throughput dropped by more than --threshold.
+
+Usage (from the project root):
+    python benchmarks/bench_pipeline.py --scales 10000,100000,1000000
+    python benchmarks/bench_pipeline.py --scales 10000 --save-baseline benchmarks/baseline.json
+    python benchmarks/bench_pipeline.py --scales 10000 --baseline benchmarks/baseline.json
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+PROJECT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+SRC_DIR = os.path.join(PROJECT_DIR, "src")
+sys.path.insert(0, SRC_DIR)
+
+import pandas as pd  # noqa: E402
+
+import extract  # noqa: E402
+import generate_data  # noqa: E402
+import validateService  # noqa: E402
+
+
+#--------------------------------TIMING HELPERS------------------------------
+def time_call(fn, setup=None, repeat=1):
+    """Best wall time of `fn(setup())` over `repeat` runs; setup is not timed"""
+    best = None
+    for _ in range(repeat):
+        arg = setup() if setup else None
+        start = time.perf_counter()
+        fn(arg) if setup else fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def count_rows(path):
+    """Data rows in a CSV file, not counting the header"""
+    with open(path, "r", encoding="utf-8") as f:
+        return sum(1 for _ in f) - 1
+
+
+def _result(scale, name, rows, seconds):
+    return {
+        "scale": scale,
+        "name": name,
+        "rows": int(rows),
+        "seconds": round(seconds, 6),
+        "rows_per_sec": round(rows / seconds, 2) if seconds > 0 else float("inf"),
+    }
+
+
+#--------------------------------EXTRACT + VALIDATE------------------------------
+def bench_extract(scale, paths, work_dir, repeat):
+    results = []
+    raw_products = pd.read_csv(paths["products"])
+    raw_sales = pd.read_csv(paths["sales"])
+    n_products, n_sales = len(raw_products), len(raw_sales)
+
+    cleaned_products = extract.clean_column_names(raw_products.copy())
+    typed_products = extract.convert_data_types(cleaned_products.copy())
+    cleaned_sales = extract.clean_column_names(raw_sales.copy())
+    typed_sales = extract.convert_sales_data_types(cleaned_sales.copy())
+    timed_sales = extract.add_time_dimensions(typed_sales.copy())
+
+    steps = [
+        ("clean_column_names[products]", n_products, extract.clean_column_names, lambda: raw_products.copy()),
+        ("convert_data_types", n_products, extract.convert_data_types, lambda: cleaned_products.copy()),
+        ("validate_data", n_products, extract.validate_data, lambda: typed_products),
+        ("add_category_images", n_products, extract.add_category_images, lambda: typed_products.copy()),
+        ("clean_column_names[sales]", n_sales, extract.clean_column_names, lambda: raw_sales.copy()),
+        ("convert_sales_data_types", n_sales, extract.convert_sales_data_types, lambda: cleaned_sales.copy()),
+        ("add_time_dimensions", n_sales, extract.add_time_dimensions, lambda: typed_sales.copy()),
+        ("validate_sales_data", n_sales, extract.validate_sales_data, lambda: timed_sales),
+        ("deduplicate_sales", n_sales, extract.deduplicate_sales, lambda: timed_sales),
+        ("aggregate_store_sales", n_sales, extract.aggregate_store_sales, lambda: timed_sales),
+    ]
+    for name, rows, fn, setup in steps:
+        results.append(_result(scale, name, rows, time_call(fn, setup, repeat)))
+
+    summary = extract.aggregate_store_sales(timed_sales)
+    seconds = time_call(extract.validate_store_sales_summary, lambda: summary, repeat)
+    results.append(_result(scale, "validate_store_sales_summary", len(summary), seconds))
+
+    products_out = os.path.join(work_dir, "products_with_images.csv")
+    sales_out = os.path.join(work_dir, "sales_processed.csv")
+    summary_out = os.path.join(work_dir, "store_sales_summary.csv")
+    seconds = time_call(lambda: extract.process_products(paths["products"], products_out), repeat=repeat)
+    results.append(_result(scale, "process_products", n_products, seconds))
+    seconds = time_call(lambda: extract.process_sales(paths["sales"], sales_out), repeat=repeat)
+    results.append(_result(scale, "process_sales", n_sales, seconds))
+    seconds = time_call(lambda: extract.process_store_sales_summary(sales_out, summary_out), repeat=repeat)
+    results.append(_result(scale, "process_store_sales_summary", n_sales, seconds))
+    return results
+
+
+def bench_clean_dataframe(scale, work_dir, repeat, max_rows):
+    """clean_dataframe walks rows in Python, so large scales are capped at max_rows"""
+    sales = pd.read_csv(os.path.join(work_dir, "sales_processed.csv"), nrows=max_rows)
+    products = pd.read_csv(os.path.join(work_dir, "products_with_images.csv"))
+    return [
+        _result(scale, "clean_dataframe[sales]", len(sales),
+                time_call(lambda df: validateService.clean_dataframe(df, False), lambda: sales.copy(), repeat)),
+        _result(scale, "clean_dataframe[products]", len(products),
+                time_call(lambda df: validateService.clean_dataframe(df, True), lambda: products.copy(), repeat)),
+    ]
+
+
+#--------------------------------LOADERS------------------------------
+def bench_loaders(scale, work_dir, paths):
+    """Time the repo.py loaders against the database configured by PG* env vars"""
+    import shutil
+    import repo
+
+    shutil.copy(paths["category"], os.path.join(work_dir, "category.csv"))
+    shutil.copy(paths["stores"], os.path.join(work_dir, "stores.csv"))
+    repo.DATASET_DIR = work_dir
+
+    cwd = os.getcwd()
+    os.chdir(SRC_DIR)  # init_db resolves ../schema.sql relative to src/
+    try:
+        repo.init_db()
+        with repo.get_conn() as conn, conn.cursor() as cur:
+            cur.execute("TRUNCATE sales, store_sales_summary, products, categories, stores, rejected_fields CASCADE")
+            conn.commit()
+
+        nested = {}
+        originals = {}
+        for name in ("load_stores", "load_sales", "load_store_sales_summary"):
+            originals[name] = getattr(repo, name)
+
+            def timed(name=name):
+                start = time.perf_counter()
+                originals[name]()
+                nested[name] = time.perf_counter() - start
+            setattr(repo, name, timed)
+        try:
+            total = time_call(repo.load_data)
+        finally:
+            for name, fn in originals.items():
+                setattr(repo, name, fn)
+    finally:
+        os.chdir(cwd)
+
+    sales_rows = count_rows(os.path.join(work_dir, "sales_processed.csv"))
+    summary_rows = count_rows(os.path.join(work_dir, "store_sales_summary.csv"))
+    product_rows = count_rows(os.path.join(work_dir, "products_with_images.csv"))
+    store_rows = count_rows(paths["stores"])
+    return [
+        _result(scale, "load_categories_products", product_rows, total - sum(nested.values())),
+        _result(scale, "load_stores", store_rows, nested["load_stores"]),
+        _result(scale, "load_sales", sales_rows, nested["load_sales"]),
+        _result(scale, "load_store_sales_summary", summary_rows, nested["load_store_sales_summary"]),
+    ]
+
+
+#--------------------------------REPORTING------------------------------
+def compare_to_baseline(results, baseline, threshold, min_seconds=0.01):
+    """
+    Return the steps whose throughput fell more than `threshold` below baseline.
+    Steps faster than `min_seconds` in both runs are reported but never fail the
+    run, since sub-millisecond timings are mostly noise.
+    """
+    previous = {(r["scale"], r["name"]): r for r in baseline}
+    regressions = []
+    for r in results:
+        base = previous.get((r["scale"], r["name"]))
+        if not base or not base["rows_per_sec"]:
+            continue
+        change = r["rows_per_sec"] / base["rows_per_sec"] - 1
+        r["baseline_rows_per_sec"] = base["rows_per_sec"]
+        r["change"] = round(change, 4)
+        if max(r["seconds"], base["seconds"]) < min_seconds:
+            continue
+        if change < -threshold:
+            regressions.append(r)
+    return regressions
+
+
+def format_table(results):
+    with_baseline = any("change" in r for r in results)
+    header = "| scale | step | rows | seconds | rows/sec |"
+    divider = "|---:|---|---:|---:|---:|"
+    if with_baseline:
+        header += " baseline rows/sec | change |"
+        divider += "---:|---:|"
+    lines = [header, divider]
+    for r in results:
+        line = f"| {r['scale']:,} | {r['name']} | {r['rows']:,} | {r['seconds']:.4f} | {r['rows_per_sec']:,.0f} |"
+        if with_baseline:
+            if "change" in r:
+                line += f" {r['baseline_rows_per_sec']:,.0f} | {r['change']:+.1%} |"
+            else:
+                line += " - | - |"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the StoreChat pipeline at several scales")
+    parser.add_argument("--scales", default="10000,100000", help="Comma separated sales row counts")
+    parser.add_argument("--dirty-rate", type=float, default=0.01)
+    parser.add_argument("--repeat", type=int, default=1, help="Report the best of N runs")
+    parser.add_argument("--clean-max-rows", type=int, default=200_000,
+                        help="Row cap for clean_dataframe, which iterates rows in Python")
+    parser.add_argument("--data-dir", default=None, help="Where generated datasets are kept (default: temp dir)")
+    parser.add_argument("--output-dir", default=os.path.join(PROJECT_DIR, "benchmarks", "results"))
+    parser.add_argument("--with-db", action="store_true", help="Also time the repo.py loaders (needs PG* env vars)")
+    parser.add_argument("--baseline", help="JSON results of a previous run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed throughput drop, e.g. 0.2 = 20%%")
+    parser.add_argument("--min-seconds", type=float, default=0.01,
+                        help="Steps faster than this are too noisy to fail the run")
+    parser.add_argument("--save-baseline", help="Write this run's results to the given JSON path")
+    args = parser.parse_args(argv)
+
+    scales = [int(s) for s in args.scales.split(",") if s.strip()]
+    data_dir = args.data_dir or tempfile.mkdtemp(prefix="storechat_bench_")
+    results = []
+    for scale in scales:
+        scale_dir = os.path.join(data_dir, f"sales_{scale}")
+        if not os.path.exists(os.path.join(scale_dir, "sales.csv")):
+            print(f"Generating {scale:,} sales rows in {scale_dir}")
+            generate_data.generate_dataset(scale_dir, n_sales=scale, dirty_rate=args.dirty_rate)
+        paths = {name: os.path.join(scale_dir, f"{name}.csv") for name in ("category", "products", "stores", "sales")}
+        work_dir = os.path.join(scale_dir, "work")
+        os.makedirs(work_dir, exist_ok=True)
+
+        print(f"Benchmarking scale {scale:,}")
+        results += bench_extract(scale, paths, work_dir, args.repeat)
+        results += bench_clean_dataframe(scale, work_dir, args.repeat, args.clean_max_rows)
+        if args.with_db:
+            results += bench_loaders(scale, work_dir, paths)
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            regressions = compare_to_baseline(
+                results, json.load(f)["results"], args.threshold, args.min_seconds
+            )
+
+    table = format_table(results)
+    os.makedirs(args.output_dir, exist_ok=True)
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    with open(os.path.join(args.output_dir, f"bench_{stamp}.md"), "w", encoding="utf-8") as f:
+        f.write(table + "\n")
+    with open(os.path.join(args.output_dir, f"bench_{stamp}.json"), "w", encoding="utf-8") as f:
+        json.dump({"created_at": stamp, "results": results}, f, indent=2)
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump({"created_at": stamp, "results": results}, f, indent=2)
+
+    print(table)
+    if regressions:
+        print(f"\n{len(regressions)} step(s) regressed more than {args.threshold:.0%}:")
+        for r in regressions:
+            print(f"  {r['name']} @ {r['scale']:,}: {r['change']:+.1%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+"""
+CSV reader benchmark: default pd.read_csv (types inferred, then cast as the
+callers do) against readers.read_dataset (declared types, optional column
+pruning) on the pandas C engine and on pyarrow.
+
+Generates the sales file at each scale (see src/generate_data.py), derives
+sales_processed.csv from it, and writes a markdown table plus JSON to
+benchmarks/results/.
+
+Usage (from the project root):
+    python benchmarks/bench_readers.py --scales 1000000,5000000 --repeat 3
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+from datetime import datetime
+
+PROJECT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+SRC_DIR = os.path.join(PROJECT_DIR, "src")
+sys.path.insert(0, SRC_DIR)
+
+import pandas as pd  # noqa: E402
+
+import extract  # noqa: E402
+import generate_data  # noqa: E402
+import readers  # noqa: E402
+from bench_pipeline import _result, time_call  # noqa: E402
+
+
+#--------------------------------READERS------------------------------
+def default_sales(path, columns=None):
+    """What the dashboard did before: infer every column, then parse the date"""
+    df = pd.read_csv(path)
+    df['sale_date'] = pd.to_datetime(df['sale_date'], format='%d-%m-%Y', errors='coerce')
+    return df[columns] if columns else df
+
+def typed_sales(engine, columns=None):
+    def read(path):
+        df = readers.read_dataset("sales", path, columns, engine=engine)
+        if 'sale_date' in df:
+            df['sale_date'] = pd.to_datetime(df['sale_date'], format='%d-%m-%Y', errors='coerce')
+        return df
+    return read
+
+def default_processed(path):
+    df = pd.read_csv(path)
+    df['sale_date'] = pd.to_datetime(df['sale_date'], format='%Y-%m-%d', errors='coerce')
+    return df
+
+def typed_processed(engine, columns=None):
+    return lambda path: readers.read_dataset("sales_processed", path, columns, engine=engine)
+
+
+#--------------------------------BENCHMARK------------------------------
+def bench_readers(scale, sales_path, processed_path, repeat):
+    pruned = ['store_id', 'quantity']
+    engines = ["c"] + (["pyarrow"] if readers.pa_csv is not None else [])
+    cases = [("sales.csv default", default_sales, sales_path),
+             (f"sales.csv default [{','.join(pruned)}]", lambda p: default_sales(p, pruned), sales_path)]
+    for engine in engines:
+        cases += [(f"sales.csv typed {engine}", typed_sales(engine), sales_path),
+                  (f"sales.csv typed {engine} [{','.join(pruned)}]", typed_sales(engine, pruned), sales_path)]
+    cases.append(("sales_processed.csv default", default_processed, processed_path))
+    for engine in engines:
+        cases += [(f"sales_processed.csv typed {engine}", typed_processed(engine), processed_path),
+                  (f"sales_processed.csv typed {engine} [summary columns]",
+                   typed_processed(engine, extract.SUMMARY_INPUT_COLUMNS), processed_path)]
+
+    results = []
+    for name, read, path in cases:
+        frame = read(path)
+        seconds = time_call(lambda: read(path), repeat=repeat)
+        result = _result(scale, name, len(frame), seconds)
+        result["frame_mb"] = round(frame.memory_usage(deep=True).sum() / 2**20, 1)
+        results.append(result)
+    return results
+
+def format_table(results):
+    lines = ["| scale | read | rows | seconds | rows/sec | frame MB |", "|---:|---|---:|---:|---:|---:|"]
+    for r in results:
+        lines.append(f"| {r['scale']:,} | {r['name']} | {r['rows']:,} | {r['seconds']:.4f} "
+                     f"| {r['rows_per_sec']:,.0f} | {r['frame_mb']:,.1f} |")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark typed CSV reading against default pd.read_csv")
+    parser.add_argument("--scales", default="1000000", help="Comma separated sales row counts")
+    parser.add_argument("--dirty-rate", type=float, default=0.01)
+    parser.add_argument("--repeat", type=int, default=3, help="Report the best of N runs")
+    parser.add_argument("--data-dir", default=None, help="Where generated datasets are kept (default: temp dir)")
+    parser.add_argument("--output-dir", default=os.path.join(PROJECT_DIR, "benchmarks", "results"))
+    args = parser.parse_args(argv)
+
+    data_dir = args.data_dir or tempfile.mkdtemp(prefix="storechat_bench_")
+    results = []
+    for scale in [int(s) for s in args.scales.split(",") if s.strip()]:
+        scale_dir = os.path.join(data_dir, f"sales_{scale}")
+        sales_path = os.path.join(scale_dir, "sales.csv")
+        if not os.path.exists(sales_path):
+            print(f"Generating {scale:,} sales rows in {scale_dir}")
+            generate_data.generate_dataset(scale_dir, n_sales=scale, dirty_rate=args.dirty_rate)
+        processed_path = os.path.join(scale_dir, "work", "sales_processed.csv")
+        if not os.path.exists(processed_path):
+            os.makedirs(os.path.dirname(processed_path), exist_ok=True)
+            extract.process_sales(sales_path, processed_path)
+
+        print(f"Benchmarking scale {scale:,}")
+        results += bench_readers(scale, sales_path, processed_path, args.repeat)
+
+    table = format_table(results)
+    os.makedirs(args.output_dir, exist_ok=True)
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    with open(os.path.join(args.output_dir, f"readers_{stamp}.md"), "w", encoding="utf-8") as f:
+        f.write(table + "\n")
+    with open(os.path.join(args.output_dir, f"readers_{stamp}.json"), "w", encoding="utf-8") as f:
+        json.dump({"created_at": stamp, "results": results}, f, indent=2)
+    print(table)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,205 @@
+"""
+Sales table layout benchmark: the wide `sales` table of schema.sql against
+the compact layout of schema_compact.sql and the monthly partitions of
+schema_partitioned.sql (repo.SCHEMA_FILES), each under the
+B-tree or the time-range (BRIN + covering) sales indexes (repo.INDEX_FILES).
+
+For each combination the sales table is dropped and recreated in the database
+named by the PG* environment variables, the generated dataset is loaded with
+the repo.py loaders, and the run records load_sales time, WAL written, heap
+and index size, and the latency of the dashboard's sales queries (uncached).
+Writes a markdown table plus JSON to benchmarks/results/.
+
+Only point it at a scratch database: it truncates every StoreChat table.
+
+Usage (from the project root):
+    python benchmarks/bench_schema.py --scales 100000 --layouts wide,compact,partitioned --indexes btree,time_range
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+PROJECT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+SRC_DIR = os.path.join(PROJECT_DIR, "src")
+sys.path.insert(0, SRC_DIR)
+
+import extract  # noqa: E402
+import generate_data  # noqa: E402
+import readers  # noqa: E402
+import repo  # noqa: E402
+from bench_pipeline import time_call  # noqa: E402
+from dashboard_pg import PostgresDashboardService  # noqa: E402
+
+# Relations holding sales rows in each layout
+SALES_RELATIONS = {
+    "wide": ("sales",),
+    "compact": ("sales_compact", "store_keys", "product_keys"),
+    "partitioned": ("sales",),
+}
+
+
+#--------------------------------DATABASE------------------------------
+def execute(sql, params=None, fetch=False):
+    with repo.get_conn() as conn, conn.cursor() as cur:
+        cur.execute(sql, params)
+        rows = cur.fetchall() if fetch else None
+        conn.commit()
+    return rows
+
+def reset_database(layout, indexes):
+    """Drop the sales table in whatever layout it is, then create `layout` empty with `indexes`"""
+    execute("""
+        DO $$ BEGIN
+            IF (SELECT relkind FROM pg_class WHERE oid = to_regclass('sales')) = 'v' THEN DROP VIEW sales; END IF;
+        END $$;
+        DROP TABLE IF EXISTS sales, sales_compact, store_keys, product_keys;
+    """)
+    repo.init_db(layout, indexes)
+    execute("TRUNCATE sales_compact, store_keys, product_keys" if layout == "compact" else "TRUNCATE sales")
+    execute("TRUNCATE store_sales_summary, products, categories, stores, rejected_fields CASCADE")
+
+def vacuum_analyze(relations):
+    conn = repo.get_conn()
+    try:
+        conn.autocommit = True
+        with conn.cursor() as cur:
+            for relation in relations:
+                cur.execute(f"VACUUM (ANALYZE) {relation}")
+    finally:
+        conn.close()
+
+def relation_sizes(relations):
+    rows = execute("""
+        SELECT SUM(pg_table_size(oid))::float8, SUM(pg_indexes_size(oid))::float8
+        FROM pg_class
+        WHERE relkind = 'r' AND (relname = ANY(%s)
+              OR oid IN (SELECT inhrelid FROM pg_inherits WHERE inhparent = to_regclass('sales')))
+    """, (list(relations),), fetch=True)
+    return {"heap_mb": round(rows[0][0] / 2**20, 2), "index_mb": round(rows[0][1] / 2**20, 2)}
+
+
+#--------------------------------BENCHMARK------------------------------
+def load_layout(layout, indexes):
+    """Load every table, timing load_sales and the WAL it writes"""
+    reset_database(layout, indexes)
+    repo.load_categories()
+    repo.load_products()
+    repo.load_stores()
+    before = execute("SELECT pg_current_wal_lsn()", fetch=True)[0][0]
+    start = time.perf_counter()
+    repo.load_sales()
+    seconds = time.perf_counter() - start
+    wal = execute("SELECT pg_wal_lsn_diff(pg_current_wal_lsn(), %s)", (before,), fetch=True)[0][0]
+    repo.load_store_sales_summary()
+    return seconds, round(float(wal) / 2**20, 2)
+
+def query_cases(service):
+    """(name, call) pairs for the dashboard's queries over the sales table, bypassing the result cache"""
+    (year, store_id), = execute("""
+        SELECT sale_year, store_id FROM sales GROUP BY 1, 2 ORDER BY COUNT(*) DESC, 1, 2 LIMIT 1
+    """, fetch=True)
+    year = int(year)
+    uncached = lambda name: getattr(PostgresDashboardService, name).__wrapped__
+    return [
+        ("revenue_by_store(year)", lambda: uncached("get_revenue_by_store")(service, year)),
+        ("revenue_by_month(year, store)", lambda: uncached("get_revenue_by_month")(service, year, store_id)),
+        ("daily_sales(store)", lambda: uncached("get_daily_sales")(service, store_id, None)),
+        ("daily_sales(store, year)", lambda: uncached("get_daily_sales")(service, store_id, year)),
+        ("sales_page(store, by date)", lambda: uncached("get_sales_page")(
+            service, page=1, page_size=100, sort_by="sale_date", store_id=store_id)),
+        ("top_n(product, units, year)", lambda: uncached("top_n")(service, "product_id", "units", year, 10)),
+    ]
+
+def bench_layout(scale, layout, indexes, work_dir, repeat):
+    seconds, wal_mb = load_layout(layout, indexes)
+    vacuum_analyze(SALES_RELATIONS[layout])
+    rows = execute("SELECT COUNT(*) FROM sales", fetch=True)[0][0]
+    result = {
+        "scale": scale, "layout": layout, "indexes": indexes, "rows": rows,
+        "load_seconds": round(seconds, 4), "load_rows_per_sec": round(rows / seconds, 2),
+        "wal_mb": wal_mb, **relation_sizes(SALES_RELATIONS[layout]), "queries_ms": {},
+    }
+    if layout == "partitioned":
+        (month,), = execute("SELECT date_trunc('month', MAX(sale_date))::date FROM sales", fetch=True)
+        sales = readers.read_dataset("sales_processed", dataset_dir=work_dir)
+        result["replace_month_seconds"] = round(time_call(lambda: repo.replace_sales_month(month.year, month.month, sales)), 4)
+    service = PostgresDashboardService(dataset_path=work_dir, disk_cache=False)
+    for name, call in query_cases(service):
+        call()  # warm the buffer cache
+        result["queries_ms"][name] = round(time_call(call, repeat=repeat) * 1000, 3)
+    return result
+
+def format_table(results):
+    queries = list(results[0]["queries_ms"]) if results else []
+    replaces = any("replace_month_seconds" in r for r in results)
+    header = "| scale | layout | indexes | rows | load s | rows/sec | WAL MB | heap MB | index MB | " + \
+             " | ".join(f"{q} ms" for q in queries) + " |" + (" replace month s |" if replaces else "")
+    lines = [header, "|---:|---|---|" + "---:|" * (6 + len(queries) + replaces)]
+    for r in results:
+        line = (f"| {r['scale']:,} | {r['layout']} | {r['indexes']} | {r['rows']:,} | {r['load_seconds']:.2f} "
+                f"| {r['load_rows_per_sec']:,.0f} | {r['wal_mb']:,.1f} | {r['heap_mb']:,.1f} | {r['index_mb']:,.1f} | "
+                + " | ".join(f"{r['queries_ms'][q]:.2f}" for q in queries) + " |")
+        if replaces:
+            line += f" {r['replace_month_seconds']:.3f} |" if "replace_month_seconds" in r else " - |"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the sales table layouts and index options")
+    parser.add_argument("--scales", default="100000", help="Comma separated sales row counts")
+    parser.add_argument("--layouts", default="wide,compact", help=f"Comma separated, from {sorted(repo.SCHEMA_FILES)}")
+    parser.add_argument("--indexes", default="btree", help=f"Comma separated, from {sorted(repo.INDEX_FILES)}")
+    parser.add_argument("--dirty-rate", type=float, default=0.0)
+    parser.add_argument("--repeat", type=int, default=5, help="Report the best of N query runs")
+    parser.add_argument("--data-dir", default=None, help="Where generated datasets are kept (default: temp dir)")
+    parser.add_argument("--output-dir", default=os.path.join(PROJECT_DIR, "benchmarks", "results"))
+    args = parser.parse_args(argv)
+
+    data_dir = args.data_dir or tempfile.mkdtemp(prefix="storechat_bench_")
+    layouts = [layout for layout in args.layouts.split(",") if layout.strip()]
+    index_options = [indexes for indexes in args.indexes.split(",") if indexes.strip()]
+    results = []
+    cwd = os.getcwd()
+    os.chdir(SRC_DIR)  # init_db resolves ../schema*.sql relative to src/
+    try:
+        for scale in [int(s) for s in args.scales.split(",") if s.strip()]:
+            scale_dir = os.path.join(data_dir, f"sales_{scale}")
+            work_dir = os.path.join(scale_dir, "work")
+            if not os.path.exists(os.path.join(work_dir, "store_sales_summary.csv")):
+                print(f"Generating {scale:,} sales rows in {scale_dir}")
+                paths = generate_data.generate_dataset(scale_dir, n_sales=scale, dirty_rate=args.dirty_rate)
+                os.makedirs(work_dir, exist_ok=True)
+                shutil.copy(paths["category"], os.path.join(work_dir, "category.csv"))
+                shutil.copy(paths["stores"], os.path.join(work_dir, "stores.csv"))
+                extract.process_products(paths["products"], os.path.join(work_dir, "products_with_images.csv"))
+                extract.process_sales(paths["sales"], os.path.join(work_dir, "sales_processed.csv"))
+                extract.process_store_sales_summary(os.path.join(work_dir, "sales_processed.csv"),
+                                                    os.path.join(work_dir, "store_sales_summary.csv"))
+            repo.DATASET_DIR = work_dir
+            for layout in layouts:
+                for indexes in index_options:
+                    print(f"Benchmarking the {layout} layout with {indexes} indexes at {scale:,} rows")
+                    results.append(bench_layout(scale, layout, indexes, work_dir, args.repeat))
+    finally:
+        os.chdir(cwd)
+        repo.close_pool()
+
+    table = format_table(results)
+    os.makedirs(args.output_dir, exist_ok=True)
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    with open(os.path.join(args.output_dir, f"schema_{stamp}.md"), "w", encoding="utf-8") as f:
+        f.write(table + "\n")
+    with open(os.path.join(args.output_dir, f"schema_{stamp}.json"), "w", encoding="utf-8") as f:
+        json.dump({"created_at": stamp, "results": results}, f, indent=2)
+    print(table)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
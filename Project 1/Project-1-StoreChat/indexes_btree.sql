@@ -0,0 +1,19 @@
+-- Default sales indexes (SALES_INDEXES=btree, see repo.init_db): plain B-trees
+-- on sale_date, store, product and (sale_year, sale_month). Runs after the
+-- schema files and replaces the indexes of indexes_time_range.sql if present.
+DROP INDEX IF EXISTS idx_sales_date_brin, idx_sales_store_date;
+
+DO $$
+BEGIN
+    IF to_regclass('sales_compact') IS NOT NULL THEN
+        CREATE INDEX IF NOT EXISTS idx_sales_date ON sales_compact(sale_date);
+        CREATE INDEX IF NOT EXISTS idx_sales_store ON sales_compact(store_key);
+        CREATE INDEX IF NOT EXISTS idx_sales_product ON sales_compact(product_key);
+        CREATE INDEX IF NOT EXISTS idx_sales_year_month ON sales_compact(sale_year, sale_month);
+    ELSE
+        CREATE INDEX IF NOT EXISTS idx_sales_date ON sales(sale_date);
+        CREATE INDEX IF NOT EXISTS idx_sales_store ON sales(store_id);
+        CREATE INDEX IF NOT EXISTS idx_sales_product ON sales(product_id);
+        CREATE INDEX IF NOT EXISTS idx_sales_year_month ON sales(sale_year, sale_month);
+    END IF;
+END $$;
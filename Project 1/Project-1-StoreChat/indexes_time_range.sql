@@ -0,0 +1,26 @@
+-- Time-range sales indexes (SALES_INDEXES=time_range, see repo.init_db), for
+-- "store X over dates Y" queries. Runs after the schema files.
+--
+-- idx_sales_date_brin: a BRIN index keeps the min/max sale_date per range of
+-- heap pages. Sales are appended in date order, so it is a few pages in size
+-- and still narrows a date range to the pages holding it. Replaces the
+-- sale_date B-tree.
+-- idx_sales_store_date: (store, sale_date) with quantity and product as
+-- payload, so per-store date-range sums and product joins are answered by an
+-- index-only scan. Its leading column replaces the store B-tree.
+DROP INDEX IF EXISTS idx_sales_date, idx_sales_store;
+
+DO $$
+BEGIN
+    IF to_regclass('sales_compact') IS NOT NULL THEN
+        CREATE INDEX IF NOT EXISTS idx_sales_date_brin ON sales_compact USING brin (sale_date);
+        CREATE INDEX IF NOT EXISTS idx_sales_store_date ON sales_compact(store_key, sale_date) INCLUDE (quantity, product_key);
+        CREATE INDEX IF NOT EXISTS idx_sales_product ON sales_compact(product_key);
+        CREATE INDEX IF NOT EXISTS idx_sales_year_month ON sales_compact(sale_year, sale_month);
+    ELSE
+        CREATE INDEX IF NOT EXISTS idx_sales_date_brin ON sales USING brin (sale_date);
+        CREATE INDEX IF NOT EXISTS idx_sales_store_date ON sales(store_id, sale_date) INCLUDE (quantity, product_id);
+        CREATE INDEX IF NOT EXISTS idx_sales_product ON sales(product_id);
+        CREATE INDEX IF NOT EXISTS idx_sales_year_month ON sales(sale_year, sale_month);
+    END IF;
+END $$;
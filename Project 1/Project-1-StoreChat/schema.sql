@@ -62,10 +62,7 @@ CREATE TABLE IF NOT EXISTS store_sales_summary (
 );
 
 --------------------------------INDECES------------------------------
-CREATE INDEX IF NOT EXISTS idx_sales_date ON sales(sale_date);
-CREATE INDEX IF NOT EXISTS idx_sales_store ON sales(store_id);
-CREATE INDEX IF NOT EXISTS idx_sales_product ON sales(product_id);
-CREATE INDEX IF NOT EXISTS idx_sales_year_month ON sales(sale_year, sale_month);
+-- Sales indexes are created by indexes_btree.sql or indexes_time_range.sql (SALES_INDEXES, see repo.init_db)
 CREATE INDEX IF NOT EXISTS idx_store_sales_store ON store_sales_summary(store_id);
 CREATE INDEX IF NOT EXISTS idx_store_sales_year_month ON store_sales_summary(sale_year, sale_month);
 CREATE INDEX IF NOT EXISTS idx_products_category ON products (category_id);
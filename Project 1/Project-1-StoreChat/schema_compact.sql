@@ -0,0 +1,64 @@
+-- Compact sales layout. Runs after schema.sql (SALES_LAYOUT=compact, see repo.init_db).
+--
+-- Rows live in sales_compact: store and product codes are replaced by 2- and
+-- 4-byte keys from store_keys/product_keys, year/month/day-of-week are
+-- smallints generated from sale_date, and quarter, day name and ISO week are
+-- derived by the `sales` view, which keeps the old column names for readers.
+-- An existing wide `sales` table is copied into sales_compact and dropped,
+-- all in the one transaction init_db runs this file in. Safe to run again.
+-- The index file for SALES_INDEXES runs next and indexes sales_compact.
+
+--------------------------------KEY LOOKUPS------------------------------
+CREATE TABLE IF NOT EXISTS store_keys (
+    store_key SMALLINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+    store_id VARCHAR(255) NOT NULL UNIQUE REFERENCES stores(store_id)
+);
+
+CREATE TABLE IF NOT EXISTS product_keys (
+    product_key INT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+    product_id VARCHAR(255) NOT NULL UNIQUE REFERENCES products(product_id)
+);
+
+--------------------------------SALES------------------------------
+-- Fixed-width columns first, widest first, so no alignment padding is needed
+CREATE TABLE IF NOT EXISTS sales_compact (
+    sale_date DATE NOT NULL,
+    product_key INT NOT NULL REFERENCES product_keys(product_key),
+    quantity INT NOT NULL CHECK (quantity > 0),
+    store_key SMALLINT NOT NULL REFERENCES store_keys(store_key),
+    sale_year SMALLINT GENERATED ALWAYS AS (EXTRACT(YEAR FROM sale_date)::smallint) STORED,
+    sale_month SMALLINT GENERATED ALWAYS AS (EXTRACT(MONTH FROM sale_date)::smallint) STORED,
+    -- ISO day of week, 1 = Monday
+    sale_day_of_week SMALLINT GENERATED ALWAYS AS (EXTRACT(ISODOW FROM sale_date)::smallint) STORED,
+    sale_id VARCHAR(255) PRIMARY KEY
+);
+
+--------------------------------MIGRATION FROM THE WIDE TABLE------------------------------
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_class WHERE oid = to_regclass('sales') AND relkind = 'p') THEN
+        RAISE EXCEPTION 'sales is partitioned; schema_compact.sql only migrates the wide table';
+    END IF;
+    IF EXISTS (SELECT 1 FROM pg_class WHERE oid = to_regclass('sales') AND relkind = 'r') THEN
+        INSERT INTO store_keys (store_id) SELECT DISTINCT store_id FROM sales ORDER BY store_id;
+        INSERT INTO product_keys (product_id) SELECT DISTINCT product_id FROM sales ORDER BY product_id;
+        INSERT INTO sales_compact (sale_date, product_key, quantity, store_key, sale_id)
+        SELECT s.sale_date, p.product_key, s.quantity, st.store_key, s.sale_id
+        FROM sales s
+        JOIN store_keys st ON st.store_id = s.store_id
+        JOIN product_keys p ON p.product_id = s.product_id
+        ORDER BY s.sale_date, s.sale_id
+        ON CONFLICT (sale_id) DO NOTHING;
+        DROP TABLE sales;
+    END IF;
+END $$;
+
+CREATE OR REPLACE VIEW sales AS
+SELECT s.sale_id, s.sale_date, st.store_id, p.product_id, s.quantity,
+       s.sale_year, s.sale_month,
+       EXTRACT(QUARTER FROM s.sale_date)::int AS sale_quarter,
+       to_char(s.sale_date, 'FMDay') AS sale_day_of_week,
+       EXTRACT(WEEK FROM s.sale_date)::int AS sale_week
+FROM sales_compact s
+JOIN store_keys st ON st.store_key = s.store_key
+JOIN product_keys p ON p.product_key = s.product_key;
@@ -0,0 +1,78 @@
+-- Partitioned sales layout. Runs after schema.sql (SALES_LAYOUT=partitioned, see repo.init_db).
+--
+-- sales keeps the wide columns but is PARTITION BY RANGE (sale_date), one
+-- partition per month named sales_yYYYYmMM. Partitions are created on demand
+-- by ensure_sales_partition(day), which load_sales calls before writing a
+-- month's rows straight into its partition; repo.replace_sales_month swaps a
+-- whole month by detaching and attaching partitions. Queries filtering on a
+-- sale_date range only scan the months in it.
+--
+-- The primary key has to include the partition key, so it is
+-- (sale_id, sale_date): the database only rejects a repeated sale_id on the
+-- same day, and extract.py already drops duplicate sale ids. An existing wide
+-- sales table is copied into monthly partitions and dropped, in the one
+-- transaction init_db runs this file in. Safe to run again. The index file
+-- for SALES_INDEXES runs next and creates partitioned indexes, which every
+-- partition inherits.
+
+--------------------------------MIGRATION FROM THE WIDE TABLE------------------------------
+DO $$
+BEGIN
+    IF to_regclass('sales_compact') IS NOT NULL THEN
+        RAISE EXCEPTION 'sales is in the compact layout; schema_partitioned.sql only migrates the wide table';
+    END IF;
+    IF (SELECT relkind FROM pg_class WHERE oid = to_regclass('sales')) = 'r' THEN
+        ALTER TABLE sales RENAME TO sales_unpartitioned;
+        ALTER TABLE sales_unpartitioned RENAME CONSTRAINT sales_pkey TO sales_unpartitioned_pkey;
+        -- Free the index names for the partitioned indexes
+        DROP INDEX IF EXISTS idx_sales_date, idx_sales_store, idx_sales_product, idx_sales_year_month,
+                             idx_sales_date_brin, idx_sales_store_date;
+    END IF;
+END $$;
+
+--------------------------------SALES------------------------------
+CREATE TABLE IF NOT EXISTS sales (
+    sale_id VARCHAR(255) NOT NULL,
+    sale_date DATE NOT NULL,
+    store_id VARCHAR(255) NOT NULL,
+    product_id VARCHAR(255) NOT NULL,
+    quantity INT NOT NULL CHECK (quantity > 0),
+    sale_year INT NOT NULL,
+    sale_month INT NOT NULL CHECK (sale_month BETWEEN 1 AND 12),
+    sale_quarter INT NOT NULL CHECK (sale_quarter BETWEEN 1 AND 4),
+    sale_day_of_week VARCHAR(20) NOT NULL,
+    sale_week INT NOT NULL CHECK (sale_week BETWEEN 1 AND 53),
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+
+    PRIMARY KEY (sale_id, sale_date),
+    FOREIGN KEY (store_id) REFERENCES stores(store_id),
+    FOREIGN KEY (product_id) REFERENCES products(product_id)
+) PARTITION BY RANGE (sale_date);
+
+-- The partition holding `day`, created if missing
+CREATE OR REPLACE FUNCTION ensure_sales_partition(day DATE) RETURNS regclass AS $$
+DECLARE
+    first_day DATE := date_trunc('month', day)::date;
+    name TEXT := 'sales_y' || to_char(day, 'YYYY') || 'm' || to_char(day, 'MM');
+BEGIN
+    IF to_regclass(name) IS NULL THEN
+        EXECUTE format('CREATE TABLE %I PARTITION OF sales FOR VALUES FROM (%L) TO (%L)',
+                       name, first_day, (first_day + INTERVAL '1 month')::date);
+    END IF;
+    RETURN name::regclass;
+END $$ LANGUAGE plpgsql;
+
+DO $$
+BEGIN
+    IF to_regclass('sales_unpartitioned') IS NOT NULL THEN
+        PERFORM ensure_sales_partition(month)
+        FROM (SELECT DISTINCT date_trunc('month', sale_date)::date AS month FROM sales_unpartitioned) months;
+        INSERT INTO sales (sale_id, sale_date, store_id, product_id, quantity, sale_year, sale_month,
+                           sale_quarter, sale_day_of_week, sale_week, created_at)
+        SELECT sale_id, sale_date, store_id, product_id, quantity, sale_year, sale_month,
+               sale_quarter, sale_day_of_week, sale_week, created_at
+        FROM sales_unpartitioned
+        ORDER BY sale_date, sale_id;
+        DROP TABLE sales_unpartitioned;
+    END IF;
+END $$;
@@ -1,14 +1,185 @@
-from flask import Flask, request, jsonify
-from repo import init_db, load_data
+import os
+import gzip
+import json
+import hashlib
+from flask import Flask, request, jsonify, Response, stream_with_context
+
+try:
+    from src.repo import init_db, load_data
+    from src.dashboard_service import create_dashboard_service
+    from src.export import EXPORT_FORMATS, stream_sales
+except ImportError:
+    from repo import init_db, load_data
+    from dashboard_service import create_dashboard_service
+    from export import EXPORT_FORMATS, stream_sales
+
+# Backend for the analytics API: "postgres" (pooled repo connections) or "csv"
+API_BACKEND = os.getenv("API_BACKEND", "postgres")
+API_HOST = os.getenv("API_HOST", "127.0.0.1")
+API_PORT = int(os.getenv("API_PORT", "8000"))
+# Responses larger than this are gzipped when the client accepts it
+GZIP_MIN_BYTES = int(os.getenv("API_GZIP_MIN_BYTES", "1024"))
+
+app = Flask(__name__)
+
+#--------------------------------HELPERS------------------------------
+def get_service():
+    """DashboardService shared by all requests; set app.config["DASHBOARD_SERVICE"] to override"""
+    if app.config.get("DASHBOARD_SERVICE") is None:
+        app.config["DASHBOARD_SERVICE"] = create_dashboard_service(API_BACKEND)
+    return app.config["DASHBOARD_SERVICE"]
+
+def records(df) -> list:
+    """DataFrame rows as JSON-ready dicts (numpy scalars and dates converted)"""
+    return json.loads(df.to_json(orient='records', date_format='iso'))
+
+def int_arg(name: str, default: int = None) -> int:
+    """?<name>= as an int, `default` when absent; ValueError (a 400) when it is not an integer"""
+    value = request.args.get(name)
+    if value is None:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"{name} must be an integer, got {value!r}") from None
+
+def year_arg(service) -> int:
+    """?year= from the query string, defaulting to the latest year with data"""
+    year = int_arg("year")
+    if year is None:
+        years = service.get_available_years()
+        year = int(years[-1]) if years else None
+    return year
+
+def analytics_response(build_payload):
+    """
+    Serve `build_payload()` as JSON with a weak ETag derived from the request
+    and the service's data version. A matching If-None-Match gets a 304
+    without building the payload; large bodies are gzipped. No ETag is sent
+    while the data version is unknown.
+    """
+    service = get_service()
+    data_version = service.data_version()
+    version = repr((request.path, sorted(request.args.items(multi=True)), data_version))
+    etag = None if data_version is None else hashlib.sha1(version.encode()).hexdigest()
+    if etag is not None and request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+        response.set_etag(etag, weak=True)
+        return response
+
+    body = json.dumps(build_payload(service)).encode()
+    response = Response(body, mimetype="application/json")
+    if len(body) >= GZIP_MIN_BYTES and "gzip" in request.accept_encodings:
+        response.set_data(gzip.compress(body))
+        response.headers["Content-Encoding"] = "gzip"
+    response.headers["Vary"] = "Accept-Encoding"
+    response.headers["Cache-Control"] = "no-cache"
+    if etag is not None:
+        response.set_etag(etag, weak=True)
+    return response
+
+@app.errorhandler(ValueError)
+def bad_request(e):
+    return jsonify(error=str(e)), 400
+
+#--------------------------------ENDPOINTS------------------------------
+@app.get("/api/summary")
+def summary():
+    """Years and stores with data, plus quantity by store for ?year="""
+    def build(service):
+        year = year_arg(service)
+        quantity = service.get_quantity_by_store(year) if year is not None else None
+        return {
+            "years": [int(y) for y in service.get_available_years()],
+            "stores": list(service.get_available_stores()),
+            "year": year,
+            "total_quantity": int(quantity['total_quantity'].sum()) if quantity is not None else 0,
+            "quantity_by_store": records(quantity) if quantity is not None else [],
+        }
+    return analytics_response(build)
+
+@app.get("/api/revenue-by-store")
+def revenue_by_store():
+    def build(service):
+        year = year_arg(service)
+        if year is None:
+            raise ValueError("No sales data available")
+        return {"year": year, "data": records(service.get_revenue_by_store(year))}
+    return analytics_response(build)
+
+@app.get("/api/store-trend")
+def store_trend():
+    """Monthly quantity for ?store_id= in ?year="""
+    store_id = request.args.get("store_id")
+    if not store_id:
+        raise ValueError("store_id is required")
+
+    def build(service):
+        year = year_arg(service)
+        if year is None:
+            raise ValueError("No sales data available")
+        trend = service.get_store_monthly_trend(store_id, year)
+        columns = [c for c in ['sale_month', 'month_name', 'total_quantity', 'total_transactions'] if c in trend]
+        return {"store_id": store_id, "year": year, "data": records(trend[columns])}
+    return analytics_response(build)
+
+@app.get("/api/top-products")
+def top_products():
+    """The ?n= (default 10) highest-revenue products in ?year="""
+    n = int_arg("n", default=10)
+    if n < 1:
+        raise ValueError("n must be positive")
+
+    def build(service):
+        year = year_arg(service)
+        if year is None:
+            raise ValueError("No sales data available")
+        return {"year": year, "n": n, "data": records(service.get_top_products(year, n))}
+    return analytics_response(build)
+
+@app.get("/api/top")
+def top():
+    """
+    Leaderboard: the ?n= (default 10) top ?dimension= (store_id, product_id,
+    category_id) by ?metric= (revenue, units, transactions) within ?window=
+    (a year, YYYY-Qn, YYYY-MM or all; default all)
+    """
+    dimension = request.args.get("dimension", "store_id")
+    metric = request.args.get("metric", "revenue")
+    window = request.args.get("window")
+    n = int_arg("n", default=10)
+    if n < 1:
+        raise ValueError("n must be positive")
+
+    def build(service):
+        leaders = service.top_n(dimension, metric, window, n)
+        return {"dimension": dimension, "metric": metric, "window": window or "all", "n": n, "data": records(leaders)}
+    return analytics_response(build)
+
+@app.get("/api/export/sales")
+def sales_export():
+    """
+    All sales for ?store_id= and/or ?year= as ?format=csv|ndjson, streamed
+    from a server-side cursor in chunks so memory stays flat.
+    """
+    fmt = request.args.get("format", "csv")
+    store_id = request.args.get("store_id")
+    year = int_arg("year")
+    chunks = stream_sales(fmt, store_id, year)
+    filename = f"sales-{store_id or 'all'}-{year or 'all'}.{fmt}"
+    return Response(
+        stream_with_context(chunks),
+        mimetype=EXPORT_FORMATS[fmt],
+        headers={"Content-Disposition": f"attachment; filename={filename}"},
+    )
 
-# app = Flask(__name__)
 
 if __name__ == "__main__":
-    init_db()        
+    init_db()
     load_data()         # create table if missing
-    # app.run(host="127.0.0.1", port=8000, debug=True)
+    app.run(host=API_HOST, port=API_PORT)
 
 
 """
 source venv/bin/activate
-"""  
\ No newline at end of file
+"""
@@ -1,14 +1,28 @@
+import os
+import sys
 import pandas as pd
 import plotly.express as px
 
-# Load your data
-df = pd.read_csv('../../dataset/store_sales_summary.csv')
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from downsample import downsample, point_budget
+from readers import read_dataset
 
 #--------------------------------Monthly Sales Chart--------------------------------
-df['date'] = pd.to_datetime(df['sale_year'].astype(str) + '-' + df['sale_month'].astype(str) + '-01')
+def build_monthly_sales_figure(df, store_id):
+    """Monthly quantity line for one store; `df` is the store sales summary with a `date` column"""
+    # Cap the points sent to the browser for long ranges; peaks are kept
+    store_df = downsample(df[df['store_id'] == store_id], 'date', 'total_quantity', point_budget(1200))
 
-fig = px.line(df[df['store_id'] == 'ST-1'], 
-              x='date', y='total_quantity',
-              title='Store ST-1 Monthly Sales')
-       
-fig.show()
\ No newline at end of file
+    return px.line(store_df, 
+                   x='date', y='total_quantity',
+                   title=f'Store {store_id} Monthly Sales')
+
+
+if __name__ == "__main__":
+    # Load your data
+    df = read_dataset('store_sales_summary', dataset_dir='../../dataset',
+                      columns=['store_id', 'sale_year', 'sale_month', 'total_quantity'])
+    df['date'] = pd.to_datetime(df['sale_year'].astype(str) + '-' + df['sale_month'].astype(str) + '-01')
+
+    fig = build_monthly_sales_figure(df, 'ST-1')
+    fig.show()
@@ -1,20 +1,24 @@
-import pandas as pd
+import os
+import sys
 import plotly.express as px
 
-# Load your data
-df = pd.read_csv('../../dataset/store_sales_summary.csv')
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from readers import read_dataset
 
-#--------------------------------Monthly Sales Chart--------------------------------
-# df['date'] = pd.to_datetime(df['sale_year'].astype(str) + '-' + df['sale_month'].astype(str) + '-01')
+#--------------------------------Quantity by Store Chart--------------------------------
+def build_quantity_by_store_figure(quantity_by_store, year):
+    """Bar of total quantity per store; `quantity_by_store` has store_id and total_quantity"""
+    return px.bar(quantity_by_store, x='store_id', y='total_quantity',
+                  title=f'Total Quantity Sold by Store ({year})')
 
-# fig = px.line(df[df['store_id'] == 'ST-1'], 
-#               x='date', y='total_quantity',
-#               title='Store ST-1 Monthly Sales')
 
-# Filter 2023 and sum by store
-df_2023 = df[df['sale_year'] == 2023].groupby('store_id')['total_quantity'].sum().reset_index()
+if __name__ == "__main__":
+    # Load your data
+    df = read_dataset('store_sales_summary', dataset_dir='../../dataset',
+                      columns=['store_id', 'sale_year', 'total_quantity'])
 
-fig = px.bar(df_2023, x='store_id', y='total_quantity',
-             title='Total Quantity Sold by Store (2023)')
-             
-fig.show()
\ No newline at end of file
+    # Filter 2023 and sum by store
+    df_2023 = df[df['sale_year'] == 2023].groupby('store_id')['total_quantity'].sum().reset_index()
+
+    fig = build_quantity_by_store_figure(df_2023, 2023)
+    fig.show()
@@ -1,25 +1,33 @@
+import os
+import sys
 import pandas as pd
 import plotly.express as px
 
-# Load your data
-df = pd.read_csv('../../dataset/store_sales_summary.csv')
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from readers import read_dataset
 
-#--------------------------------Calculate Revenue--------------------------------
-sales = pd.read_csv('../../dataset/sales.csv')
-products = pd.read_csv('../../dataset/products.csv')
+#--------------------------------Revenue Chart--------------------------------
+def build_revenue_figure(revenue_by_store, year):
+    """Bar of revenue per store; `revenue_by_store` has store_id and revenue"""
+    return px.bar(revenue_by_store, x='store_id', y='revenue',
+                  title=f'Revenue by Store ({year})')
 
-# Parse dates and filter 2023
-sales['sale_date'] = pd.to_datetime(sales['sale_date'], format='%d-%m-%Y')
-sales_2023 = sales[sales['sale_date'].dt.year == 2023]
 
-# Join with products to get price
-merged = sales_2023.merge(products, left_on='product_id', right_on='Product_ID')
-merged['revenue'] = merged['quantity'] * merged['Price']
+if __name__ == "__main__":
+    #--------------------------------Calculate Revenue--------------------------------
+    sales = read_dataset('sales', dataset_dir='../../dataset', columns=['sale_date', 'store_id', 'product_id', 'quantity'])
+    products = read_dataset('products', dataset_dir='../../dataset', columns=['product_id', 'price'])
 
-# Sum by store
-revenue_by_store = merged.groupby('store_id')['revenue'].sum().reset_index()
+    # Parse dates and filter 2023
+    sales['sale_date'] = pd.to_datetime(sales['sale_date'], format='%d-%m-%Y')
+    sales_2023 = sales[sales['sale_date'].dt.year == 2023]
 
-fig = px.bar(revenue_by_store, x='store_id', y='revenue',
-             title='Revenue by Store (2023)')
-             
-fig.show()
\ No newline at end of file
+    # Join with products to get price
+    merged = sales_2023.merge(products, left_on='product_id', right_on='Product_ID')
+    merged['revenue'] = merged['quantity'] * merged['Price']
+
+    # Sum by store
+    revenue_by_store = merged.groupby('store_id')['revenue'].sum().reset_index()
+
+    fig = build_revenue_figure(revenue_by_store, 2023)
+    fig.show()
@@ -0,0 +1,149 @@
+"""
+Batch report generator: renders every StoreChat chart for every store and
+year to static files in parallel worker processes.
+
+Data is loaded once in the parent through DashboardService; workers only
+receive the small frames their charts need.
+
+    python batch_report.py --output ../../reports/nightly --formats html,png --jobs 4
+"""
+import os
+import sys
+import time
+import argparse
+import importlib
+import importlib.util
+from datetime import date
+from html import escape
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+CHARTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.extend([CHARTS_DIR, os.path.join(CHARTS_DIR, '..')])
+from dashboard_service import DashboardService
+
+# Builder name -> (chart module, function). Modules (and Plotly) are imported
+# in the worker that renders them; the parent only plans and loads data.
+BUILDERS = {
+    'monthly_sales': ('MonthlySalesByStore', 'build_monthly_sales_figure'),
+    'quantity_by_store': ('QuantityByStore', 'build_quantity_by_store_figure'),
+    'revenue_by_store': ('Revnue', 'build_revenue_figure'),
+}
+FORMATS = ('html', 'png')
+
+
+#--------------------------------Jobs--------------------------------
+def plan_jobs(service, output_dir: Path, stores=None, years=None) -> list:
+    """
+    One job per chart: (builder name, builder kwargs, output path without
+    suffix). Store charts get the store's summary rows; year charts get the
+    per-year aggregates, all computed here once.
+    """
+    summary = service.load_summary_data()
+    stores = stores or service.get_available_stores()
+    years = years or service.get_available_years()
+
+    jobs = []
+    for store_id in stores:
+        store_summary = summary[summary['store_id'] == store_id]
+        jobs.append(('monthly_sales', {'df': store_summary, 'store_id': store_id},
+                     output_dir / "stores" / store_id / "monthly_sales"))
+    for year in years:
+        jobs.append(('quantity_by_store',
+                     {'quantity_by_store': service.get_quantity_by_store(year), 'year': year},
+                     output_dir / "years" / str(year) / "quantity_by_store"))
+        jobs.append(('revenue_by_store',
+                     {'revenue_by_store': service.get_revenue_by_store(year), 'year': year},
+                     output_dir / "years" / str(year) / "revenue_by_store"))
+    return jobs
+
+def render_job(builder: str, kwargs: dict, output_base: Path, formats) -> tuple:
+    """Build one figure and write it in each format; runs in a worker process"""
+    start = time.perf_counter()
+    module, function = BUILDERS[builder]
+    fig = getattr(importlib.import_module(module), function)(**kwargs)
+    output_base.parent.mkdir(parents=True, exist_ok=True)
+    written = []
+    for fmt in formats:
+        path = output_base.with_suffix(f".{fmt}")
+        if fmt == 'html':
+            fig.write_html(path, include_plotlyjs='cdn')
+        else:
+            fig.write_image(path)
+        written.append(path)
+    return written, time.perf_counter() - start
+
+
+#--------------------------------Report--------------------------------
+def write_index(output_dir: Path, written: list):
+    """index.html linking every rendered chart, grouped by folder"""
+    links = {}
+    for path in sorted(written):
+        relative = path.relative_to(output_dir)
+        links.setdefault(str(relative.parent), []).append(relative)
+    sections = "\n".join(
+        f"<h2>{escape(group)}</h2><ul>"
+        + "".join(f'<li><a href="{escape(str(p))}">{escape(p.name)}</a></li>' for p in paths)
+        + "</ul>"
+        for group, paths in links.items()
+    )
+    index = output_dir / "index.html"
+    index.write_text(
+        f"<html><head><title>StoreChat report {date.today()}</title></head>"
+        f"<body><h1>StoreChat report {date.today()}</h1>{sections}</body></html>",
+        encoding="utf-8"
+    )
+    return index
+
+def generate_report(dataset_path, output_dir, formats=('html',), jobs: int = None,
+                    stores=None, years=None) -> dict:
+    """Render all charts under `output_dir`; returns counts and timings"""
+    output_dir = Path(output_dir)
+    start = time.perf_counter()
+    service = DashboardService(str(dataset_path), disk_cache=False)
+    planned = plan_jobs(service, output_dir, stores, years)
+    load_seconds = time.perf_counter() - start
+
+    written = []
+    render_seconds = 0.0
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = [executor.submit(render_job, builder, kwargs, base, formats) for builder, kwargs, base in planned]
+        for future in as_completed(futures):
+            paths, seconds = future.result()
+            written.extend(paths)
+            render_seconds += seconds
+
+    index = write_index(output_dir, written)
+    return {
+        'charts': len(planned),
+        'files': len(written),
+        'index': index,
+        'load_seconds': load_seconds,
+        'render_seconds': render_seconds,
+        'wall_seconds': time.perf_counter() - start,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render every StoreChat chart to static files")
+    parser.add_argument("--dataset", default=os.getenv("DATASET_DIR", "../../dataset"))
+    parser.add_argument("--output", default=f"../../reports/{date.today()}")
+    parser.add_argument("--formats", default="html", help="Comma-separated: html,png (png needs kaleido)")
+    parser.add_argument("--jobs", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--stores", nargs="*", help="Only these store_ids")
+    parser.add_argument("--years", nargs="*", type=int, help="Only these years")
+    args = parser.parse_args()
+
+    formats = [fmt.strip() for fmt in args.formats.split(",") if fmt.strip()]
+    unknown = set(formats) - set(FORMATS)
+    if unknown:
+        parser.error(f"Unknown format(s): {', '.join(sorted(unknown))}")
+    if 'png' in formats and importlib.util.find_spec("kaleido") is None:
+        parser.error("PNG output needs the kaleido package (pip install kaleido)")
+
+    result = generate_report(args.dataset, args.output, formats, args.jobs, args.stores, args.years)
+    print(
+        f"Rendered {result['charts']} charts ({result['files']} files) in {result['wall_seconds']:.1f}s "
+        f"(data load {result['load_seconds']:.1f}s, render {result['render_seconds']:.1f}s across workers). "
+        f"Index: {result['index']}"
+    )
@@ -0,0 +1,91 @@
+"""
+Columnar (Parquet) copies of large CSVs for row-group level reads.
+
+pyarrow is optional: callers check `available()` and fall back to CSV reads.
+"""
+import os
+from pathlib import Path
+from typing import Callable, Sequence
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - exercised only without pyarrow
+    pa = None
+    pq = None
+
+DEFAULT_ROW_GROUP_SIZE = 64_000
+
+
+def available() -> bool:
+    return pq is not None
+
+
+def convert_csv(csv_path, parquet_path, parse_chunk: Callable[[pd.DataFrame], pd.DataFrame],
+                row_group_size: int = DEFAULT_ROW_GROUP_SIZE, chunk_rows: int = 1_000_000) -> Path:
+    """
+    Stream `csv_path` into `parquet_path` chunk by chunk, applying
+    `parse_chunk` to each chunk, so memory stays bounded by `chunk_rows`.
+    The file is written under a temporary name and renamed when complete.
+    """
+    parquet_path = Path(parquet_path)
+    parquet_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = parquet_path.with_name(parquet_path.name + f".{os.getpid()}.tmp")
+    writer = None
+    schema = None
+    try:
+        for chunk in pd.read_csv(csv_path, chunksize=chunk_rows):
+            table = pa.Table.from_pandas(parse_chunk(chunk), preserve_index=False)
+            if writer is None:
+                schema = table.schema
+                writer = pq.ParquetWriter(tmp_path, schema)
+            writer.write_table(table.cast(schema), row_group_size=row_group_size)
+        if writer is None:
+            empty = parse_chunk(pd.read_csv(csv_path, nrows=0))
+            pq.write_table(pa.Table.from_pandas(empty, preserve_index=False), tmp_path)
+    finally:
+        if writer is not None:
+            writer.close()
+    os.replace(tmp_path, parquet_path)
+    return parquet_path
+
+
+def num_rows(parquet_path) -> int:
+    """Row count from the Parquet footer, without reading any data"""
+    return pq.ParquetFile(parquet_path).metadata.num_rows
+
+
+def read_columns(parquet_path, columns: Sequence[str]) -> pd.DataFrame:
+    return pq.read_table(parquet_path, columns=list(columns)).to_pandas()
+
+
+def read_rows(parquet_path, positions: Sequence[int]) -> pd.DataFrame:
+    """
+    Return the rows at `positions` (in that order), reading only the row
+    groups that contain them.
+    """
+    parquet_file = pq.ParquetFile(parquet_path)
+    positions = np.asarray(positions, dtype=np.int64)
+    if len(positions) == 0:
+        return parquet_file.schema_arrow.empty_table().to_pandas()
+
+    metadata = parquet_file.metadata
+    group_sizes = [metadata.row_group(i).num_rows for i in range(metadata.num_row_groups)]
+    group_starts = np.concatenate([[0], np.cumsum(group_sizes)])
+    group_of = np.searchsorted(group_starts, positions, side='right') - 1
+
+    pieces = []
+    order = []
+    for group in np.unique(group_of):
+        in_group = np.flatnonzero(group_of == group)
+        table = parquet_file.read_row_group(int(group))
+        pieces.append(table.take(pa.array(positions[in_group] - group_starts[group])))
+        order.append(in_group)
+
+    rows = pa.concat_tables(pieces).to_pandas()
+    # Put rows back into the requested order
+    rows.index = np.concatenate(order)
+    return rows.sort_index().reset_index(drop=True)
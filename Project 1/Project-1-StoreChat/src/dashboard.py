@@ -1,7 +1,9 @@
 import streamlit as st
 import plotly.express as px
-import pandas as pd
-from dashboard_service import DashboardService
+from dashboard_service import create_dashboard_service
+from dashboard_prefetch import Prefetcher, PREFETCH_WORKERS
+from downsample import downsample, point_budget
+from dashboard_profiler import RenderProfiler
 
 # -------------------- CONFIG --------------------
 st.set_page_config(
@@ -11,14 +13,31 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Approximate width of a half-page chart; long series are downsampled to fit it
+HALF_CHART_WIDTH_PX = 700
+
 # -------------------- SERVICES --------------------
 @st.cache_resource
 def get_service():
-    """Singleton for DashboardService"""
-    return DashboardService()
+    """Singleton for DashboardService (backend chosen by DASHBOARD_BACKEND)"""
+    return create_dashboard_service()
 
 service = get_service()
 
+@st.cache_resource
+def get_prefetcher():
+    """Background cache warmer shared by all sessions (off when DASHBOARD_PREFETCH_WORKERS=0)"""
+    if PREFETCH_WORKERS <= 0:
+        return None
+    return Prefetcher(service)
+
+prefetcher = get_prefetcher()
+
+# -------------------- PROFILING --------------------
+# Opt-in from the sidebar toggle; read from session state so it covers the whole run
+profiler = RenderProfiler(enabled=st.session_state.get("profile_render", False))
+service = profiler.wrap(service)
+
 # -------------------- DATA LOADING --------------------
 @st.cache_data
 def load_data():
@@ -26,7 +45,8 @@ def load_data():
     summary_df = service.load_summary_data()
     return summary_df
 
-summary_df = load_data()
+with profiler.section("summary data", "load"):
+    summary_df = load_data()
 
 if summary_df.empty:
     st.error("Unable to load data. Please check if the dataset files exist.")
@@ -35,19 +55,29 @@ if summary_df.empty:
 # -------------------- SIDEBAR --------------------
 st.sidebar.header("🔍 Filters")
 
-# Year Filter
-available_years = sorted(summary_df['sale_year'].unique())
-selected_year = st.sidebar.selectbox(
-    "Select Year", 
-    available_years, 
-    index=len(available_years)-1 if available_years else 0
-)
+with profiler.section("sidebar filters", "filter"):
+    # Year Filter
+    available_years = service.get_available_years()
+    selected_year = st.sidebar.selectbox(
+        "Select Year", 
+        available_years, 
+        index=len(available_years)-1 if available_years else 0
+    )
+
+    # Store Filter
+    available_stores = service.get_available_stores()
+    selected_store = st.sidebar.selectbox(
+        "Select Store (for specific charts)", 
+        available_stores
+    )
+
+# Warm adjacent years and the top stores while this view renders
+if prefetcher is not None:
+    prefetcher.prefetch(selected_year, selected_store)
 
-# Store Filter
-available_stores = sorted(summary_df['store_id'].unique())
-selected_store = st.sidebar.selectbox(
-    "Select Store (for specific charts)", 
-    available_stores
+st.sidebar.toggle(
+    "⏱️ Profile render", key="profile_render",
+    help="Time each section and service call; results appear at the bottom of the page"
 )
 
 # -------------------- MAIN CONTENT --------------------
@@ -65,83 +95,157 @@ with tab1:
     with col1:
         st.subheader(f"Total Quantity Sold by Store ({selected_year})")
         
-        # Aggregate data for the selected year
-        yearly_summary = summary_df[summary_df['sale_year'] == selected_year]
-        qty_by_store = yearly_summary.groupby('store_id')['total_quantity'].sum().reset_index()
+        # Aggregate data for the selected year (cached per year and data version)
+        with profiler.section("quantity by store", "aggregate"):
+            qty_by_store = service.get_quantity_by_store(selected_year)
         
         if not qty_by_store.empty:
-            fig_qty = px.bar(
-                qty_by_store, 
-                x='store_id', 
-                y='total_quantity',
-                labels={'store_id': 'Store', 'total_quantity': 'Quantity Sold'},
-                color='total_quantity',
-                color_continuous_scale=px.colors.sequential.Viridis
-            )
-            st.plotly_chart(fig_qty, use_container_width=True)
+            with profiler.section("quantity by store", "figure"):
+                fig_qty = px.bar(
+                    qty_by_store, 
+                    x='store_id', 
+                    y='total_quantity',
+                    labels={'store_id': 'Store', 'total_quantity': 'Quantity Sold'},
+                    color='total_quantity',
+                    color_continuous_scale=px.colors.sequential.Viridis
+                )
+            with profiler.section("quantity by store", "render"):
+                st.plotly_chart(fig_qty, use_container_width=True)
         else:
             st.info("No data available for this year.")
 
-    # Chart 2: Monthly Trend for Selected Store
+    # Chart 2: Sales Trend for Selected Store
     with col2:
-        st.subheader(f"Monthly Sales Trend: {selected_store} ({selected_year})")
-        
-        store_monthly = summary_df[
-            (summary_df['store_id'] == selected_store) & 
-            (summary_df['sale_year'] == selected_year)
-        ].sort_values('sale_month')
-        
-        if not store_monthly.empty:
-            # Create a more readable month label
-            store_monthly['month_name'] = pd.to_datetime(
-                store_monthly['sale_month'], format='%m'
-            ).dt.month_name()
-            
-            fig_trend = px.line(
-                store_monthly,
-                x='month_name',
-                y='total_quantity',
-                markers=True,
-                labels={'month_name': 'Month', 'total_quantity': 'Quantity'},
-                title=f"Sales Trend for {selected_store}"
-            )
-            st.plotly_chart(fig_trend, use_container_width=True)
+        granularity = st.radio("Granularity", ["Monthly", "Daily", "Daily (all years)"], horizontal=True)
+
+        if granularity == "Monthly":
+            st.subheader(f"Monthly Sales Trend: {selected_store} ({selected_year})")
+
+            # Includes a readable month_name column
+            with profiler.section("store trend", "aggregate"):
+                store_monthly = service.get_store_monthly_trend(selected_store, selected_year)
+
+            if not store_monthly.empty:
+                with profiler.section("store trend", "figure"):
+                    fig_trend = px.line(
+                        store_monthly,
+                        x='month_name',
+                        y='total_quantity',
+                        markers=True,
+                        labels={'month_name': 'Month', 'total_quantity': 'Quantity'},
+                        title=f"Sales Trend for {selected_store}"
+                    )
+                with profiler.section("store trend", "render"):
+                    st.plotly_chart(fig_trend, use_container_width=True)
+            else:
+                st.info(f"No monthly data found for {selected_store} in {selected_year}.")
         else:
-            st.info(f"No monthly data found for {selected_store} in {selected_year}.")
+            trend_year = selected_year if granularity == "Daily" else None
+            st.subheader(f"Daily Sales Trend: {selected_store} ({trend_year or 'all years'})")
+
+            with profiler.section("store trend", "aggregate"):
+                store_daily = service.get_daily_sales(selected_store, trend_year)
+
+            if not store_daily.empty:
+                # Keep the point count (and render time) fixed however long the range is
+                with profiler.section("store trend", "filter"):
+                    plotted = downsample(store_daily, 'sale_date', 'total_quantity', point_budget(HALF_CHART_WIDTH_PX))
+                with profiler.section("store trend", "figure"):
+                    fig_trend = px.line(
+                        plotted,
+                        x='sale_date',
+                        y='total_quantity',
+                        labels={'sale_date': 'Date', 'total_quantity': 'Quantity'},
+                        title=f"Sales Trend for {selected_store}"
+                    )
+                with profiler.section("store trend", "render"):
+                    st.plotly_chart(fig_trend, use_container_width=True)
+                if len(plotted) < len(store_daily):
+                    st.caption(f"Showing {len(plotted):,} of {len(store_daily):,} days (peaks and troughs kept)")
+            else:
+                st.info(f"No daily data found for {selected_store}.")
 
 # -------------------- TAB 2: REVENUE --------------------
 with tab2:
     st.subheader(f"Revenue Analysis ({selected_year})")
     
-    with st.spinner("Calculating revenue..."):
-        # Load revenue data (calculated on the fly as it involves joining large tables)
+    with st.spinner("Calculating revenue..."), profiler.section("revenue by store", "aggregate"):
+        # Revenue is sliced from a cube the service builds once per data version
         revenue_df = service.get_revenue_by_store(selected_year)
     
     if not revenue_df.empty:
         col_rev_1, col_rev_2 = st.columns([2, 1])
         
         with col_rev_1:
-            fig_rev = px.bar(
-                revenue_df,
-                x='store_id',
-                y='revenue',
-                labels={'store_id': 'Store', 'revenue': 'Total Revenue ($)'},
-                color='revenue',
-                color_continuous_scale=px.colors.sequential.Plasma,
-                text_auto='.2s'
-            )
-            fig_rev.update_layout(xaxis_title="Store", yaxis_title="Revenue ($)")
-            st.plotly_chart(fig_rev, use_container_width=True)
+            with profiler.section("revenue by store", "figure"):
+                fig_rev = px.bar(
+                    revenue_df,
+                    x='store_id',
+                    y='revenue',
+                    labels={'store_id': 'Store', 'revenue': 'Total Revenue ($)'},
+                    color='revenue',
+                    color_continuous_scale=px.colors.sequential.Plasma,
+                    text_auto='.2s'
+                )
+                fig_rev.update_layout(xaxis_title="Store", yaxis_title="Revenue ($)")
+            with profiler.section("revenue by store", "render"):
+                st.plotly_chart(fig_rev, use_container_width=True)
             
-        with col_rev_2:
+        with col_rev_2, profiler.section("revenue table", "render"):
             st.dataframe(
                 revenue_df.style.format({"revenue": "${:,.2f}"}), 
                 use_container_width=True,
                 hide_index=True
             )
+
+        col_rev_3, col_rev_4 = st.columns(2)
+
+        with col_rev_3:
+            with profiler.section("revenue by month", "aggregate"):
+                revenue_month_df = service.get_revenue_by_month(selected_year)
+            with profiler.section("revenue by month", "figure"):
+                fig_rev_month = px.line(
+                    revenue_month_df,
+                    x='sale_month',
+                    y='revenue',
+                    markers=True,
+                    labels={'sale_month': 'Month', 'revenue': 'Revenue ($)'},
+                    title=f"Monthly Revenue ({selected_year})"
+                )
+            with profiler.section("revenue by month", "render"):
+                st.plotly_chart(fig_rev_month, use_container_width=True)
+
+        with col_rev_4:
+            with profiler.section("revenue by category", "aggregate"):
+                revenue_category_df = service.get_revenue_by_category(selected_year)
+            with profiler.section("revenue by category", "figure"):
+                fig_rev_category = px.bar(
+                    revenue_category_df,
+                    x='category_id',
+                    y='revenue',
+                    labels={'category_id': 'Category', 'revenue': 'Revenue ($)'},
+                    title=f"Revenue by Category ({selected_year})"
+                )
+            with profiler.section("revenue by category", "render"):
+                st.plotly_chart(fig_rev_category, use_container_width=True)
     else:
         st.warning(f"No revenue data available for {selected_year}. Check if sales and products data exist.")
 
+    # Leaderboard: partial selection over the precomputed aggregates
+    st.subheader("🏆 Leaderboard")
+    lead_col1, lead_col2, lead_col3, lead_col4 = st.columns(4)
+    lead_dimension = lead_col1.selectbox("Top", ["store_id", "product_id", "category_id"])
+    lead_metric = lead_col2.selectbox("By", ["revenue", "units", "transactions"])
+    lead_window = lead_col3.selectbox(
+        "Window", [str(selected_year)] + [f"{selected_year}-Q{q}" for q in range(1, 5)] + ["all"]
+    )
+    lead_n = lead_col4.number_input("N", min_value=1, max_value=500, value=20, step=5)
+
+    with profiler.section("leaderboard", "aggregate"):
+        leaders_df = service.top_n(lead_dimension, lead_metric, lead_window, int(lead_n))
+    with profiler.section("leaderboard", "render"):
+        st.dataframe(leaders_df, use_container_width=True, hide_index=True)
+
 # -------------------- TAB 3: DATA TABLES --------------------
 with tab3:
     st.subheader("Raw Data Explorer")
@@ -149,18 +253,88 @@ with tab3:
     dataset_option = st.selectbox("Select Dataset", ["Store Sales Summary", "Sales Transactions", "Products"])
     
     if dataset_option == "Store Sales Summary":
-        st.dataframe(summary_df, use_container_width=True)
+        with profiler.section("summary table", "render"):
+            st.dataframe(summary_df, use_container_width=True)
         
     elif dataset_option == "Sales Transactions":
-        with st.spinner("Loading sales data..."):
-            sales_limit = st.slider("Max rows to display", 100, 5000, 1000)
-            sales_df = service.load_sales_data().head(sales_limit)
-            st.dataframe(sales_df, use_container_width=True)
+        filter_col1, filter_col2, filter_col3, filter_col4 = st.columns(4)
+        page_size = filter_col1.selectbox("Rows per page", [100, 500, 1000, 5000], index=2)
+        sort_by = filter_col2.selectbox("Sort by", ["(file order)", "sale_date", "sale_id", "store_id", "product_id", "quantity"])
+        sales_store = filter_col3.selectbox("Store", ["All"] + available_stores)
+        sales_year = filter_col4.selectbox("Year", ["All"] + available_years)
+        descending = st.checkbox("Descending", value=False)
+
+        page_query = dict(
+            page_size=page_size,
+            sort_by=None if sort_by == "(file order)" else sort_by,
+            descending=descending,
+            store_id=None if sales_store == "All" else sales_store,
+            year=None if sales_year == "All" else int(sales_year),
+        )
+        # Keyset cursors per query, so sequential paging seeks instead of using OFFSET
+        cursors = st.session_state.setdefault("sales_page_cursors", {})
+        query_cursors = cursors.setdefault(tuple(sorted(page_query.items())), {})
+
+        page_number = st.number_input("Page", min_value=1, value=1, step=1)
+        with st.spinner("Loading sales page..."), profiler.section("sales page", "load"):
+            sales_page = service.get_sales_page(
+                page=int(page_number), after=query_cursors.get(int(page_number) - 1), **page_query
+            )
+        if sales_page.next_key is not None:
+            query_cursors[sales_page.page] = sales_page.next_key
+
+        st.caption(f"Page {sales_page.page} of {sales_page.total_pages:,} ({sales_page.total_rows:,} rows)")
+        with profiler.section("sales page", "render"):
+            st.dataframe(sales_page.rows, use_container_width=True)
             
     elif dataset_option == "Products":
         with st.spinner("Loading products..."):
-            products_df = service.load_products_data()
-            st.dataframe(products_df, use_container_width=True)
+            with profiler.section("products table", "load"):
+                products_df = service.load_products_data()
+            with profiler.section("products table", "render"):
+                st.dataframe(products_df, use_container_width=True)
+
+# -------------------- SIDEBAR: DIAGNOSTICS --------------------
+# Rendered last so the counters include this run's queries
+with st.sidebar.expander("⚙️ Cache Diagnostics"):
+    stats = service.cache_stats()
+    diag_col1, diag_col2 = st.columns(2)
+    diag_col1.metric("Hits", stats['hits'])
+    diag_col2.metric("Misses", stats['misses'])
+    diag_col1.metric("Hit Rate", f"{stats['hit_rate']:.0%}")
+    diag_col2.metric("Entries", stats['entries'])
+    st.caption(
+        f"Compute time saved: {stats['time_saved_seconds']:.2f}s "
+        f"(spent computing: {stats['compute_seconds']:.2f}s, "
+        f"{stats['shared_loads']} duplicate loads avoided, {stats['disk_hits']} restored from disk)"
+    )
+    if prefetcher is not None:
+        prefetch_stats = prefetcher.stats()
+        st.caption(
+            f"Prefetch: {prefetch_stats['completed']} warmed, {prefetch_stats['in_flight']} in flight, "
+            f"{prefetch_stats['cancelled']} cancelled"
+        )
+
+# -------------------- RENDER PROFILE --------------------
+if profiler.enabled:
+    with st.expander("⏱️ Render Timings", expanded=True):
+        timings = profiler.frame()
+        timings['ms'] = (timings['seconds'] * 1000).round(1)
+        profile_col1, profile_col2 = st.columns([3, 1])
+        profile_col2.metric("Script time", f"{profiler.total_seconds * 1000:,.0f} ms")
+        profile_col1.bar_chart(profiler.phase_totals() * 1000, horizontal=True, y_label="ms")
+        st.dataframe(
+            timings[['kind', 'name', 'phase', 'section', 'caller', 'ms']].sort_values('ms', ascending=False),
+            use_container_width=True,
+            hide_index=True
+        )
+    profiler.write_log(
+        backend=type(get_service()).__name__,
+        year=selected_year,
+        store=selected_store,
+        granularity=granularity,
+        tab_data=dataset_option,
+    )
 
 # Footer
 st.markdown("---")
@@ -0,0 +1,368 @@
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Callable, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+def file_fingerprint(file_path) -> Tuple[str, int, int]:
+    """
+    Identify a file's current contents by path, modification time and size.
+    Raises FileNotFoundError if the file does not exist.
+    """
+    stat = os.stat(file_path)
+    return (str(Path(file_path)), stat.st_mtime_ns, stat.st_size)
+
+
+class SingleFlight:
+    """
+    Collapses concurrent calls for the same key into one execution.
+
+    The first caller for a key runs the function; callers arriving while it is
+    in flight wait for that result (or exception) instead of repeating the
+    work. `shared` counts the calls that were served this way.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}  # key -> Future of the in-flight call
+        self.executions = 0
+        self.shared = 0
+
+    def do(self, key, fn: Callable):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = Future()
+                self.executions += 1
+            else:
+                self.shared += 1
+        if not leader:
+            return call.result()
+
+        try:
+            value = fn()
+        except BaseException as e:
+            call.set_exception(e)
+            raise
+        else:
+            call.set_result(value)
+            return value
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+
+class FrameCache:
+    """
+    LRU cache of parsed DataFrames keyed by file path, mtime and size.
+
+    A frame is reparsed only when its file changes on disk, and concurrent
+    misses for the same file version share one parse. Frames are evicted
+    least recently used first once the total deep memory usage exceeds
+    `max_bytes`. Cached frames are shared between callers and must be treated
+    as read-only.
+    """
+
+    def __init__(self, max_bytes: int = 512 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._frames = OrderedDict()  # path -> (fingerprint, frame, nbytes)
+        self._bytes = 0
+        self._lock = threading.RLock()
+        self.flight = SingleFlight()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, file_path, parser: Callable[[Path], pd.DataFrame]) -> pd.DataFrame:
+        """Return the parsed frame for `file_path`, calling `parser` only on a miss"""
+        fingerprint = file_fingerprint(file_path)
+        key = fingerprint[0]
+        with self._lock:
+            entry = self._frames.get(key)
+            if entry is not None and entry[0] == fingerprint:
+                self._frames.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        def parse():
+            df = parser(Path(file_path))
+            self._store(key, fingerprint, df)
+            return df
+
+        return self.flight.do(fingerprint, parse)
+
+    def _store(self, key, fingerprint, df: pd.DataFrame):
+        nbytes = int(df.memory_usage(deep=True).sum())
+        with self._lock:
+            self._discard(key)
+            if nbytes > self.max_bytes:
+                # Larger than the whole budget: serve it, but don't cache it
+                return
+            self._frames[key] = (fingerprint, df, nbytes)
+            self._bytes += nbytes
+            while self._bytes > self.max_bytes and len(self._frames) > 1:
+                oldest = next(iter(self._frames))
+                self._discard(oldest)
+                self.evictions += 1
+
+    def _discard(self, key):
+        entry = self._frames.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[2]
+
+    def clear(self):
+        with self._lock:
+            self._frames.clear()
+            self._bytes = 0
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    def __len__(self):
+        return len(self._frames)
+
+    def __contains__(self, file_path):
+        return str(Path(file_path)) in self._frames
+
+
+class ArrayCache:
+    """
+    LRU cache of numpy arrays bounded by their total size in bytes.
+
+    For derived arrays too large to count against ResultCache's entry limit,
+    such as the row positions of a sorted, filtered sales page. Keys must
+    include the data version. Concurrent misses for the same key share one
+    computation; an array larger than `max_bytes` is returned but not cached.
+    """
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._arrays = OrderedDict()  # key -> array
+        self._bytes = 0
+        self._lock = threading.RLock()
+        self.flight = SingleFlight()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_compute(self, key, compute: Callable[[], np.ndarray]) -> np.ndarray:
+        with self._lock:
+            array = self._arrays.get(key)
+            if array is not None:
+                self._arrays.move_to_end(key)
+                self.hits += 1
+                return array
+            self.misses += 1
+
+        def store_compute():
+            array = compute()
+            self._store(key, array)
+            return array
+
+        return self.flight.do(key, store_compute)
+
+    def _store(self, key, array: np.ndarray):
+        with self._lock:
+            self._discard(key)
+            if array.nbytes > self.max_bytes:
+                return
+            self._arrays[key] = array
+            self._bytes += array.nbytes
+            while self._bytes > self.max_bytes:
+                self._discard(next(iter(self._arrays)))
+                self.evictions += 1
+
+    def _discard(self, key):
+        array = self._arrays.pop(key, None)
+        if array is not None:
+            self._bytes -= array.nbytes
+
+    def clear(self):
+        with self._lock:
+            self._arrays.clear()
+            self._bytes = 0
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    def __len__(self):
+        return len(self._arrays)
+
+
+class ResultCache:
+    """
+    TTL + size-bounded LRU cache for computed query results.
+
+    Keys are built by the caller (method name, parameters, data version), so a
+    data change simply produces new keys and old entries age out. Concurrent
+    misses for the same key share one computation. Tracks hits, misses and the
+    compute time saved by hits.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: float = 600):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()  # key -> (value, expires_at, compute_seconds)
+        self._lock = threading.RLock()
+        self.flight = SingleFlight()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.time_saved = 0.0
+        self.compute_time = 0.0
+
+    def get_or_compute(self, key, compute: Callable):
+        """Return the cached value for `key`, computing and storing it on a miss"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[1] > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    self.time_saved += entry[2]
+                    return entry[0]
+                del self._entries[key]
+            self.misses += 1
+
+        def timed_compute():
+            start = time.perf_counter()
+            value = compute()
+            self.put(key, value, time.perf_counter() - start)
+            return value
+
+        return self.flight.do(key, timed_compute)
+
+    def put(self, key, value, compute_seconds: float = 0.0):
+        with self._lock:
+            self.compute_time += compute_seconds
+            self._entries[key] = (value, time.monotonic() + self.ttl_seconds, compute_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'time_saved_seconds': self.time_saved,
+                'compute_seconds': self.compute_time,
+                'shared_computes': self.flight.shared,
+            }
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def _normalise_key(value):
+    """`value` with numpy scalars as Python scalars and lists as tuples, so equal keys repr the same"""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (tuple, list)):
+        return tuple(_normalise_key(item) for item in value)
+    return value
+
+def _key_text(value) -> str:
+    """Stable text form of a cache key: np.int64(2023) and 2023 give the same text"""
+    return repr(_normalise_key(value))
+
+
+class DiskResultCache:
+    """
+    SQLite-backed result cache that survives process restarts.
+
+    Entries are keyed by the query (method name and parameters) and tagged
+    with the data version they were computed from; values are pickled. A
+    lookup with a different version misses, and the first lookup under a new
+    version deletes every entry from older versions. At most `max_entries`
+    are kept, least recently used first out. The file must only be writable
+    by the dashboard, since unpickling runs code.
+    """
+
+    MISSING = object()
+
+    def __init__(self, path, max_entries: int = 2048):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._current_version = None
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS results (
+                    query TEXT PRIMARY KEY,
+                    version TEXT NOT NULL,
+                    value BLOB NOT NULL,
+                    accessed REAL NOT NULL
+                )
+            """)
+
+    def get(self, query, version):
+        """Cached value for `query` at `version`, or DiskResultCache.MISSING"""
+        query_text, version_text = _key_text(query), _key_text(version)
+        with self._lock, self._conn:
+            if version_text != self._current_version:
+                self._conn.execute("DELETE FROM results WHERE version != ?", (version_text,))
+                self._current_version = version_text
+            row = self._conn.execute(
+                "SELECT value FROM results WHERE query = ? AND version = ?", (query_text, version_text)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return self.MISSING
+            self._conn.execute("UPDATE results SET accessed = ? WHERE query = ?", (time.time(), query_text))
+            self.hits += 1
+        return pickle.loads(row[0])
+
+    def put(self, query, version, value):
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results (query, version, value, accessed) VALUES (?, ?, ?, ?)",
+                (_key_text(query), _key_text(version), blob, time.time())
+            )
+            self._conn.execute("""
+                DELETE FROM results WHERE query IN (
+                    SELECT query FROM results ORDER BY accessed DESC, rowid DESC LIMIT -1 OFFSET ?
+                )
+            """, (self.max_entries,))
+            self.writes += 1
+
+    def clear(self):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM results")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
@@ -0,0 +1,324 @@
+import os
+import time
+import pandas as pd
+from psycopg2 import sql
+
+try:
+    from src import repo
+    from src.dashboard_profiler import profiled
+    from src.dashboard_service import DashboardService, SalesPage, SALES_COLUMNS, TOP_N_METRICS, cached_result, logger, parse_page, parse_window
+except ImportError:
+    import repo
+    from dashboard_profiler import profiled
+    from dashboard_service import DashboardService, SalesPage, SALES_COLUMNS, TOP_N_METRICS, cached_result, logger, parse_page, parse_window
+
+# Seconds a data version read from pg_stat_user_tables is reused before it is read again
+DATA_VERSION_TTL = float(os.getenv("DASHBOARD_PG_VERSION_TTL", "1"))
+
+
+class PostgresDashboardService(DashboardService):
+    """
+    DashboardService backed by the StoreChat PostgreSQL database.
+
+    Aggregations run as parameterized SQL over pooled connections, so only the
+    small result sets cross the wire. Column names and ordering match the CSV
+    backend so either can be plugged into the dashboard.
+    """
+
+    def __init__(self, *args, version_ttl: float = DATA_VERSION_TTL, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.version_ttl = version_ttl
+        self._versions = {}  # table names -> (read at, version)
+
+    def _query(self, sql: str, params=None) -> pd.DataFrame:
+        with repo.pooled_conn() as conn, conn.cursor() as cur:
+            cur.execute(sql, params)
+            columns = [desc[0] for desc in cur.description]
+            return pd.DataFrame(cur.fetchall(), columns=columns)
+
+    #--------------------------------LOADERS------------------------------
+    @profiled
+    def load_summary_data(self) -> pd.DataFrame:
+        """
+        Load store sales summary data from store_sales_summary.
+        """
+        try:
+            df = self._query("""
+                SELECT store_id, sale_year, sale_month, total_quantity, total_transactions,
+                       avg_quantity_per_transaction::float8 AS avg_quantity_per_transaction
+                FROM store_sales_summary
+                ORDER BY store_id COLLATE "C", sale_year, sale_month
+            """)
+            if df.empty:
+                return pd.DataFrame()
+            df['date'] = pd.to_datetime(
+                df['sale_year'].astype(str) + '-' + df['sale_month'].astype(str) + '-01'
+            )
+            return df
+        except Exception as e:
+            logger.error(f"Error loading summary data: {e}")
+            return pd.DataFrame()
+
+    @profiled
+    def load_sales_data(self) -> pd.DataFrame:
+        """
+        Load sales transaction data from the sales table.
+        """
+        try:
+            df = self._query("""
+                SELECT sale_id, sale_date, store_id, product_id, quantity
+                FROM sales
+                ORDER BY sale_date, sale_id
+            """)
+            if df.empty:
+                return pd.DataFrame()
+            df['sale_date'] = pd.to_datetime(df['sale_date'])
+            return df
+        except Exception as e:
+            logger.error(f"Error loading sales data: {e}")
+            return pd.DataFrame()
+
+    @profiled
+    def load_products_data(self) -> pd.DataFrame:
+        """
+        Load product information, using the same column names as products.csv.
+        """
+        try:
+            df = self._query("""
+                SELECT product_id AS "Product_ID", product_name AS "Product_Name",
+                       category_id AS "Category_ID", to_char(launch_date, 'YYYY-MM-DD') AS "Launch_Date",
+                       price::float8 AS "Price"
+                FROM products
+                ORDER BY product_id
+            """)
+            return df
+        except Exception as e:
+            logger.error(f"Error loading products data: {e}")
+            return pd.DataFrame()
+
+    #--------------------------------PAGINATED SALES------------------------------
+    def _count_sales(self, store_id, year) -> int:
+        """Exact count when filtered; the planner's estimate for the whole table"""
+        if store_id is None and year is None:
+            # The sales heap is sales_compact in the compact layout and the monthly partitions in the partitioned one
+            df = self._query("""
+                SELECT COALESCE(CASE WHEN MIN(reltuples) < 0 THEN -1 ELSE SUM(reltuples) END, -1)::bigint AS total
+                FROM pg_class
+                WHERE relkind = 'r' AND (relname IN ('sales', 'sales_compact')
+                      OR oid IN (SELECT inhrelid FROM pg_inherits WHERE inhparent = to_regclass('sales')))
+            """)
+            if not df.empty and df['total'].iloc[0] >= 0:
+                return int(df['total'].iloc[0])
+        df = self._query("""
+            SELECT COUNT(*) AS total FROM sales
+            WHERE (%(store_id)s::varchar IS NULL OR store_id = %(store_id)s)
+              AND (%(start)s::date IS NULL OR (sale_date >= %(start)s AND sale_date < %(end)s))
+        """, {"store_id": store_id, **repo.sales_date_range(year)})
+        return int(df['total'].iloc[0])
+
+    @cached_result
+    def get_sales_page(self, page: int = 1, page_size: int = 100, sort_by: str = None,
+                       descending: bool = False, store_id: str = None, year: int = None,
+                       after: tuple = None) -> SalesPage:
+        """
+        One page of sales using keyset pagination on (sort column, sale_id).
+        With `after` (the previous page's `next_key`) the query seeks straight
+        to the page through the index; without it, it falls back to OFFSET.
+        """
+        if sort_by is not None and sort_by not in SALES_COLUMNS:
+            raise ValueError(f"Cannot sort sales by {sort_by}")
+        page, page_size = parse_page(page, page_size)
+        sort_column = sort_by or 'sale_id'
+        direction = sql.SQL("DESC" if descending else "ASC")
+        year = None if year is None else int(year)
+        params = {"store_id": store_id, **repo.sales_date_range(year), "limit": page_size}
+
+        conditions = [
+            sql.SQL("(%(store_id)s::varchar IS NULL OR store_id = %(store_id)s)"),
+            sql.SQL("(%(start)s::date IS NULL OR (sale_date >= %(start)s AND sale_date < %(end)s))"),
+        ]
+        if after is not None:
+            conditions.append(sql.SQL("({sort}, sale_id) {op} (%(after_value)s, %(after_id)s)").format(
+                sort=sql.Identifier(sort_column), op=sql.SQL("<" if descending else ">")
+            ))
+            params.update(after_value=after[0], after_id=after[1])
+            offset = sql.SQL("")
+        else:
+            offset = sql.SQL(" OFFSET %(offset)s")
+            params["offset"] = (page - 1) * page_size
+
+        query = sql.SQL("""
+            SELECT sale_id, sale_date, store_id, product_id, quantity
+            FROM sales
+            WHERE {conditions}
+            ORDER BY {sort} {direction}, sale_id {direction}
+            LIMIT %(limit)s{offset}
+        """).format(
+            conditions=sql.SQL(" AND ").join(conditions),
+            sort=sql.Identifier(sort_column),
+            direction=direction,
+            offset=offset,
+        )
+        with repo.pooled_conn() as conn, conn.cursor() as cur:
+            cur.execute(query, params)
+            rows = pd.DataFrame(cur.fetchall(), columns=[desc[0] for desc in cur.description])
+
+        if rows.empty:
+            rows = pd.DataFrame(columns=SALES_COLUMNS)
+            next_key = None
+        else:
+            last = rows.iloc[-1]
+            last_value = last[sort_column]
+            # numpy scalars -> Python values so psycopg2 can adapt them
+            next_key = (last_value.item() if hasattr(last_value, 'item') else last_value, last['sale_id'])
+            rows['sale_date'] = pd.to_datetime(rows['sale_date'])
+        return SalesPage(rows, page, page_size, self._count_sales(store_id, year), next_key)
+
+    #--------------------------------DATA VERSION------------------------------
+    def data_version(self, *table_names: str) -> tuple:
+        """
+        Write counters of the dashboard tables from pg_stat_user_tables. They
+        change whenever rows are inserted, updated or deleted (reported by the
+        stats system within about a second), so cached results keyed on them
+        are dropped after a reload. Tables missing from the current layout
+        (sales is a view over sales_compact in the compact one) are skipped;
+        in the partitioned layout each month's partition is listed under its
+        own name and oid, so replacing a month also changes the version.
+
+        A version is reused for `version_ttl` seconds, so cache hits do not
+        each cost a round trip. None when it cannot be read, which makes
+        cached_result run the query uncached.
+        """
+        names = table_names or ("store_sales_summary", "sales", "sales_compact", "products")
+        read_at, version = self._versions.get(names, (None, None))
+        now = time.monotonic()
+        if read_at is not None and now - read_at < self.version_ttl:
+            return version
+        try:
+            df = self._query("""
+                SELECT relname, n_tup_ins, n_tup_upd, n_tup_del, n_live_tup, relid::bigint AS relid
+                FROM pg_stat_user_tables
+                WHERE relname = ANY(%(names)s)
+                   OR ('sales' = ANY(%(names)s)
+                       AND relid IN (SELECT inhrelid FROM pg_inherits WHERE inhparent = to_regclass('sales')))
+                ORDER BY relname
+            """, {"names": list(names)})
+        except Exception as e:
+            logger.error(f"Error reading data version: {e}")
+            return None
+        version = tuple(df.itertuples(index=False, name=None))
+        self._versions[names] = (now, version)
+        return version
+
+    def _summary_version(self) -> tuple:
+        return self.data_version("store_sales_summary")
+
+    #--------------------------------DAILY SERIES------------------------------
+    @cached_result
+    def get_daily_sales(self, store_id: str = None, year: int = None) -> pd.DataFrame:
+        """
+        Quantity and transaction count per day, optionally for one store and year.
+        """
+        df = self._query("""
+            SELECT sale_date, SUM(quantity)::bigint AS total_quantity, COUNT(*) AS total_transactions
+            FROM sales
+            WHERE (%(store_id)s::varchar IS NULL OR store_id = %(store_id)s)
+              AND (%(start)s::date IS NULL OR (sale_date >= %(start)s AND sale_date < %(end)s))
+            GROUP BY sale_date
+            ORDER BY sale_date
+        """, {"store_id": store_id, **repo.sales_date_range(None if year is None else int(year))})
+        if df.empty:
+            return pd.DataFrame(columns=['sale_date', 'total_quantity', 'total_transactions'])
+        df['sale_date'] = pd.to_datetime(df['sale_date'])
+        return df
+
+    #--------------------------------AGGREGATES------------------------------
+    def get_revenue_cube(self):
+        """
+        No cube: the aggregates below run in SQL instead. Returns None, which
+        callers already treat as "no data".
+        """
+        return None
+
+    @cached_result
+    def get_revenue_by_store(self, year: int) -> pd.DataFrame:
+        """
+        Revenue by store for a year, filtered as a sale_date range (see
+        repo.sales_date_range) so the date indexes apply.
+        """
+        df = self._query("""
+            SELECT s.store_id, SUM(s.quantity * p.price)::float8 AS revenue
+            FROM sales s
+            JOIN products p ON p.product_id = s.product_id
+            WHERE s.sale_date >= %(start)s AND s.sale_date < %(end)s
+            GROUP BY s.store_id
+            ORDER BY revenue DESC, s.store_id COLLATE "C"
+        """, repo.sales_date_range(int(year)))
+        if df.empty:
+            return pd.DataFrame(columns=['store_id', 'revenue'])
+        return df
+
+    @cached_result
+    def get_revenue_by_month(self, year: int, store_id: str = None) -> pd.DataFrame:
+        """
+        Monthly revenue for a year, across all stores or for one store. The
+        month comes from sale_date, so for one store every column read is in
+        the time-range covering index and it can answer without the heap.
+        """
+        df = self._query("""
+            SELECT EXTRACT(MONTH FROM s.sale_date)::int AS sale_month, SUM(s.quantity * p.price)::float8 AS revenue
+            FROM sales s
+            JOIN products p ON p.product_id = s.product_id
+            WHERE s.sale_date >= %(start)s AND s.sale_date < %(end)s
+              AND (%(store_id)s::varchar IS NULL OR s.store_id = %(store_id)s)
+            GROUP BY 1
+            ORDER BY 1
+        """, {"store_id": store_id, **repo.sales_date_range(int(year))})
+        if df.empty:
+            return pd.DataFrame(columns=['sale_month', 'revenue'])
+        return df
+
+    @cached_result
+    def get_revenue_by_category(self, year: int) -> pd.DataFrame:
+        """
+        Revenue by product category for a year.
+        """
+        df = self._query("""
+            SELECT p.category_id, SUM(s.quantity * p.price)::float8 AS revenue
+            FROM sales s
+            JOIN products p ON p.product_id = s.product_id
+            WHERE s.sale_date >= %(start)s AND s.sale_date < %(end)s
+            GROUP BY p.category_id
+            ORDER BY revenue DESC, p.category_id COLLATE "C"
+        """, repo.sales_date_range(int(year)))
+        if df.empty:
+            return pd.DataFrame(columns=['category_id', 'revenue'])
+        return df
+
+    #--------------------------------LEADERBOARDS------------------------------
+    @cached_result
+    def top_n(self, dimension: str = 'store_id', metric: str = 'revenue', window=None, n: int = 10) -> pd.DataFrame:
+        """
+        Leaderboard in SQL; ORDER BY ... LIMIT runs as a top-N heapsort, so
+        the grouped result is never fully sorted.
+        """
+        self._check_top_n(dimension, metric)
+        year, months = parse_window(window)
+        source = sql.SQL("p.category_id" if dimension == 'category_id' else "s.{}").format(sql.Identifier(dimension))
+        query = sql.SQL("""
+            SELECT {source} AS {dimension},
+                   SUM(s.quantity * p.price)::float8 AS revenue,
+                   SUM(s.quantity)::bigint AS units,
+                   COUNT(*) AS transactions
+            FROM sales s
+            JOIN products p ON p.product_id = s.product_id
+            WHERE (%(start)s::date IS NULL OR (s.sale_date >= %(start)s AND s.sale_date < %(end)s))
+            GROUP BY 1
+            ORDER BY {metric} DESC, {source} COLLATE "C"
+            LIMIT %(n)s
+        """).format(source=source, dimension=sql.Identifier(dimension), metric=sql.Identifier(metric))
+        # parse_window's months are contiguous, so the window is one sale_date range
+        df = self._query(query, {**repo.sales_date_range(year, months), "n": int(n)})
+        if df.empty:
+            return pd.DataFrame(columns=[dimension, *TOP_N_METRICS])
+        return df
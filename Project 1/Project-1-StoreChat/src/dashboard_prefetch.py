@@ -0,0 +1,129 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+
+try:
+    from src.dashboard_service import logger
+except ImportError:
+    from dashboard_service import logger
+
+# Worker threads and queued tasks allowed for background prefetch
+PREFETCH_WORKERS = int(os.getenv("DASHBOARD_PREFETCH_WORKERS", "2"))
+PREFETCH_MAX_PENDING = int(os.getenv("DASHBOARD_PREFETCH_MAX_PENDING", "16"))
+# How many of the year's highest-volume stores to warm
+PREFETCH_TOP_STORES = int(os.getenv("DASHBOARD_PREFETCH_TOP_STORES", "5"))
+
+
+class Prefetcher:
+    """
+    Warms a DashboardService's caches for likely next selections.
+
+    After the analyst picks a year and store, `prefetch` queues the queries
+    for the adjacent years and for the year's top stores by volume on a small
+    thread pool, so they are already cached when the selection changes. At
+    most `max_pending` tasks are queued at once. When the service's data
+    version changes, queued tasks are cancelled and tasks that have not
+    started yet skip their work.
+    """
+
+    def __init__(self, service, max_workers: int = PREFETCH_WORKERS,
+                 max_pending: int = PREFETCH_MAX_PENDING, top_stores: int = PREFETCH_TOP_STORES):
+        self.service = service
+        self.max_pending = max_pending
+        self.top_stores = top_stores
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="dashboard-prefetch")
+        self._futures = {}  # (method, args) -> Future
+        self._version = None
+        self._lock = threading.Lock()
+        self.submitted = 0
+        self.completed = 0
+        self.cancelled = 0
+        self.skipped = 0
+
+    def plan(self, year: int, store_id: str) -> list:
+        """(method name, args) pairs worth warming for the current selection"""
+        years = self.service.get_available_years()
+        tasks = []
+        for neighbour in (year + 1, year - 1):
+            if neighbour not in years:
+                continue
+            tasks += [
+                ('get_quantity_by_store', (neighbour,)),
+                ('get_revenue_by_store', (neighbour,)),
+                ('get_revenue_by_month', (neighbour,)),
+                ('get_revenue_by_category', (neighbour,)),
+                ('get_store_monthly_trend', (store_id, neighbour)),
+            ]
+
+        quantity = self.service.get_quantity_by_store(year)
+        if not quantity.empty:
+            top = quantity.nlargest(self.top_stores, 'total_quantity')['store_id']
+            tasks += [('get_store_monthly_trend', (top_store, year)) for top_store in top if top_store != store_id]
+        return tasks
+
+    def prefetch(self, year: int, store_id: str) -> int:
+        """Queue warm-up work for the selection; returns the number of tasks submitted"""
+        version = self.service.data_version()
+        if version is None:  # results would not be cached, so there is nothing to warm
+            return 0
+        with self._lock:
+            if version != self._version:
+                self._cancel_locked()
+                self._version = version
+            self._futures = {key: f for key, f in self._futures.items() if not f.done()}
+
+        submitted = 0
+        for method, args in self.plan(year, store_id):
+            key = (method, args)
+            with self._lock:
+                if key in self._futures:
+                    continue
+                if len(self._futures) >= self.max_pending:
+                    self.skipped += 1
+                    continue
+                self._futures[key] = self._executor.submit(self._run, version, method, args)
+                self.submitted += 1
+                submitted += 1
+        return submitted
+
+    def _run(self, version, method, args):
+        if self._version != version:
+            return
+        try:
+            getattr(self.service, method)(*args)
+            with self._lock:
+                self.completed += 1
+        except Exception as e:
+            logger.error(f"Prefetch of {method}{args} failed: {e}")
+
+    def _cancel_locked(self):
+        for future in self._futures.values():
+            if future.cancel():
+                self.cancelled += 1
+        self._futures.clear()
+
+    def cancel(self):
+        """Cancel queued work, e.g. after a data refresh"""
+        with self._lock:
+            self._cancel_locked()
+
+    def wait(self, timeout: float = None):
+        """Block until queued work finishes (used by tests and batch warm-ups)"""
+        with self._lock:
+            futures = list(self._futures.values())
+        wait(futures, timeout=timeout)
+
+    def shutdown(self):
+        self.cancel()
+        self._executor.shutdown(wait=False)
+
+    def stats(self) -> dict:
+        with self._lock:
+            in_flight = sum(1 for f in self._futures.values() if not f.done())
+        return {
+            'submitted': self.submitted,
+            'completed': self.completed,
+            'cancelled': self.cancelled,
+            'skipped': self.skipped,
+            'in_flight': in_flight,
+        }
@@ -0,0 +1,159 @@
+import os
+import json
+import time
+import socket
+import functools
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+
+import pandas as pd
+
+# JSON-lines file that profiled runs are appended to (relative to the working directory)
+PROFILE_LOG = os.getenv("DASHBOARD_PROFILE_LOG", "logs/dashboard_timings.jsonl")
+# Label for comparing deployments in the timings log
+DEPLOYMENT = os.getenv("DASHBOARD_DEPLOYMENT", socket.gethostname())
+
+# (profiler, names of the service calls in progress) while a RenderProfiler is active
+_active = ContextVar("dashboard_profiler", default=None)
+
+
+@contextmanager
+def profile_call(name: str):
+    """
+    Time the block as service call `name` in the active RenderProfiler, as a
+    child of the call it runs inside. Does nothing when no profiler is active.
+    """
+    active = _active.get()
+    if active is None:
+        yield
+        return
+    profiler, calls = active
+    token = _active.set((profiler, calls + (name,)))
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _active.reset(token)
+        profiler.record_call(name, time.perf_counter() - start, caller=calls[-1] if calls else None)
+
+def profiled(method):
+    """Record calls to a DashboardService method (see profile_call)"""
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        with profile_call(method.__name__):
+            return method(*args, **kwargs)
+    wrapper.profiled = True
+    return wrapper
+
+
+class RenderProfiler:
+    """
+    Wall-clock timings for one dashboard run.
+
+    `section(name, phase)` times a block of the script; phases are "load",
+    "filter", "aggregate", "figure" and "render". Service calls are recorded
+    too, attributed to the section they ran in: public calls on a service
+    wrapped with `wrap`, and, while a section or wrapped call is running,
+    the service's own inner calls (cached queries, loaders, the revenue
+    cube) with the call that made them as `caller`. A disabled profiler
+    records nothing and `wrap` returns the service itself.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.records = []  # dicts: kind, name, phase, section, caller, seconds
+        self._sections = []
+        self._start = time.perf_counter()
+
+    @contextmanager
+    def section(self, name: str, phase: str):
+        if not self.enabled:
+            yield
+            return
+        parent = self._sections[-1] if self._sections else None
+        self._sections.append(name)
+        start = time.perf_counter()
+        try:
+            with self.activate():
+                yield
+        finally:
+            self._sections.pop()
+            self.records.append({
+                'kind': 'section', 'name': name, 'phase': phase,
+                'section': parent, 'caller': None, 'seconds': time.perf_counter() - start,
+            })
+
+    @contextmanager
+    def activate(self):
+        """Make this the profiler that profile_call records to, unless it already is"""
+        active = _active.get()
+        if active is not None and active[0] is self:
+            yield
+            return
+        token = _active.set((self, ()))
+        try:
+            yield
+        finally:
+            _active.reset(token)
+
+    def record_call(self, name: str, seconds: float, caller: str = None):
+        self.records.append({
+            'kind': 'service', 'name': name, 'phase': 'service',
+            'section': self._sections[-1] if self._sections else None, 'caller': caller, 'seconds': seconds,
+        })
+
+    def wrap(self, service):
+        return ProfiledService(service, self) if self.enabled else service
+
+    def frame(self) -> pd.DataFrame:
+        return pd.DataFrame(self.records, columns=['kind', 'name', 'phase', 'section', 'caller', 'seconds'])
+
+    def phase_totals(self) -> pd.Series:
+        """Seconds per phase over top-level sections (nested sections are not double counted)"""
+        sections = self.frame()
+        sections = sections[(sections['kind'] == 'section') & sections['section'].isna()]
+        return sections.groupby('phase')['seconds'].sum().sort_values(ascending=False)
+
+    @property
+    def total_seconds(self) -> float:
+        return time.perf_counter() - self._start
+
+    def write_log(self, path=PROFILE_LOG, **context):
+        """Append this run as one JSON line, with `context` (selection, backend...) alongside"""
+        entry = {
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'deployment': DEPLOYMENT,
+            'total_seconds': round(self.total_seconds, 6),
+            **context,
+            'records': [{**r, 'seconds': round(r['seconds'], 6)} for r in self.records],
+        }
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, default=str) + "\n")
+
+
+class ProfiledService:
+    """
+    Proxy that times every public method call on a DashboardService. Methods
+    instrumented with `profiled` record themselves; the proxy only activates
+    the profiler around them.
+    """
+
+    def __init__(self, service, profiler: RenderProfiler):
+        self._service = service
+        self._profiler = profiler
+
+    def __getattr__(self, name):
+        attr = getattr(self._service, name)
+        if name.startswith('_') or not callable(attr):
+            return attr
+
+        @functools.wraps(attr)
+        def timed(*args, **kwargs):
+            with self._profiler.activate():
+                if getattr(attr, 'profiled', False):
+                    return attr(*args, **kwargs)
+                with profile_call(name):
+                    return attr(*args, **kwargs)
+        return timed
@@ -1,41 +1,331 @@
+import os
+import math
+import functools
+from dataclasses import dataclass
+import numpy as np
 import pandas as pd
 from pathlib import Path
 import logging
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+try:
+    from src import columnar, readers
+    from src.dashboard_cache import ArrayCache, DiskResultCache, FrameCache, ResultCache, SingleFlight, file_fingerprint
+    from src.dashboard_profiler import profile_call, profiled
+    from src.logger import configure as configure_logging
+except ImportError:
+    import columnar
+    import readers
+    from dashboard_cache import ArrayCache, DiskResultCache, FrameCache, ResultCache, SingleFlight, file_fingerprint
+    from dashboard_profiler import profile_call, profiled
+    from logger import configure as configure_logging
+
 logger = logging.getLogger(__name__)
 
+# Memory budget for parsed frames, overridable with DASHBOARD_CACHE_MB
+DEFAULT_CACHE_MAX_BYTES = int(os.getenv("DASHBOARD_CACHE_MB", "512")) * 1024 * 1024
+# Memory budget for the row positions of sorted/filtered sales pages (DASHBOARD_POSITIONS_MB)
+POSITIONS_CACHE_MAX_BYTES = int(os.getenv("DASHBOARD_POSITIONS_MB", "256")) * 1024 * 1024
+# Query result cache: entry count and time-to-live in seconds
+RESULT_CACHE_SIZE = int(os.getenv("DASHBOARD_RESULT_CACHE_SIZE", "256"))
+RESULT_CACHE_TTL = float(os.getenv("DASHBOARD_RESULT_TTL", "600"))
+# Data source for the dashboard: "csv" (files under dataset_path) or "postgres"
+DASHBOARD_BACKEND = os.getenv("DASHBOARD_BACKEND", "csv")
+# Derived files (columnar copies, result caches); defaults to <dataset_path>/.cache
+DASHBOARD_CACHE_DIR = os.getenv("DASHBOARD_CACHE_DIR")
+# On-disk result cache that survives restarts ("0" disables) and its entry limit
+DISK_CACHE_ENABLED = os.getenv("DASHBOARD_DISK_CACHE", "1") != "0"
+DISK_CACHE_SIZE = int(os.getenv("DASHBOARD_DISK_CACHE_SIZE", "2048"))
+
+SALES_COLUMNS = ['sale_id', 'sale_date', 'store_id', 'product_id', 'quantity']
+# Leaderboard (top_n) dimensions and metrics
+TOP_N_DIMENSIONS = ('store_id', 'product_id', 'category_id')
+TOP_N_METRICS = ('revenue', 'units', 'transactions')
+
+def parse_window(window) -> tuple:
+    """
+    Normalise a top_n time window to (year, months): None or "all" for all
+    time, a year (2023 or "2023"), a quarter ("2023-Q2") or a month
+    ("2023-06"). `months` is None for a whole year.
+    """
+    if window is None or window == "all":
+        return None, None
+    text = str(window).strip().upper()
+    try:
+        if "-Q" in text:
+            year, quarter = text.split("-Q")
+            quarter = int(quarter)
+            if not 1 <= quarter <= 4:
+                raise ValueError
+            return int(year), tuple(range(3 * quarter - 2, 3 * quarter + 1))
+        if "-" in text:
+            year, month = text.split("-")
+            if not 1 <= int(month) <= 12:
+                raise ValueError
+            return int(year), (int(month),)
+        return int(text), None
+    except ValueError:
+        raise ValueError(f"Unknown window {window!r}; use a year, 'YYYY-Qn', 'YYYY-MM' or 'all'") from None
+
+def parse_page(page, page_size) -> tuple:
+    """Validate 1-based paging arguments as (page, page_size), both ints of at least 1"""
+    page, page_size = int(page), int(page_size)
+    if page < 1 or page_size < 1:
+        raise ValueError(f"page and page_size must be at least 1, got page={page}, page_size={page_size}")
+    return page, page_size
+
+def top_positions(values: np.ndarray, keys: np.ndarray, n: int) -> np.ndarray:
+    """
+    Positions of the `n` largest values, highest first, ties broken by key.
+    Uses a partial selection (np.partition) to find the cut-off, so only the
+    candidates at or above it are sorted.
+    """
+    if n <= 0 or len(values) == 0:
+        return np.array([], dtype=np.int64)
+    if n < len(values):
+        cutoff = -np.partition(-values, n - 1)[n - 1]
+        candidates = np.flatnonzero(values >= cutoff)
+    else:
+        candidates = np.arange(len(values))
+    order = np.lexsort((keys[candidates], -values[candidates]))
+    return candidates[order[:n]]
+
+def cached_result(method):
+    """
+    Cache a DashboardService query in its ResultCache, keyed by method name,
+    arguments and the service's current data version. On a miss the service's
+    DiskResultCache (if any) is consulted before computing, and new results
+    are written to it. Cached frames are shared between callers and must not
+    be mutated. When the data version is unknown (None) the query runs
+    uncached, since a result could not be told apart from a stale one.
+    Calls are recorded by an active RenderProfiler (see profile_call).
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with profile_call(method.__name__):
+            return cached_call(self, args, kwargs)
+
+    def cached_call(self, args, kwargs):
+        query = (method.__name__, args, tuple(sorted(kwargs.items())))
+        version = self.data_version()
+        if version is None:
+            return method(self, *args, **kwargs)
+
+        def compute():
+            disk_cache = self.disk_cache
+            if disk_cache is None:
+                return method(self, *args, **kwargs)
+            try:
+                value = disk_cache.get(query, version)
+            except Exception as e:
+                logger.error(f"Error reading disk cache: {e}")
+                value = DiskResultCache.MISSING
+            if value is DiskResultCache.MISSING:
+                value = method(self, *args, **kwargs)
+                try:
+                    disk_cache.put(query, version, value)
+                except Exception as e:
+                    logger.error(f"Error writing disk cache: {e}")
+            return value
+
+        return self.result_cache.get_or_compute(query + (version,), compute)
+    wrapper.profiled = True
+    return wrapper
+
+
+@dataclass
+class SalesPage:
+    """
+    One page of sales transactions. `next_key` is the keyset cursor for the
+    following page when the backend supports it (Postgres); pass it back as
+    `after` to fetch that page without an OFFSET scan.
+    """
+    rows: pd.DataFrame
+    page: int
+    page_size: int
+    total_rows: int
+    next_key: tuple = None
+
+    @property
+    def total_pages(self) -> int:
+        return max(1, math.ceil(self.total_rows / self.page_size))
+
+
+class SummaryIndex:
+    """
+    Store sales summary partitioned once per data version.
+
+    `partitions` maps (store_id, sale_year) to that store's monthly rows
+    (sorted, with month names) and `year_totals` maps each year to its
+    quantity-by-store totals, so sidebar filters resolve with dict lookups
+    instead of boolean masks over the whole summary.
+    """
+
+    def __init__(self, summary: pd.DataFrame):
+        summary = summary.sort_values(['store_id', 'sale_year', 'sale_month'], kind='stable')
+        summary = summary.assign(
+            month_name=pd.to_datetime(summary['sale_month'], format='%m').dt.month_name()
+        )
+        self.partitions = {
+            (store_id, int(year)): frame
+            for (store_id, year), frame in summary.groupby(['store_id', 'sale_year'], sort=False)
+        }
+        totals = summary.groupby(['sale_year', 'store_id'])['total_quantity'].sum()
+        self.year_totals = {
+            int(year): frame.droplevel('sale_year').reset_index()
+            for year, frame in totals.groupby(level='sale_year')
+        }
+        self.years = sorted(self.year_totals)
+        self.stores = sorted(summary['store_id'].unique())
+
+
+class RevenueCube:
+    """
+    Revenue aggregates precomputed from one version of sales and products.
+
+    `base` holds revenue, units and transactions at (year, month, store,
+    product, category) grain; the by_* Series are rolled up from it so a
+    year query is a single index lookup instead of a filter, merge and groupby.
+    """
+
+    def __init__(self, base: pd.DataFrame):
+        self.base = base
+        self.by_year_store = base.groupby(['sale_year', 'store_id'])['revenue'].sum()
+        self.by_year_month = base.groupby(['sale_year', 'sale_month'])['revenue'].sum()
+        self.by_year_store_month = base.groupby(['sale_year', 'store_id', 'sale_month'])['revenue'].sum()
+        self.by_year_category = base.groupby(['sale_year', 'category_id'])['revenue'].sum()
+        self._rollups = {}
+
+    def rollup(self, dimension: str) -> pd.DataFrame:
+        """Revenue, units and transactions per (year, month, dimension), built on first use"""
+        if dimension not in self._rollups:
+            self._rollups[dimension] = self.base.groupby(
+                ['sale_year', 'sale_month', dimension], as_index=False
+            )[list(TOP_N_METRICS)].sum()
+        return self._rollups[dimension]
+
+    @classmethod
+    def build(cls, sales: pd.DataFrame, products: pd.DataFrame) -> "RevenueCube":
+        sales = sales[sales['sale_date'].notna()]
+        merged = sales[['sale_id', 'sale_date', 'store_id', 'product_id', 'quantity']].merge(
+            products[['Product_ID', 'Category_ID', 'Price']],
+            left_on='product_id',
+            right_on='Product_ID',
+            how='inner'
+        )
+        merged['revenue'] = merged['quantity'] * merged['Price']
+        merged['sale_year'] = merged['sale_date'].dt.year
+        merged['sale_month'] = merged['sale_date'].dt.month
+        base = merged.groupby(
+            ['sale_year', 'sale_month', 'store_id', 'product_id', 'Category_ID']
+        ).agg(
+            revenue=('revenue', 'sum'),
+            units=('quantity', 'sum'),
+            transactions=('sale_id', 'count')
+        ).reset_index().rename(columns={'Category_ID': 'category_id'})
+        return cls(base)
+
+    @staticmethod
+    def slice(series: pd.Series, key) -> pd.Series:
+        """Return the sub-Series under `key`, or an empty Series if it is absent"""
+        try:
+            return series.loc[key]
+        except KeyError:
+            return series.iloc[0:0].droplevel(list(range(len(key) if isinstance(key, tuple) else 1)))
+
+
 class DashboardService:
     """
     Facade for retrieving and processing dashboard data.
     """
-    
-    def __init__(self, dataset_path: str = "../dataset"):
+
+    def __init__(self, dataset_path: str = "../dataset", cache_max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+                 result_cache_size: int = RESULT_CACHE_SIZE, result_ttl: float = RESULT_CACHE_TTL,
+                 cache_dir: str = DASHBOARD_CACHE_DIR, disk_cache: bool = DISK_CACHE_ENABLED,
+                 positions_max_bytes: int = POSITIONS_CACHE_MAX_BYTES):
         """
         Initialize the service with the path to the dataset directory.
         Resolves the path relative to the current working directory.
+
+        Parsed CSVs are kept in an LRU cache bounded by `cache_max_bytes` and
+        reparsed only when a file's mtime or size changes. Frames returned by
+        the load_* methods are shared with the cache; copy before mutating.
+        Query results (get_* methods) are cached per data version in a
+        ResultCache with `result_cache_size` entries and `result_ttl` seconds TTL.
+        Row positions behind sorted or filtered sales pages are kept apart, in
+        an ArrayCache bounded by `positions_max_bytes`.
+        Derived files such as the columnar copy of sales.csv go in `cache_dir`,
+        along with the on-disk result cache (`disk_cache`) that lets a fresh
+        process start warm while the data is unchanged.
+        The service is shared between sessions: concurrent requests for the
+        same load or build wait on the one in flight (see `cache_stats`).
         """
-        # Try to resolve the path relative to the file location if possible, 
+        # Try to resolve the path relative to the file location if possible,
         # or rely on the passed path relative to CWD.
         # Assuming the app is run from 'src/' usually.
+        configure_logging()
         self.dataset_path = Path(dataset_path)
-        
+        self.frame_cache = FrameCache(cache_max_bytes)
+        self.cache_dir = Path(cache_dir) if cache_dir else self.dataset_path / ".cache"
+        self.result_cache = ResultCache(result_cache_size, result_ttl)
+        self.positions_cache = ArrayCache(positions_max_bytes)
+        self._revenue_cube = None
+        self._revenue_cube_version = None
+        self._summary_index = None
+        self._summary_index_version = None
+        self._flight = SingleFlight()
+        self.disk_cache = self._open_disk_cache() if disk_cache else None
+
+    def _open_disk_cache(self):
+        # One file per backend, since their data versions differ
+        path = self.cache_dir / f"results-{type(self).__name__}.sqlite"
+        try:
+            return DiskResultCache(path, DISK_CACHE_SIZE)
+        except Exception as e:
+            logger.error(f"Disk result cache unavailable at {path}: {e}")
+            return None
+
+    #--------------------------------PARSERS------------------------------
+    @staticmethod
+    def _parse_summary(file_path: Path) -> pd.DataFrame:
+        df = readers.read_dataset("store_sales_summary", file_path)
+        # Ensure proper types
+        df['sale_year'] = df['sale_year'].astype(int)
+        df['sale_month'] = df['sale_month'].astype(int)
+        # Create a date column for plotting
+        df['date'] = pd.to_datetime(
+            df['sale_year'].astype(str) + '-' + df['sale_month'].astype(str) + '-01'
+        )
+        return df
+
+    @staticmethod
+    def _parse_sales(file_path: Path) -> pd.DataFrame:
+        df = readers.read_dataset("sales", file_path)
+        df['sale_date'] = pd.to_datetime(df['sale_date'], format='%d-%m-%Y', errors='coerce')
+        return df
+
+    @staticmethod
+    def _parse_sales_chunk(df: pd.DataFrame) -> pd.DataFrame:
+        """Parse a chunk of sales.csv with dtypes that stay stable from chunk to chunk"""
+        df = df.copy()
+        df['sale_date'] = pd.to_datetime(df['sale_date'], format='%d-%m-%Y', errors='coerce')
+        df['quantity'] = pd.to_numeric(df['quantity'], errors='coerce').astype('Int64')
+        for column in ('sale_id', 'store_id', 'product_id'):
+            df[column] = df[column].astype('string')
+        return df
+
+    @staticmethod
+    def _parse_products(file_path: Path) -> pd.DataFrame:
+        return readers.read_dataset("products", file_path)
+
+    #--------------------------------LOADERS------------------------------
+    @profiled
     def load_summary_data(self) -> pd.DataFrame:
         """
         Load store sales summary data.
         """
         try:
             file_path = self.dataset_path / "store_sales_summary.csv"
-            df = pd.read_csv(file_path)
-            # Ensure proper types
-            df['sale_year'] = df['sale_year'].astype(int)
-            df['sale_month'] = df['sale_month'].astype(int)
-            # Create a date column for plotting
-            df['date'] = pd.to_datetime(
-                df['sale_year'].astype(str) + '-' + df['sale_month'].astype(str) + '-01'
-            )
-            return df
+            return self.frame_cache.get(file_path, self._parse_summary)
         except FileNotFoundError:
             logger.error(f"File not found: {file_path}")
             return pd.DataFrame()
@@ -43,15 +333,14 @@ class DashboardService:
             logger.error(f"Error loading summary data: {e}")
             return pd.DataFrame()
 
+    @profiled
     def load_sales_data(self) -> pd.DataFrame:
         """
         Load sales transaction data.
         """
         try:
             file_path = self.dataset_path / "sales.csv"
-            df = pd.read_csv(file_path)
-            df['sale_date'] = pd.to_datetime(df['sale_date'], format='%d-%m-%Y', errors='coerce')
-            return df
+            return self.frame_cache.get(file_path, self._parse_sales)
         except FileNotFoundError:
             logger.error(f"File not found: {file_path}")
             return pd.DataFrame()
@@ -59,14 +348,14 @@ class DashboardService:
             logger.error(f"Error loading sales data: {e}")
             return pd.DataFrame()
 
+    @profiled
     def load_products_data(self) -> pd.DataFrame:
         """
         Load product information.
         """
         try:
             file_path = self.dataset_path / "products.csv"
-            df = pd.read_csv(file_path)
-            return df
+            return self.frame_cache.get(file_path, self._parse_products)
         except FileNotFoundError:
             logger.error(f"File not found: {file_path}")
             return pd.DataFrame()
@@ -74,35 +363,329 @@ class DashboardService:
             logger.error(f"Error loading products data: {e}")
             return pd.DataFrame()
 
-    def get_revenue_by_store(self, year: int) -> pd.DataFrame:
+    #--------------------------------PAGINATED SALES------------------------------
+    def _sales_columnar_path(self) -> Path:
         """
-        Calculate revenue by store for a specific year.
-        Merges sales and products data.
+        Parquet copy of sales.csv for the file's current version, converted in
+        streaming chunks on first use. Copies of older versions are removed.
         """
+        _, mtime, size = file_fingerprint(self.dataset_path / "sales.csv")
+        path = self.cache_dir / f"sales-{mtime}-{size}.parquet"
+        if not path.exists():
+            self._flight.do(('columnar', path), lambda: self._build_sales_columnar(path))
+        return path
+
+    def _build_sales_columnar(self, path: Path):
+        if path.exists():
+            return
+        for stale in self.cache_dir.glob("sales-*.parquet"):
+            stale.unlink(missing_ok=True)
+        logger.info(f"Building columnar copy of sales.csv at {path}")
+        columnar.convert_csv(self.dataset_path / "sales.csv", path, self._parse_sales_chunk)
+
+    def _sales_positions(self, path: Path, sort_by, descending, store_id, year):
+        """
+        Row positions matching the filters in sort order, or None when neither
+        is requested (file order). Reads only the filter and sort columns.
+        """
+        if sort_by is None and store_id is None and year is None:
+            return None
+
+        def compute():
+            columns = {sort_by} if sort_by else set()
+            if store_id is not None:
+                columns.add('store_id')
+            if year is not None:
+                columns.add('sale_date')
+            frame = columnar.read_columns(path, sorted(columns))
+            mask = np.ones(len(frame), dtype=bool)
+            if store_id is not None:
+                mask &= (frame['store_id'] == store_id).fillna(False).to_numpy(dtype=bool)
+            if year is not None:
+                mask &= (frame['sale_date'].dt.year == year).to_numpy(dtype=bool)
+            frame = frame[mask]
+            if sort_by is not None:
+                frame = frame.sort_values(sort_by, ascending=not descending, kind='stable', na_position='last')
+            positions = frame.index.to_numpy()
+            # Half the memory of int64 whenever the positions fit
+            if len(positions) and positions.max() <= np.iinfo(np.int32).max:
+                positions = positions.astype(np.int32)
+            return positions
+
+        # The parquet path embeds the sales.csv version, so it doubles as the data version
+        key = (str(path), sort_by, descending, store_id, year)
+        return self.positions_cache.get_or_compute(key, compute)
+
+    def _sales_page_from_frame(self, page, page_size, sort_by, descending, store_id, year) -> SalesPage:
+        """Fallback without pyarrow: page through the cached, fully parsed frame"""
+        sales = self.load_sales_data()
+        if sales.empty:
+            return SalesPage(pd.DataFrame(columns=SALES_COLUMNS), page, page_size, 0)
+        if store_id is not None:
+            sales = sales[sales['store_id'] == store_id]
+        if year is not None:
+            sales = sales[sales['sale_date'].dt.year == year]
+        if sort_by is not None:
+            sales = sales.sort_values(sort_by, ascending=not descending, kind='stable', na_position='last')
+        offset = (page - 1) * page_size
+        return SalesPage(sales.iloc[offset:offset + page_size].reset_index(drop=True), page, page_size, len(sales))
+
+    @cached_result
+    def get_sales_page(self, page: int = 1, page_size: int = 100, sort_by: str = None,
+                       descending: bool = False, store_id: str = None, year: int = None,
+                       after: tuple = None) -> SalesPage:
+        """
+        One page of sales transactions, optionally filtered by store and year
+        and sorted by a sales column. Only the row groups holding the page are
+        read from the columnar copy of sales.csv, so an unsorted, unfiltered
+        page costs the same whatever the file size. `after` is accepted for
+        API compatibility with the keyset-paginated Postgres backend.
+        """
+        if sort_by is not None and sort_by not in SALES_COLUMNS:
+            raise ValueError(f"Cannot sort sales by {sort_by}")
+        page, page_size = parse_page(page, page_size)
+        offset = (page - 1) * page_size
+        try:
+            if not columnar.available():
+                return self._sales_page_from_frame(page, page_size, sort_by, descending, store_id, year)
+
+            path = self._sales_columnar_path()
+            positions = self._sales_positions(path, sort_by, descending, store_id, year)
+            if positions is None:
+                total_rows = columnar.num_rows(path)
+                page_positions = np.arange(offset, min(offset + page_size, total_rows))
+            else:
+                total_rows = len(positions)
+                page_positions = positions[offset:offset + page_size]
+            rows = columnar.read_rows(path, page_positions)
+            return SalesPage(rows, page, page_size, total_rows)
+        except FileNotFoundError:
+            logger.error(f"File not found: {self.dataset_path / 'sales.csv'}")
+            return SalesPage(pd.DataFrame(columns=SALES_COLUMNS), page, page_size, 0)
+
+    #--------------------------------DATA VERSION------------------------------
+    def data_version(self, *file_names: str) -> tuple:
+        """
+        Fingerprint (path, mtime, size) of the given dataset files, or of all
+        dashboard inputs when none are given. Missing files fingerprint as None.
+        Backends return None when the version cannot be read; cached_result
+        then bypasses the cache.
+        """
+        names = file_names or ("store_sales_summary.csv", "sales.csv", "products.csv")
+        version = []
+        for name in names:
+            try:
+                version.append(file_fingerprint(self.dataset_path / name))
+            except FileNotFoundError:
+                version.append(None)
+        return tuple(version)
+
+    def cache_stats(self) -> dict:
+        """
+        Hit/miss counters and compute time saved by the result cache, plus
+        `shared_loads`: loads, builds and queries that waited on an identical
+        in-flight call instead of repeating it, and `disk_hits`: results
+        restored from the on-disk cache.
+        """
+        stats = self.result_cache.stats()
+        stats['shared_loads'] = (self.result_cache.flight.shared + self.frame_cache.flight.shared
+                                + self.positions_cache.flight.shared + self._flight.shared)
+        stats['disk_hits'] = self.disk_cache.hits if self.disk_cache is not None else 0
+        return stats
+
+    #--------------------------------SUMMARY QUERIES------------------------------
+    def _summary_version(self) -> tuple:
+        return self.data_version("store_sales_summary.csv")
+
+    @profiled
+    def get_summary_index(self):
+        """
+        Return the SummaryIndex for the current summary data, rebuilding it
+        only when the data changes. None if the summary is missing. Built
+        afresh, and not kept, while the data version is unknown.
+        """
+        version = self._summary_version()
+        if version is None:
+            summary = self.load_summary_data()
+            return None if summary.empty else SummaryIndex(summary)
+        if self._summary_index_version == version:
+            return self._summary_index
+        return self._flight.do(('summary_index', version), lambda: self._build_summary_index(version))
+
+    def _build_summary_index(self, version):
+        summary = self.load_summary_data()
+        index = None if summary.empty else SummaryIndex(summary)
+        self._summary_index, self._summary_index_version = index, version
+        return index
+
+    def get_available_years(self) -> list:
+        index = self.get_summary_index()
+        return index.years if index is not None else []
+
+    def get_available_stores(self) -> list:
+        index = self.get_summary_index()
+        return index.stores if index is not None else []
+
+    @cached_result
+    def get_quantity_by_store(self, year: int) -> pd.DataFrame:
+        """
+        Total quantity sold per store for a year.
+        """
+        index = self.get_summary_index()
+        if index is None or year not in index.year_totals:
+            return pd.DataFrame(columns=['store_id', 'total_quantity'])
+        return index.year_totals[year]
+
+    @cached_result
+    def get_store_monthly_trend(self, store_id: str, year: int) -> pd.DataFrame:
+        """
+        Monthly summary rows for one store and year, with a readable month name.
+        """
+        index = self.get_summary_index()
+        if index is None or (store_id, year) not in index.partitions:
+            return pd.DataFrame(columns=['sale_month', 'total_quantity', 'month_name'])
+        return index.partitions[(store_id, year)]
+
+    #--------------------------------DAILY SERIES------------------------------
+    @cached_result
+    def get_daily_sales(self, store_id: str = None, year: int = None) -> pd.DataFrame:
+        """
+        Quantity and transaction count per day, optionally for one store and
+        year. Multi-year ranges are long; downsample before plotting.
+        """
+        sales = self.load_sales_data()
+        if sales.empty:
+            return pd.DataFrame(columns=['sale_date', 'total_quantity', 'total_transactions'])
+        mask = np.ones(len(sales), dtype=bool)
+        if store_id is not None:
+            mask &= (sales['store_id'] == store_id).to_numpy(dtype=bool)
+        if year is not None:
+            mask &= (sales['sale_date'].dt.year == year).to_numpy(dtype=bool)
+        return (
+            sales[mask]
+            .groupby('sale_date')
+            .agg(total_quantity=('quantity', 'sum'), total_transactions=('sale_id', 'count'))
+            .reset_index()
+        )
+
+    #--------------------------------AGGREGATES------------------------------
+    @profiled
+    def get_revenue_cube(self):
+        """
+        Return the RevenueCube for the current sales and products files,
+        rebuilding it only when either file has changed. None if data is missing.
+        """
+        version = self.data_version("sales.csv", "products.csv")
+        if self._revenue_cube_version == version:
+            return self._revenue_cube
+        return self._flight.do(('revenue_cube', version), lambda: self._build_revenue_cube(version))
+
+    def _build_revenue_cube(self, version):
         sales = self.load_sales_data()
         products = self.load_products_data()
-        
-        if sales.empty or products.empty:
+        cube = None if sales.empty or products.empty else RevenueCube.build(sales, products)
+        self._revenue_cube, self._revenue_cube_version = cube, version
+        return cube
+
+    @cached_result
+    def get_revenue_by_store(self, year: int) -> pd.DataFrame:
+        """
+        Revenue by store for a specific year, sliced from the revenue cube.
+        """
+        cube = self.get_revenue_cube()
+        if cube is None:
             return pd.DataFrame(columns=['store_id', 'revenue'])
 
-        # Filter by year
-        sales_filtered = sales[sales['sale_date'].dt.year == year]
-        
-        if sales_filtered.empty:
+        revenue = RevenueCube.slice(cube.by_year_store, year)
+        if revenue.empty:
             return pd.DataFrame(columns=['store_id', 'revenue'])
 
-        # Merge
-        merged = sales_filtered.merge(
-            products, 
-            left_on='product_id', 
-            right_on='Product_ID', 
-            how='inner'
+        revenue_by_store = revenue.rename('revenue').reset_index()
+        return revenue_by_store.sort_values('revenue', ascending=False, kind='stable', ignore_index=True)
+
+    @cached_result
+    def get_revenue_by_month(self, year: int, store_id: str = None) -> pd.DataFrame:
+        """
+        Monthly revenue for a year, across all stores or for one store.
+        """
+        cube = self.get_revenue_cube()
+        if cube is None:
+            return pd.DataFrame(columns=['sale_month', 'revenue'])
+
+        if store_id is None:
+            revenue = RevenueCube.slice(cube.by_year_month, year)
+        else:
+            revenue = RevenueCube.slice(cube.by_year_store_month, (year, store_id))
+        return revenue.rename('revenue').reset_index().sort_values('sale_month', ignore_index=True)
+
+    @cached_result
+    def get_revenue_by_category(self, year: int) -> pd.DataFrame:
+        """
+        Revenue by product category for a year.
+        """
+        cube = self.get_revenue_cube()
+        if cube is None:
+            return pd.DataFrame(columns=['category_id', 'revenue'])
+
+        revenue = RevenueCube.slice(cube.by_year_category, year)
+        return revenue.rename('revenue').reset_index().sort_values(
+            'revenue', ascending=False, kind='stable', ignore_index=True
         )
-        
-        # Calculate revenue
-        merged['revenue'] = merged['quantity'] * merged['Price']
-        
-        # Group by store
-        revenue_by_store = merged.groupby('store_id')['revenue'].sum().reset_index()
-        return revenue_by_store.sort_values('revenue', ascending=False)
 
+    #--------------------------------LEADERBOARDS------------------------------
+    @staticmethod
+    def _check_top_n(dimension: str, metric: str):
+        if dimension not in TOP_N_DIMENSIONS:
+            raise ValueError(f"Unknown dimension {dimension!r}; expected one of {TOP_N_DIMENSIONS}")
+        if metric not in TOP_N_METRICS:
+            raise ValueError(f"Unknown metric {metric!r}; expected one of {TOP_N_METRICS}")
+
+    @cached_result
+    def top_n(self, dimension: str = 'store_id', metric: str = 'revenue', window=None, n: int = 10) -> pd.DataFrame:
+        """
+        The `n` members of `dimension` (store_id, product_id or category_id)
+        with the highest `metric` (revenue, units or transactions) within
+        `window` (see parse_window), highest first with ties broken by id.
+        All three metrics are returned. Computed from the cube's monthly
+        roll-up with a partial selection instead of a full sort.
+        """
+        self._check_top_n(dimension, metric)
+        year, months = parse_window(window)
+        columns = [dimension, *TOP_N_METRICS]
+        cube = self.get_revenue_cube()
+        if cube is None:
+            return pd.DataFrame(columns=columns)
+
+        rollup = cube.rollup(dimension)
+        mask = np.ones(len(rollup), dtype=bool)
+        if year is not None:
+            mask &= (rollup['sale_year'] == year).to_numpy()
+        if months is not None:
+            mask &= rollup['sale_month'].isin(months).to_numpy()
+        totals = rollup[mask].groupby(dimension)[list(TOP_N_METRICS)].sum()
+
+        positions = top_positions(totals[metric].to_numpy(dtype=float), totals.index.to_numpy(dtype=object), n)
+        return totals.iloc[positions].reset_index()[columns]
+
+    def get_top_products(self, year: int, n: int = 10) -> pd.DataFrame:
+        """
+        The `n` products with the highest revenue in a year, with units sold.
+        """
+        return self.top_n('product_id', 'revenue', int(year), n)[['product_id', 'revenue', 'units']]
+
+
+def create_dashboard_service(backend: str = None, **kwargs) -> DashboardService:
+    """
+    Build the DashboardService for `backend` ("csv" or "postgres"),
+    defaulting to the DASHBOARD_BACKEND environment variable.
+    """
+    backend = (backend or DASHBOARD_BACKEND).lower()
+    if backend == "csv":
+        return DashboardService(**kwargs)
+    if backend in ("postgres", "postgresql", "pg"):
+        try:
+            from src.dashboard_pg import PostgresDashboardService
+        except ImportError:
+            from dashboard_pg import PostgresDashboardService
+        return PostgresDashboardService(**kwargs)
+    raise ValueError(f"Unknown dashboard backend: {backend}")
@@ -0,0 +1,93 @@
+"""
+Downsampling for line charts, so long series render in constant time.
+
+`downsample` keeps at most a point budget of rows (see `point_budget`):
+"minmax" keeps each bucket's lowest and highest point, so every peak and
+trough survives; "lttb" (Largest-Triangle-Three-Buckets) keeps the point that
+best preserves the visual shape of each bucket.
+"""
+import numpy as np
+import pandas as pd
+
+# A line chart can't show more than a couple of distinct points per pixel
+POINTS_PER_PIXEL = 2
+MIN_POINTS = 100
+
+
+def point_budget(width_px: int, points_per_pixel: float = POINTS_PER_PIXEL) -> int:
+    """Number of points worth sending to a chart `width_px` pixels wide"""
+    return max(MIN_POINTS, int(width_px * points_per_pixel))
+
+
+def _as_float(values) -> np.ndarray:
+    values = pd.Series(values)
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values.astype('int64').to_numpy(dtype=float)
+    return values.to_numpy(dtype=float)
+
+
+def minmax_indices(y, n_out: int) -> np.ndarray:
+    """
+    Positions of the minimum and maximum of `y` in each of n_out // 2 equal
+    buckets, plus the first and last point, in ascending order.
+    """
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if n <= n_out:
+        return np.arange(n)
+    n_buckets = max(1, n_out // 2)
+    edges = np.linspace(0, n, n_buckets + 1).astype(np.int64)
+    selected = [0, n - 1]
+    for start, end in zip(edges[:-1], edges[1:]):
+        bucket = y[start:end]
+        selected += [start + bucket.argmin(), start + bucket.argmax()]
+    return np.unique(selected)
+
+
+def lttb_indices(x, y, n_out: int) -> np.ndarray:
+    """
+    Positions chosen by Largest-Triangle-Three-Buckets: the first and last
+    point, and from each of n_out - 2 buckets the point forming the largest
+    triangle with the previously chosen point and the next bucket's mean.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if n <= n_out or n_out < 3:
+        return np.arange(n) if n <= n_out else np.array([0, n - 1])
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    previous = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            next_x = x[end:edges[i + 2]].mean()
+            next_y = y[end:edges[i + 2]].mean()
+        else:
+            next_x, next_y = x[n - 1], y[n - 1]
+        area = np.abs(
+            (x[previous] - next_x) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (next_y - y[previous])
+        )
+        previous = start + int(area.argmax())
+        selected[i + 1] = previous
+    return selected
+
+
+def downsample(df: pd.DataFrame, x: str, y: str, max_points: int, method: str = "minmax") -> pd.DataFrame:
+    """
+    Return at most about `max_points` rows of `df` (sorted by `x`) for
+    plotting `y` against `x`. Frames already within budget are returned as is.
+    """
+    if len(df) <= max_points:
+        return df
+    df = df.dropna(subset=[y]).sort_values(x, kind='stable')
+    if method == "minmax":
+        positions = minmax_indices(df[y], max_points)
+    elif method == "lttb":
+        positions = lttb_indices(_as_float(df[x]), df[y], max_points)
+    else:
+        raise ValueError(f"Unknown downsampling method: {method}")
+    return df.iloc[positions]
@@ -0,0 +1,123 @@
+import os
+import io
+import csv
+import sys
+import json
+import uuid
+import argparse
+from datetime import date, datetime
+try:
+    from src import repo, logger
+except ImportError:
+    import repo
+    import logger
+
+# Rows fetched per round trip by the server-side cursor
+EXPORT_ITERSIZE = int(os.getenv("EXPORT_ITERSIZE", "10000"))
+EXPORT_COLUMNS = ['sale_id', 'sale_date', 'store_id', 'product_id', 'quantity']
+EXPORT_FORMATS = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+EXPORT_QUERY = """
+    SELECT sale_id, sale_date, store_id, product_id, quantity
+    FROM sales
+    WHERE (%(store_id)s::varchar IS NULL OR store_id = %(store_id)s)
+      AND (%(start)s::date IS NULL OR (sale_date >= %(start)s AND sale_date < %(end)s))
+    ORDER BY sale_date, sale_id
+"""
+
+
+#--------------------------------READING------------------------------
+def iter_sales(store_id: str = None, year: int = None, itersize: int = EXPORT_ITERSIZE):
+    """
+    Yield sales rows (tuples in EXPORT_COLUMNS order) for an optional store
+    and year, in sale_date order. Rows come from a named (server-side) cursor
+    that fetches `itersize` rows per round trip, so only one batch is held
+    in memory however many rows match. The pooled connection is returned
+    when the generator is exhausted or closed.
+    """
+    with repo.pooled_conn() as conn:
+        with conn.cursor(name=f"export_sales_{uuid.uuid4().hex}") as cur:
+            cur.itersize = itersize
+            cur.execute(EXPORT_QUERY, {"store_id": store_id, **repo.sales_date_range(None if year is None else int(year))})
+            yield from cur
+
+
+#--------------------------------FORMATTING------------------------------
+def _json_value(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+def format_rows(rows, fmt: str = "csv", batch_size: int = EXPORT_ITERSIZE):
+    """
+    Encode rows as CSV (with a header) or NDJSON, yielding one text chunk per
+    `batch_size` rows so the output can be written or sent incrementally.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    if fmt == "csv":
+        writer.writerow(EXPORT_COLUMNS)
+
+    pending = 0
+    for row in rows:
+        if fmt == "csv":
+            writer.writerow(row)
+        else:
+            buffer.write(json.dumps(dict(zip(EXPORT_COLUMNS, map(_json_value, row)))) + "\n")
+        pending += 1
+        if pending >= batch_size:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    if buffer.tell():
+        yield buffer.getvalue()
+
+def stream_sales(fmt: str = "csv", store_id: str = None, year: int = None, itersize: int = EXPORT_ITERSIZE):
+    """Text chunks of the sales export, e.g. for a chunked HTTP response"""
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    return format_rows(iter_sales(store_id, year, itersize), fmt, itersize)
+
+
+#--------------------------------WRITING------------------------------
+def export_sales(output, fmt: str = "csv", store_id: str = None, year: int = None,
+                 itersize: int = EXPORT_ITERSIZE) -> int:
+    """
+    Write the sales export to `output` (a path or a text file object) chunk by
+    chunk. Returns the number of rows written.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    counter = {"rows": 0}
+
+    def counted(rows):
+        for row in rows:
+            counter["rows"] += 1
+            yield row
+
+    chunks = format_rows(counted(iter_sales(store_id, year, itersize)), fmt, itersize)
+    if hasattr(output, "write"):
+        for chunk in chunks:
+            output.write(chunk)
+    else:
+        with open(output, "w", encoding="utf-8", newline="") as f:
+            for chunk in chunks:
+                f.write(chunk)
+    logger.log_info(f"Exported {counter['rows']} sales rows as {fmt}")
+    return counter["rows"]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stream sales from PostgreSQL to CSV or NDJSON")
+    parser.add_argument("--format", choices=sorted(EXPORT_FORMATS), default="csv")
+    parser.add_argument("--store", help="Only this store_id")
+    parser.add_argument("--year", type=int, help="Only this sale year")
+    parser.add_argument("--itersize", type=int, default=EXPORT_ITERSIZE, help="Rows per cursor round trip")
+    parser.add_argument("--output", default="-", help="Output file ('-' for stdout)")
+    args = parser.parse_args()
+
+    export_sales(sys.stdout if args.output == "-" else args.output,
+                 args.format, args.store, args.year, args.itersize)
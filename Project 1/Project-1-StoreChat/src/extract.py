@@ -1,9 +1,20 @@
 import pandas as pd
 try:
-    from src import logger
+    from src import logger, readers
 except ImportError:
     import logger
+    import readers
 
+# Columns aggregate_store_sales needs from an already processed sales file
+SUMMARY_INPUT_COLUMNS = ['sale_id', 'store_id', 'quantity', 'sale_year', 'sale_month']
+
+@logger.span("extract.read_csv")
+def read_csv(path, dataset, columns=None):
+    """Typed read of `path` as one of the readers.DATASETS"""
+    logger.annotate(file=str(path))
+    return readers.read_dataset(dataset, path, columns)
+
+@logger.span("extract.clean_column_names")
 def clean_column_names(df):
     df.columns = (
         df.columns
@@ -16,6 +27,7 @@ def clean_column_names(df):
     return df
 
 #--------------------------------EXTRACT PRODUCTS.CSV------------------------------
+@logger.span("extract.convert_data_types")
 def convert_data_types(df):
     df['price'] = df['price'].astype(float)
     df['launch_date'] = pd.to_datetime(df['launch_date'])
@@ -35,6 +47,7 @@ def validate_data(df):
     }
     return validation_results
 
+@logger.span("extract.add_category_images")
 def add_category_images(df):
     category_mapping = {
         "CAT-1": "../dataset/images/Accessories.jpg",
@@ -52,8 +65,9 @@ def add_category_images(df):
     logger.log_info("EXRACT: Category images added")
     return df
 
+@logger.span("extract.process_products")
 def process_products(input_file, output_file):
-    df = pd.read_csv(input_file)
+    df = read_csv(input_file, "products")
     df = clean_column_names(df)
     df = convert_data_types(df)
     validation_results = validate_data(df)
@@ -63,6 +77,7 @@ def process_products(input_file, output_file):
     return df, validation_results
 
 #--------------------------------EXTRACT SALES.CSV------------------------------
+@logger.span("extract.convert_sales_data_types")
 def convert_sales_data_types(df):
     df['sale_id'] = df['sale_id'].astype(str)
     df['sale_date'] = pd.to_datetime(df['sale_date'], format='%d-%m-%Y', errors='coerce')
@@ -72,6 +87,7 @@ def convert_sales_data_types(df):
     logger.log_info("EXTRACT: Sales data types converted")
     return df
 
+@logger.span("extract.add_time_dimensions")
 def add_time_dimensions(df):
     df['sale_year'] = df['sale_date'].dt.year
     df['sale_month'] = df['sale_date'].dt.month
@@ -94,6 +110,7 @@ def validate_sales_data(df):
     }
     return validation_results
 
+@logger.span("extract.deduplicate_sales")
 def deduplicate_sales(df):
     duplicates = df.duplicated(subset=['sale_id'], keep=False)
     duplicate_count = duplicates.sum()
@@ -102,8 +119,9 @@ def deduplicate_sales(df):
         logger.log_warning(f"EXTRACT: Removed {duplicate_count} duplicate sale_ids")
     return df_clean
 
+@logger.span("extract.process_sales")
 def process_sales(input_file, output_file):
-    df = pd.read_csv(input_file)
+    df = read_csv(input_file, "sales")
     df = clean_column_names(df)
     df = convert_sales_data_types(df)
     df = add_time_dimensions(df)
@@ -121,6 +139,7 @@ def process_sales(input_file, output_file):
     return df, validation_results
 
 #--------------------------------EXTRACT STORE SALES SUMMARY------------------------------
+@logger.span("extract.aggregate_store_sales")
 def aggregate_store_sales(sales_df):
     """Aggregate sales data by store, year, and month for graphing"""
     summary_df = sales_df.groupby(['store_id', 'sale_year', 'sale_month']).agg(
@@ -145,9 +164,14 @@ def validate_store_sales_summary(df):
     }
     return validation_results
 
+@logger.span("extract.process_store_sales_summary")
 def process_store_sales_summary(sales_input_file, output_file):
     """Process sales data into store sales summary for graphing"""
-    df = pd.read_csv(sales_input_file)
+    header = {readers.normalise(c) for c in readers.read_header(sales_input_file)}
+    if 'sale_year' in header:
+        df = read_csv(sales_input_file, "sales_processed", SUMMARY_INPUT_COLUMNS)
+    else:
+        df = read_csv(sales_input_file, "sales")
     df = clean_column_names(df)
     
     if 'sale_year' not in df.columns:
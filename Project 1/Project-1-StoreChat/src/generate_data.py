@@ -0,0 +1,194 @@
+"""
+Synthetic StoreChat dataset generator.
+
+Writes products.csv, category.csv, stores.csv and sales.csv with the same
+headers and value formats as the real dataset, at any scale, with a
+controllable share of dirty rows so the extract and validation stages have
+something to reject.
+
+Usage (from src/):
+    python generate_data.py --sales 1000000 --output ../dataset_1m --dirty-rate 0.01
+"""
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+CATEGORY_NAMES = [
+    "Accessories", "Audio", "Desktop", "Laptop", "Smart Speaker",
+    "Smartphone", "Streaming Device", "Subscription Service", "Tablet", "Wearable",
+]
+COUNTRIES = {
+    "United States": ["New York", "San Francisco", "Chicago", "Los Angeles"],
+    "United Kingdom": ["London", "Manchester"],
+    "Japan": ["Tokyo", "Osaka"],
+    "Germany": ["Berlin", "Munich"],
+    "Australia": ["Sydney", "Melbourne"],
+}
+SALE_START = pd.Timestamp("2019-01-01")
+SALE_END = pd.Timestamp("2024-12-31")
+
+
+#--------------------------------DIRTY ROW HELPERS------------------------------
+def _dirty_mask(rng, n, rate):
+    """Boolean mask selecting roughly `rate` of `n` rows"""
+    if rate <= 0:
+        return np.zeros(n, dtype=bool)
+    return rng.random(n) < rate
+
+
+def _blank_random_field(df, mask, columns, rng):
+    """Blank one randomly chosen column on every masked row"""
+    rows = np.flatnonzero(mask)
+    if len(rows) == 0:
+        return df
+    picks = rng.integers(0, len(columns), size=len(rows))
+    for col_idx, column in enumerate(columns):
+        target = rows[picks == col_idx]
+        if len(target):
+            df[column] = df[column].astype(object)
+            df.loc[df.index[target], column] = ""
+    return df
+
+
+#--------------------------------DIMENSION TABLES------------------------------
+def generate_categories(dirty_rate=0.0, seed=42):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "category_id": [f"CAT-{i + 1}" for i in range(len(CATEGORY_NAMES))],
+        "category_name": CATEGORY_NAMES,
+    })
+    return _blank_random_field(df, _dirty_mask(rng, len(df), dirty_rate), ["category_name"], rng)
+
+
+def generate_products(n_products=89, dirty_rate=0.0, seed=42):
+    rng = np.random.default_rng(seed + 1)
+    launch_offsets = rng.integers(0, (SALE_END - pd.Timestamp("2015-01-01")).days, size=n_products)
+    df = pd.DataFrame({
+        "Product_ID": [f"P-{i + 1}" for i in range(n_products)],
+        "Product_Name": [f"Product {i + 1}" for i in range(n_products)],
+        "Category_ID": [f"CAT-{c}" for c in rng.integers(1, len(CATEGORY_NAMES) + 1, size=n_products)],
+        "Launch_Date": (pd.Timestamp("2015-01-01") + pd.to_timedelta(launch_offsets, unit="D")).strftime("%Y-%m-%d"),
+        "Price": rng.integers(49, 2500, size=n_products).astype(float),
+    })
+    mask = _dirty_mask(rng, n_products, dirty_rate)
+    # Split dirty products between missing values and negative prices
+    negative = mask & (rng.random(n_products) < 0.5)
+    df.loc[negative, "Price"] = -df.loc[negative, "Price"]
+    return _blank_random_field(df, mask & ~negative, ["Product_Name", "Category_ID", "Launch_Date"], rng)
+
+
+def generate_stores(n_stores=75, dirty_rate=0.0, seed=42):
+    rng = np.random.default_rng(seed + 2)
+    countries = list(COUNTRIES)
+    country_picks = rng.integers(0, len(countries), size=n_stores)
+    cities = [
+        COUNTRIES[countries[c]][rng.integers(0, len(COUNTRIES[countries[c]]))]
+        for c in country_picks
+    ]
+    df = pd.DataFrame({
+        "Store_ID": [f"ST-{i + 1}" for i in range(n_stores)],
+        "Store_Name": [f"Apple {city} {i + 1}" for i, city in enumerate(cities)],
+        "City": cities,
+        "Country": [countries[c] for c in country_picks],
+    })
+    return _blank_random_field(df, _dirty_mask(rng, n_stores, dirty_rate), ["Store_Name", "City", "Country"], rng)
+
+
+#--------------------------------SALES FACT TABLE------------------------------
+def _sale_ids(start, stop):
+    """Kaggle-style ids (two letters + number), unique across the whole file"""
+    numbers = np.arange(start, stop)
+    letters = np.array([chr(ord("A") + i) for i in range(26)])
+    first = np.char.add(letters[(numbers // 26) % 26], letters[numbers % 26])
+    return np.char.add(np.char.add(first, "-"), numbers.astype(str))
+
+
+def _format_dates(days):
+    """Format day offsets from SALE_START as dd-mm-YYYY strings"""
+    dates = SALE_START + pd.to_timedelta(days, unit="D")
+    day = pd.Series(dates.day.astype(str)).str.zfill(2)
+    month = pd.Series(dates.month.astype(str)).str.zfill(2)
+    return (day + "-" + month + "-" + pd.Series(dates.year.astype(str))).to_numpy()
+
+
+def generate_sales_chunk(start, stop, n_sales, n_stores, n_products, dirty_rate, rng):
+    """Generate sales rows [start, stop) of an `n_sales` file as a DataFrame"""
+    n = stop - start
+    span_days = (SALE_END - SALE_START).days + 1
+    # Each chunk covers its share of the date range, so the file is append-ordered by date
+    low = span_days * start // max(n_sales, 1)
+    high = max(span_days * stop // max(n_sales, 1), low + 1)
+    days = np.sort(rng.integers(low, high, size=n))
+    df = pd.DataFrame({
+        "sale_id": _sale_ids(start, stop),
+        "sale_date": _format_dates(days),
+        "store_id": np.char.add("ST-", rng.integers(1, n_stores + 1, size=n).astype(str)),
+        "product_id": np.char.add("P-", rng.integers(1, n_products + 1, size=n).astype(str)),
+        "quantity": rng.integers(1, 11, size=n).astype(object),
+    })
+
+    mask = _dirty_mask(rng, n, dirty_rate)
+    kinds = rng.integers(0, 4, size=n)
+    # 0: missing field, 1: bad date, 2: non-positive quantity, 3: duplicate sale_id
+    df = _blank_random_field(df, mask & (kinds == 0), ["sale_date", "store_id", "product_id", "quantity"], rng)
+    bad_date = mask & (kinds == 1)
+    df.loc[bad_date, "sale_date"] = "31-02-2023"
+    bad_quantity = mask & (kinds == 2)
+    df.loc[bad_quantity, "quantity"] = rng.integers(-3, 1, size=int(bad_quantity.sum()))
+    duplicate = mask & (kinds == 3)
+    if duplicate.any():
+        duplicate[0] = False
+        rows = np.flatnonzero(duplicate)
+        df.loc[df.index[rows], "sale_id"] = df["sale_id"].to_numpy()[rng.integers(0, rows)]
+    return df
+
+
+def generate_sales(output_file, n_sales, n_stores=75, n_products=89, dirty_rate=0.0,
+                   seed=42, chunk_size=1_000_000):
+    """Stream `n_sales` rows to `output_file` in chunks so memory stays bounded"""
+    rng = np.random.default_rng(seed + 3)
+    if os.path.exists(output_file):
+        os.remove(output_file)
+    for start in range(0, max(n_sales, 1), chunk_size):
+        stop = min(start + chunk_size, n_sales)
+        chunk = generate_sales_chunk(start, stop, n_sales, n_stores, n_products, dirty_rate, rng)
+        chunk.to_csv(output_file, mode="a", header=(start == 0), index=False)
+    return output_file
+
+
+def generate_dataset(output_dir, n_sales=10_000, n_stores=75, n_products=89,
+                     dirty_rate=0.01, seed=42, chunk_size=1_000_000):
+    """Write a full synthetic dataset into `output_dir` and return the file paths"""
+    os.makedirs(output_dir, exist_ok=True)
+    paths = {
+        "category": os.path.join(output_dir, "category.csv"),
+        "products": os.path.join(output_dir, "products.csv"),
+        "stores": os.path.join(output_dir, "stores.csv"),
+        "sales": os.path.join(output_dir, "sales.csv"),
+    }
+    generate_categories(dirty_rate, seed).to_csv(paths["category"], index=False)
+    generate_products(n_products, dirty_rate, seed).to_csv(paths["products"], index=False)
+    generate_stores(n_stores, dirty_rate, seed).to_csv(paths["stores"], index=False)
+    generate_sales(paths["sales"], n_sales, n_stores, n_products, dirty_rate, seed, chunk_size)
+    return paths
+
+
+if __name__ == "__main__": # pragma: no cover
+    parser = argparse.ArgumentParser(description="Generate a synthetic StoreChat dataset")
+    parser.add_argument("--output", default="../dataset_synthetic", help="Output directory")
+    parser.add_argument("--sales", type=int, default=10_000, help="Number of sales rows (10k to 50M)")
+    parser.add_argument("--stores", type=int, default=75)
+    parser.add_argument("--products", type=int, default=89)
+    parser.add_argument("--dirty-rate", type=float, default=0.01, help="Share of rows made invalid")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--chunk-size", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    written = generate_dataset(
+        args.output, args.sales, args.stores, args.products,
+        args.dirty_rate, args.seed, args.chunk_size,
+    )
+    for name, path in written.items():
+        print(f"{name}: {path}")
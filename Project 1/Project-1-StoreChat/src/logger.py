@@ -1,23 +1,309 @@
+import atexit
 import logging
+import logging.handlers
 import os
+import re
+import json
+import time
+import queue
+import itertools
+import functools
+import threading
+import contextvars
+from collections import Counter
+from contextlib import contextmanager
 
 log_file = os.getenv("LOG_FILE", "logs/app.log")
-os.makedirs(os.path.dirname(log_file), exist_ok=True)
-
-logging.basicConfig(level=logging.INFO, 
-                    format='%(asctime)s - %(levelname)s - %(message)s',
-                    handlers=[
-                        logging.FileHandler(log_file), 
-                        logging.StreamHandler()
-                    ]
+# Finished spans, one JSON object per line (see span_timeline.py)
+span_file = os.getenv("LOG_SPANS_FILE", os.path.join(os.path.dirname(log_file), "spans.jsonl"))
+
+# Records waiting for the background writer; beyond this they are dropped and counted
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+QUEUE_HANDLER_NAME = "storechat-queue"
+# Inside a rate_limited stage: repeated warnings/errors pass for the first N, then every Kth
+LOG_RATE_FIRST_N = int(os.getenv("LOG_RATE_FIRST_N", "10"))
+LOG_RATE_EVERY_K = int(os.getenv("LOG_RATE_EVERY_K", "1000"))
+
+
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that never blocks the caller: when the queue is full the
+    record is dropped and counted. The next record that fits is preceded by
+    a warning with the number dropped since the last report.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+        self._reported = 0
+        self._drop_lock = threading.Lock()
+
+    def enqueue(self, record):
+        try:
+            with self._drop_lock:
+                unreported = self.dropped - self._reported
+                if unreported:
+                    self.queue.put_nowait(self._dropped_record(unreported))
+                    self._reported = self.dropped
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._drop_lock:
+                self.dropped += 1
+
+    @staticmethod
+    def _dropped_record(count: int) -> logging.LogRecord:
+        return logging.LogRecord(
+            "logger", logging.WARNING, __file__, 0,
+            f"Log queue full: dropped {count} log records", None, None
         )
+
+    def flush(self):
+        """Block until the listener has written every queued record"""
+        self.queue.join()
+
+
+# The RateLimitFilter of the rate_limited stage running in the current thread/context
+_current_rate_filter = contextvars.ContextVar("storechat_rate_filter", default=None)
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Samples repeated records: per message template the first `first_n` pass,
+    then every `every_k`th. Records below `min_level` always pass. The
+    template is the format string when the record has args, otherwise the
+    message with digit runs replaced, so f-strings that differ only in ids
+    and counts are grouped together. A `scoped` filter (see rate_limited)
+    only samples records logged from within its own stage.
+    """
+
+    def __init__(self, first_n: int = LOG_RATE_FIRST_N, every_k: int = LOG_RATE_EVERY_K,
+                 min_level: int = logging.WARNING, scoped: bool = False):
+        super().__init__()
+        self.first_n = first_n
+        self.every_k = every_k
+        self.min_level = min_level
+        self.scoped = scoped
+        self.seen = Counter()        # (levelno, template) -> records seen
+        self.suppressed = Counter()  # (levelno, template) -> records dropped
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def template(record: logging.LogRecord) -> str:
+        if record.args:
+            return str(record.msg)
+        return re.sub(r"\d+", "#", record.getMessage())
+
+    def filter(self, record):
+        if record.levelno < self.min_level:
+            return True
+        if self.scoped and _current_rate_filter.get() is not self:
+            return True  # another stage's record, or one logged outside any stage
+        key = (record.levelno, self.template(record))
+        with self._lock:
+            self.seen[key] += 1
+            count = self.seen[key]
+            if count <= self.first_n or (self.every_k and (count - self.first_n) % self.every_k == 0):
+                return True
+            self.suppressed[key] += 1
+            return False
+
+
+class SpanFormatter(logging.Formatter):
+    """Formats a span record as its JSON object"""
+
+    def format(self, record):
+        return json.dumps(record.span, default=lambda v: v.item() if hasattr(v, "item") else str(v))
+
+
+def build_queue_logging(handlers, maxsize: int = LOG_QUEUE_SIZE):
+    """
+    A BoundedQueueHandler feeding `handlers` through a QueueListener thread,
+    so callers only pay for an enqueue. The listener is not started.
+    """
+    log_queue = queue.Queue(maxsize=maxsize)
+    queue_handler = BoundedQueueHandler(log_queue)
+    queue_handler.listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    return queue_handler
+
+def shutdown(queue_handler: BoundedQueueHandler = None):
+    """Write out everything still queued and stop the background writer (runs at exit)"""
+    queue_handler = queue_handler or _queue_handler
+    if queue_handler is None:
+        return
+    listener = queue_handler.listener
+    if listener._thread is not None:
+        listener.stop()  # drains the queue before returning
+    unreported = queue_handler.dropped - queue_handler._reported
+    for handler in listener.handlers:
+        try:
+            if unreported:
+                handler.handle(queue_handler._dropped_record(unreported))
+            handler.flush()
+        except (OSError, ValueError):
+            pass  # stream already closed at interpreter exit, as logging.shutdown allows
+    queue_handler._reported = queue_handler.dropped
+
+
+_queue_handler = None
+_configure_lock = threading.Lock()
+
+def configure():
+    """
+    Set up the log file, console and span handlers behind one queue and
+    writer thread per process (even if this module is imported under two
+    names). Runs on first use rather than at import, so importing StoreChat
+    modules creates no directories, files or threads.
+    """
+    global _queue_handler
+    if _queue_handler is not None:
+        return _queue_handler
+    with _configure_lock:
+        root = logging.getLogger()
+        existing = next((h for h in root.handlers if h.get_name() == QUEUE_HANDLER_NAME), None)
+        if existing is None:
+            os.makedirs(os.path.dirname(log_file) or ".", exist_ok=True)
+            formatter = logging.Formatter(LOG_FORMAT)
+            file_handler = logging.FileHandler(log_file)
+            stream_handler = logging.StreamHandler()
+            for handler in (file_handler, stream_handler):
+                handler.setFormatter(formatter)
+            span_handler = logging.FileHandler(span_file, delay=True)
+            span_handler.addFilter(lambda record: hasattr(record, "span"))
+            span_handler.setFormatter(SpanFormatter())
+            existing = build_queue_logging([file_handler, stream_handler, span_handler])
+            existing.set_name(QUEUE_HANDLER_NAME)
+            root.addHandler(existing)
+            root.setLevel(logging.INFO)
+            existing.listener.start()
+            atexit.register(shutdown, existing)
+        _queue_handler = existing
+    return _queue_handler
+
 logger = logging.getLogger(__name__)
 
-def log_info(message):
-    logger.info(message)
+def log_info(message, *args):
+    configure()
+    logger.info(message, *args)
+
+def log_error(message, *args):
+    configure()
+    logger.error(message, *args)
+
+def log_warning(message, *args):
+    configure()
+    logger.warning(message, *args)
+
+@contextmanager
+def rate_limited(stage: str, first_n: int = LOG_RATE_FIRST_N, every_k: int = LOG_RATE_EVERY_K):
+    """
+    Sample repeated warnings and errors logged through this module while the
+    block (or decorated function) runs, then log one line per template saying
+    how many similar records were suppressed. Only records logged from the
+    block's own context count, so stages running at once in other threads
+    (run_pipeline) keep separate samples; a nested stage samples its own.
+    """
+    configure()
+    rate_filter = RateLimitFilter(first_n, every_k, scoped=True)
+    token = _current_rate_filter.set(rate_filter)
+    logger.addFilter(rate_filter)
+    try:
+        yield rate_filter
+    finally:
+        logger.removeFilter(rate_filter)
+        _current_rate_filter.reset(token)
+        for (level, template), count in rate_filter.suppressed.items():
+            noun = logging.getLevelName(level).lower()
+            logger.log(level, "%s: suppressed %s similar %ss like: %s", stage, f"{count:,}", noun, template)
+
+def flush():
+    if _queue_handler is not None:
+        _queue_handler.flush()
+
+def dropped_count() -> int:
+    return _queue_handler.dropped if _queue_handler is not None else 0
+
+
+#--------------------------------SPANS--------------------------------
+_current_span = contextvars.ContextVar("storechat_span", default=None)
+_span_ids = itertools.count(1)
+
+
+class Span:
+    """
+    A timed, named stage. Used as a context manager it yields itself, so
+    fields (rows, file names...) can be attached with `set`; used as a
+    decorator each call gets its own span and, unless `rows` was set, the
+    row count of a returned DataFrame (or the first item of a returned
+    tuple). Spans opened inside another span record it as their parent.
+
+    On exit one INFO record is logged: a short line in app.log and the
+    full span as JSON in spans.jsonl.
+    """
+
+    def __init__(self, name: str, **fields):
+        self.name = name
+        self.fields = fields
+        self.rows = None
+        self.id = None
+        self.parent = None
+
+    def set(self, rows: int = None, **fields):
+        if rows is not None:
+            self.rows = int(rows)
+        self.fields.update(fields)
+        return self
+
+    def __enter__(self):
+        parent = _current_span.get()
+        self.id = f"{os.getpid()}-{next(_span_ids)}"
+        self.parent = parent.id if parent is not None else None
+        self._token = _current_span.set(self)
+        self._start = time.time()
+        self._perf_start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        duration = time.perf_counter() - self._perf_start
+        _current_span.reset(self._token)
+        record = {
+            "span": self.name,
+            "id": self.id,
+            "parent": self.parent,
+            "start": self._start,
+            "end": self._start + duration,
+            "duration_s": round(duration, 6),
+            "rows": self.rows,
+            "status": "error" if exc_type else "ok",
+            "pid": os.getpid(),
+            "thread": threading.current_thread().name,
+            "fields": self.fields,
+        }
+        if exc_type:
+            record["error"] = f"{exc_type.__name__}: {exc}"
+        rows = f" ({self.rows} rows)" if self.rows is not None else ""
+        configure()
+        logger.info("SPAN %s %.3fs%s", self.name, duration, rows, extra={"span": record})
+        return False
+
+    def __call__(self, func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with Span(self.name, **self.fields) as current:
+                result = func(*args, **kwargs)
+                if current.rows is None:
+                    first = result[0] if isinstance(result, tuple) and result else result
+                    if hasattr(first, "shape"):
+                        current.rows = len(first)
+                return result
+        return wrapper
+
 
-def log_error(message):
-    logger.error(message)
+def span(name: str, **fields) -> Span:
+    return Span(name, **fields)
 
-def log_warning(message):
-    logger.warning(message)
\ No newline at end of file
+def annotate(rows: int = None, **fields):
+    """Attach rows/fields to the innermost open span, if any"""
+    current = _current_span.get()
+    if current is not None:
+        current.set(rows, **fields)
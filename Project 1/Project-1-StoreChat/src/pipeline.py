@@ -0,0 +1,253 @@
+"""
+StoreChat pipeline runner: extract and load as a DAG of stages.
+
+    python pipeline.py --jobs 4            # run what changed, 4 stages at a time
+    python pipeline.py --force load_sales  # rerun one stage (and whatever it feeds)
+    python pipeline.py --force             # rerun everything
+
+Stages whose dependencies are done run concurrently (product and sales
+extracts, the categories and stores loads...). Each stage is keyed by a hash
+of its input files, the source of the module that implements it and the keys
+of the stages it depends on; when the key matches the last successful run and
+its outputs exist, the stage is skipped, make-style. Keys are kept in
+`<dataset>/.cache/pipeline-state.json`.
+"""
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+import threading
+from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+try:
+    from src import logger
+except ImportError:
+    import logger
+
+DATASET_DIR = os.getenv("DATASET_DIR", "../dataset")
+PIPELINE_JOBS = int(os.getenv("PIPELINE_JOBS", str(min(4, os.cpu_count() or 1))))
+
+
+@dataclass
+class Stage:
+    """
+    One step of the pipeline. `func` is called with no arguments; `inputs`
+    and `outputs` are file paths and `code` the modules whose source is part
+    of the stage's key. Stages without outputs (database loads) are skipped
+    on a matching key alone.
+    """
+    name: str
+    func: callable
+    inputs: tuple = ()
+    outputs: tuple = ()
+    deps: tuple = ()
+    code: tuple = ()
+
+
+#--------------------------------STAGES--------------------------------
+def _import(module):
+    try:
+        return __import__(f"src.{module}", fromlist=[module])
+    except ImportError:
+        return __import__(module)
+
+def storechat_stages(dataset_dir: str = DATASET_DIR) -> list:
+    """The extract -> init_db -> load stages, reading and writing under `dataset_dir`"""
+    extract, repo, validate = _import("extract"), _import("repo"), _import("validateService")
+    repo.DATASET_DIR = dataset_dir
+    path = lambda name: os.path.join(dataset_dir, name)
+    loader = (repo, validate)
+
+    return [
+        Stage("extract_products", lambda: extract.process_products(path("products.csv"), path("products_with_images.csv")),
+              inputs=(path("products.csv"),), outputs=(path("products_with_images.csv"),), code=(extract,)),
+        Stage("extract_sales", lambda: extract.process_sales(path("sales.csv"), path("sales_processed.csv")),
+              inputs=(path("sales.csv"),), outputs=(path("sales_processed.csv"),), code=(extract,)),
+        Stage("extract_summary", lambda: extract.process_store_sales_summary(path("sales_processed.csv"), path("store_sales_summary.csv")),
+              inputs=(path("sales_processed.csv"),), outputs=(path("store_sales_summary.csv"),),
+              deps=("extract_sales",), code=(extract,)),
+        Stage("init_db", repo.init_db, inputs=repo.schema_files(), code=(repo,)),
+        Stage("load_categories", repo.load_categories, inputs=(path("category.csv"),),
+              deps=("init_db",), code=loader),
+        Stage("load_products", repo.load_products, inputs=(path("products_with_images.csv"),),
+              deps=("load_categories", "extract_products"), code=loader),
+        Stage("load_stores", repo.load_stores, inputs=(path("stores.csv"),),
+              deps=("init_db",), code=loader),
+        Stage("load_sales", repo.load_sales, inputs=(path("sales_processed.csv"),),
+              deps=("load_stores", "load_products", "extract_sales"), code=loader),
+        Stage("load_summary", repo.load_store_sales_summary, inputs=(path("store_sales_summary.csv"),),
+              deps=("load_stores", "extract_summary"), code=loader),
+    ]
+
+
+#--------------------------------CACHE KEYS--------------------------------
+class StageCache:
+    """
+    Stage keys from the last successful runs, persisted as JSON. File digests
+    are memoised by (mtime, size) so unchanged inputs are not re-read.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        try:
+            with open(path, encoding="utf-8") as f:
+                state = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            state = {}
+        self.stages = state.get("stages", {})
+        self.files = state.get("files", {})
+
+    def file_digest(self, path) -> str:
+        stat = os.stat(path)
+        signature = [stat.st_mtime_ns, stat.st_size]
+        with self._lock:
+            cached = self.files.get(path)
+        if cached and cached[:2] == signature:
+            return cached[2]
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        with self._lock:
+            self.files[path] = signature + [digest.hexdigest()]
+        return digest.hexdigest()
+
+    def stage_key(self, stage: Stage, dep_keys: dict) -> str:
+        """Hash of the stage's inputs, code and upstream keys"""
+        key = hashlib.sha256(stage.name.encode())
+        for path in stage.inputs:
+            key.update(path.encode())
+            key.update(self.file_digest(path).encode() if os.path.exists(path) else b"missing")
+        for module in stage.code or (sys.modules.get(stage.func.__module__),):
+            source = getattr(module, "__file__", None)
+            key.update(self.file_digest(source).encode() if source else stage.func.__qualname__.encode())
+        for dep in stage.deps:
+            key.update(dep_keys.get(dep, "").encode())
+        return key.hexdigest()
+
+    def is_fresh(self, stage: Stage, key: str) -> bool:
+        with self._lock:
+            recorded = self.stages.get(stage.name)
+        return recorded == key and all(os.path.exists(p) for p in stage.outputs)
+
+    def record(self, stage: Stage, key: str):
+        with self._lock:
+            self.stages[stage.name] = key
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp = f"{self.path}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"stages": self.stages, "files": self.files}, f, indent=1)
+            os.replace(tmp, self.path)
+
+
+#--------------------------------RUNNER--------------------------------
+def check_dag(stages: list):
+    """Raise ValueError on unknown dependencies or cycles"""
+    by_name = {stage.name: stage for stage in stages}
+    for stage in stages:
+        for dep in stage.deps:
+            if dep not in by_name:
+                raise ValueError(f"Stage {stage.name} depends on unknown stage {dep}")
+    visiting, done = set(), set()
+
+    def visit(name):
+        if name in done:
+            return
+        if name in visiting:
+            raise ValueError(f"Dependency cycle through stage {name}")
+        visiting.add(name)
+        for dep in by_name[name].deps:
+            visit(dep)
+        visiting.discard(name)
+        done.add(name)
+
+    for stage in stages:
+        visit(stage.name)
+
+def run_pipeline(stages: list, cache: StageCache, jobs: int = PIPELINE_JOBS, force=()) -> dict:
+    """
+    Run `stages` with up to `jobs` at a time. `force` is True for every stage
+    or a collection of stage names. A stage runs when forced, when its key
+    changed or its outputs are missing, or when a dependency ran; a failed
+    stage's dependents are skipped. Returns {stage name: {"status",
+    "seconds", "error"}} with status "ran", "cached", "failed" or "skipped".
+    """
+    check_dag(stages)
+    by_name = {stage.name: stage for stage in stages}
+    pending = dict(by_name)
+    keys, results = {}, {}
+    forced = set(by_name) if force is True else set(force or ())
+
+    def execute(stage: Stage, key: str, must_run: bool):
+        start = time.perf_counter()
+        if not must_run and cache.is_fresh(stage, key):
+            return "cached", time.perf_counter() - start
+        with logger.span(f"pipeline.{stage.name}"):
+            stage.func()
+        cache.record(stage, key)
+        return "ran", time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+        running = {}
+        while pending or running:
+            for name, stage in list(pending.items()):
+                dep_results = [results.get(dep) for dep in stage.deps]
+                if any(r is not None and r["status"] in ("failed", "skipped") for r in dep_results):
+                    results[name] = {"status": "skipped", "seconds": 0.0, "error": None}
+                    del pending[name]
+                elif all(r is not None for r in dep_results):
+                    keys[name] = cache.stage_key(stage, keys)
+                    must_run = name in forced or any(r["status"] == "ran" for r in dep_results)
+                    running[executor.submit(execute, stage, keys[name], must_run)] = name
+                    del pending[name]
+            if not running:
+                continue
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name = running.pop(future)
+                try:
+                    status, seconds = future.result()
+                    results[name] = {"status": status, "seconds": seconds, "error": None}
+                except Exception as e:
+                    logger.log_error("Pipeline stage %s failed: %s", name, e)
+                    results[name] = {"status": "failed", "seconds": 0.0, "error": f"{type(e).__name__}: {e}"}
+    return {stage.name: results[stage.name] for stage in stages}
+
+def format_summary(results: dict, wall_seconds: float) -> str:
+    """Per-stage status and time, then the wall clock against the serial total"""
+    width = max(len(name) for name in results)
+    lines = [f"{'stage'.ljust(width)}  {'status':8} {'seconds':>9}"]
+    for name, result in results.items():
+        error = f"  {result['error']}" if result["error"] else ""
+        lines.append(f"{name.ljust(width)}  {result['status']:8} {result['seconds']:9.2f}{error}")
+    serial = sum(r["seconds"] for r in results.values())
+    counts = {status: sum(r["status"] == status for r in results.values()) for status in ("ran", "cached", "failed", "skipped")}
+    lines.append(f"Wall {wall_seconds:.2f}s for {serial:.2f}s of stage time; "
+                 + ", ".join(f"{count} {status}" for status, count in counts.items() if count))
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the StoreChat extract and load stages")
+    parser.add_argument("--dataset", default=DATASET_DIR)
+    parser.add_argument("--jobs", type=int, default=PIPELINE_JOBS, help="Stages to run at once")
+    parser.add_argument("--force", nargs="*", metavar="STAGE",
+                        help="Rerun these stages (all stages if none are named), ignoring the cache")
+    parser.add_argument("--state", help="Cache file (default: <dataset>/.cache/pipeline-state.json)")
+    args = parser.parse_args()
+
+    stages = storechat_stages(args.dataset)
+    force = () if args.force is None else (args.force or True)
+    unknown = set(force) - {stage.name for stage in stages} if force is not True else set()
+    if unknown:
+        parser.error(f"Unknown stage(s): {', '.join(sorted(unknown))}")
+
+    cache = StageCache(args.state or os.path.join(args.dataset, ".cache", "pipeline-state.json"))
+    start = time.perf_counter()
+    results = run_pipeline(stages, cache, args.jobs, force)
+    print(format_summary(results, time.perf_counter() - start))
+    sys.exit(1 if any(r["status"] == "failed" for r in results.values()) else 0)
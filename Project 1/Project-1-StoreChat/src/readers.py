@@ -0,0 +1,142 @@
+"""
+Typed CSV reading for the StoreChat datasets.
+
+Each dataset declares its column types once (DATASETS). `read_dataset` reads
+only the requested columns with those types instead of inferring every
+column, using pyarrow's multithreaded CSV reader when pyarrow is installed
+and pandas' C parser otherwise. Columns are returned under the file's own
+header names; types are matched on the normalised name (stripped, lower
+case, spaces and dashes as underscores) so raw and cleaned files share a
+spec. Missing values come back as NaN, as with a default pd.read_csv.
+
+Raw date columns stay strings for extract.py to parse with
+errors='coerce'. If a value does not fit its declared type (a dirty raw
+file), the file is re-read with only the string columns declared and the
+rest inferred, as before.
+"""
+import os
+import csv
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:  # pragma: no cover - exercised only without pyarrow
+    pa = None
+    pa_csv = None
+
+try:
+    from src import logger
+except ImportError:
+    import logger
+
+DATASET_DIR = os.getenv("DATASET_DIR", "../dataset")
+# "pyarrow" (default when installed) or "c" to force pandas' parser
+CSV_ENGINE = os.getenv("CSV_ENGINE", "pyarrow" if pa_csv is not None else "c")
+# Let pyarrow parse blocks of the file on several threads
+CSV_THREADS = os.getenv("CSV_THREADS", "1") != "0"
+
+STRING, FLOAT, INT, DATE = "string", "float64", "int64", "date"
+
+
+@dataclass(frozen=True)
+class CsvSpec:
+    """A dataset's default file name and column types (by normalised column name)"""
+    file: str
+    dtypes: dict = field(default_factory=dict)
+
+
+DATASETS = {
+    # Raw inputs
+    "category": CsvSpec("category.csv", {"category_id": STRING, "category_name": STRING}),
+    "stores": CsvSpec("stores.csv", {"store_id": STRING, "store_name": STRING, "city": STRING, "country": STRING}),
+    "products": CsvSpec("products.csv", {
+        "product_id": STRING, "product_name": STRING, "category_id": STRING,
+        "launch_date": STRING, "price": FLOAT,
+    }),
+    "sales": CsvSpec("sales.csv", {
+        "sale_id": STRING, "sale_date": STRING, "store_id": STRING, "product_id": STRING, "quantity": INT,
+    }),
+    # Written by extract.py
+    "products_with_images": CsvSpec("products_with_images.csv", {
+        "product_id": STRING, "product_name": STRING, "category_id": STRING,
+        "launch_date": STRING, "price": FLOAT, "image_url": STRING,
+    }),
+    "sales_processed": CsvSpec("sales_processed.csv", {
+        "sale_id": STRING, "sale_date": DATE, "store_id": STRING, "product_id": STRING, "quantity": INT,
+        "sale_year": FLOAT, "sale_month": FLOAT, "sale_quarter": FLOAT,
+        "sale_day_of_week": STRING, "sale_week": INT,
+    }),
+    "store_sales_summary": CsvSpec("store_sales_summary.csv", {
+        "store_id": STRING, "sale_year": FLOAT, "sale_month": FLOAT, "total_quantity": FLOAT,
+        "total_transactions": INT, "avg_quantity_per_transaction": FLOAT,
+    }),
+}
+
+
+def normalise(column: str) -> str:
+    return column.strip().lower().replace(" ", "_").replace("-", "_")
+
+def read_header(path) -> list:
+    """Column names from the first line of a CSV file"""
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        return next(csv.reader(f), [])
+
+def dataset_path(name: str, dataset_dir: str = None) -> str:
+    return os.path.join(dataset_dir or DATASET_DIR, DATASETS[name].file)
+
+
+#--------------------------------ENGINES------------------------------
+_ARROW_TYPES = {STRING: "string", FLOAT: "float64", INT: "int64", DATE: "timestamp[s]"} if pa else {}
+
+def _read_arrow(path, columns: list, types: dict) -> pd.DataFrame:
+    convert = pa_csv.ConvertOptions(
+        include_columns=columns,
+        column_types={c: pa.type_for_alias(_ARROW_TYPES[t]) for c, t in types.items()},
+        strings_can_be_null=True,
+    )
+    table = pa_csv.read_csv(path, read_options=pa_csv.ReadOptions(use_threads=CSV_THREADS), convert_options=convert)
+    df = table.to_pandas()
+    for column, kind in types.items():
+        if kind == STRING and table.column(column).null_count:
+            # pyarrow gives None for missing strings; match pandas' NaN
+            df[column] = df[column].where(df[column].notna(), np.nan)
+    return df
+
+def _read_pandas(path, columns: list, types: dict) -> pd.DataFrame:
+    dtype = {c: (str if t == STRING else "float64") for c, t in types.items() if t in (STRING, FLOAT)}
+    df = pd.read_csv(path, usecols=columns, dtype=dtype)[columns]
+    for column, kind in types.items():
+        if kind == DATE:
+            df[column] = pd.to_datetime(df[column], format="%Y-%m-%d", errors="coerce")
+    return df
+
+
+#--------------------------------READING------------------------------
+def read_dataset(name: str, path=None, columns=None, dataset_dir: str = None, engine: str = None) -> pd.DataFrame:
+    """
+    Read dataset `name` (a key of DATASETS) from `path`, or from its default
+    file under `dataset_dir`. `columns` (normalised names) limits the read to
+    those columns and ignores any the file does not have; by default every
+    column is read. Columns without a declared type are inferred.
+    """
+    spec = DATASETS[name]
+    path = path or dataset_path(name, dataset_dir)
+    header = read_header(path)
+    if columns is not None:
+        wanted = {normalise(c) for c in columns}
+        header = [c for c in header if normalise(c) in wanted]
+    types = {c: spec.dtypes[normalise(c)] for c in header if normalise(c) in spec.dtypes}
+
+    try:
+        if (engine or CSV_ENGINE) == "pyarrow" and pa_csv is not None:
+            return _read_arrow(path, header, types)
+        return _read_pandas(path, header, types)
+    except ValueError as e:  # includes pyarrow's ArrowInvalid
+        logger.log_warning("%s does not match the %s column types, reading untyped: %s", path, name, e)
+        # Dates are still parsed (unparseable ones become NaT, which cleaning rejects)
+        # since loaders call .year on them
+        return _read_pandas(path, header, {c: t for c, t in types.items() if t in (STRING, DATE)})
@@ -1,15 +1,43 @@
+import io
 import os
+import threading
+from datetime import date
+from contextlib import contextmanager
 import psycopg2
-import pandas as pd
+from psycopg2 import sql
 from psycopg2.extras import RealDictCursor
-import validateService
-import logger
+from psycopg2.pool import ThreadedConnectionPool
+try:
+    from src import logger
+except ImportError:
+    import logger
 
 DB_NAME = os.getenv("PGDB", "storechat")
 DB_USER = os.getenv("PGUSER", "")
 DB_PASS = os.getenv("PGPASS", "") 
 DB_HOST = os.getenv("PGHOST", "127.0.0.1")
 DB_PORT = int(os.getenv("PGPORT", "5432"))
+DATASET_DIR = os.getenv("DATASET_DIR", "../dataset")
+POOL_MIN_CONN = int(os.getenv("PGPOOL_MIN", "1"))
+POOL_MAX_CONN = int(os.getenv("PGPOOL_MAX", "10"))
+# Layout of the sales table created by init_db: "wide", "compact" (schema_compact.sql)
+# or "partitioned" (schema_partitioned.sql)
+SALES_LAYOUT = os.getenv("SALES_LAYOUT", "wide")
+# Schema files run by init_db for each layout, in order (relative to src/)
+SCHEMA_FILES = {
+    "wide": ("../schema.sql",),
+    "compact": ("../schema.sql", "../schema_compact.sql"),
+    "partitioned": ("../schema.sql", "../schema_partitioned.sql"),
+}
+# Sales indexes created after the schema files: "btree" or "time_range" (BRIN + covering index)
+SALES_INDEXES = os.getenv("SALES_INDEXES", "btree")
+INDEX_FILES = {
+    "btree": "../indexes_btree.sql",
+    "time_range": "../indexes_time_range.sql",
+}
+
+_pool = None
+_pool_lock = threading.Lock()
 
 
 #--------------------------------CONNECTION FUNCTIONS------------------------------
@@ -18,31 +46,126 @@ def get_conn():
         dbname=DB_NAME, user=DB_USER, password=DB_PASS, host=DB_HOST, port=DB_PORT
     )
 
-def init_db():
-    with get_conn() as conn, conn.cursor() as cur:
+def get_pool():
+    """Process-wide connection pool, created on first use"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ThreadedConnectionPool(
+                    POOL_MIN_CONN, POOL_MAX_CONN,
+                    dbname=DB_NAME, user=DB_USER, password=DB_PASS, host=DB_HOST, port=DB_PORT
+                )
+    return _pool
+
+@contextmanager
+def pooled_conn():
+    """
+    Borrow a connection from the pool; rolled back and returned on exit. A
+    connection that cannot be rolled back (e.g. the server dropped it) is
+    closed as it is returned, so the pool replaces it instead of running dry.
+    """
+    pool = get_pool()
+    conn = pool.getconn()
+    try:
+        yield conn
+    finally:
+        broken = bool(conn.closed)
         try:
-            logger.log_info("Opening schema.sql file")
-            with open("../schema.sql", "r", encoding="utf-8") as f:
-                cur.execute(f.read())
-            logger.log_info("Schema.sql file opened successfully")
+            if not broken:
+                conn.rollback()
+        except psycopg2.Error as e:
+            logger.log_error(f"Discarding pooled connection that failed to roll back: {e}")
+            broken = True
+        finally:
+            pool.putconn(conn, close=broken)
 
-        except FileNotFoundError:
-            logger.log_error("Schema.sql file not found")
-            raise 
+def close_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.closeall()
+            _pool = None
 
-        except Exception as e:
-            logger.log_error(f"Error opening schema.sql file: {e}")
-            raise 
+def schema_files(layout: str = None, indexes: str = None) -> tuple:
+    layout, indexes = layout or SALES_LAYOUT, indexes or SALES_INDEXES
+    if layout not in SCHEMA_FILES:
+        raise ValueError(f"Unknown sales layout: {layout}")
+    if indexes not in INDEX_FILES:
+        raise ValueError(f"Unknown sales indexes: {indexes}")
+    return SCHEMA_FILES[layout] + (INDEX_FILES[indexes],)
+
+def init_db(layout: str = None, indexes: str = None):
+    """
+    Create the tables for `layout` (default SALES_LAYOUT), migrating an
+    existing sales table to it, and the sales indexes for `indexes`
+    (default SALES_INDEXES), dropping those of the other option.
+    """
+    with get_conn() as conn, conn.cursor() as cur:
+        for path in schema_files(layout, indexes):
+            name = os.path.basename(path)
+            try:
+                logger.log_info(f"Opening {name} file")
+                with open(path, "r", encoding="utf-8") as f:
+                    cur.execute(f.read())
+                logger.log_info(f"{name} file opened successfully")
+
+            except FileNotFoundError:
+                logger.log_error(f"{name} file not found")
+                raise 
+
+            except Exception as e:
+                logger.log_error(f"Error opening {name} file: {e}")
+                raise 
 
         conn.commit()
 
+def sales_date_range(year: int = None, months: tuple = None) -> dict:
+    """
+    Query parameters `start` and `end` bounding sale_date to a year, or to
+    contiguous `months` of it; both None when year is None. Filtering on
+    sale_date >= start AND sale_date < end rather than sale_year lets the
+    sale_date indexes (B-tree, BRIN or covering) serve the query.
+    """
+    if year is None:
+        return {"start": None, "end": None}
+    first, last = (min(months), max(months)) if months else (1, 12)
+    end = date(year + 1, 1, 1) if last == 12 else date(year, last + 1, 1)
+    return {"start": date(year, first, 1), "end": end}
+
+def sales_layout(cur) -> str:
+    """The layout the database's sales table is in, whatever SALES_LAYOUT says"""
+    cur.execute("""
+        SELECT to_regclass('sales_compact') IS NOT NULL,
+               (SELECT relkind = 'p' FROM pg_class WHERE oid = to_regclass('sales'))
+    """)
+    compact, partitioned = cur.fetchone()
+    return "compact" if compact else "partitioned" if partitioned else "wide"
+
+def partition_name(year: int, month: int) -> str:
+    """The sales partition holding a month in the partitioned layout"""
+    return f"sales_y{year:04d}m{month:02d}"
+
+def _loader_modules():
+    """pandas, validateService and readers, imported by the loaders so that connection-only callers skip them"""
+    import pandas as pd
+    try:
+        from src import validateService, readers
+    except ImportError:
+        import validateService
+        import readers
+    return pd, validateService, readers
+
 #--------------------------------LOAD STORES CSV FILE------------------------------
+@logger.span("repo.load_stores")
+@logger.rate_limited("load_stores")
 def load_stores():
     """Load stores data from CSV file into the database"""
+    pd, validateService, readers = _loader_modules()
     with get_conn() as conn, conn.cursor() as cur:
         try:
             logger.log_info("Reading stores.csv file")
-            stores_df = pd.read_csv("../dataset/stores.csv")
+            stores_df = readers.read_dataset("stores", dataset_dir=DATASET_DIR)
             stores_df.columns = stores_df.columns.str.strip().str.lower().str.replace(" ", "_")
             logger.log_info(f"stores.csv file read successfully with {len(stores_df)} rows")
         except FileNotFoundError:
@@ -71,14 +194,75 @@ def load_stores():
             )
         
         conn.commit()
+        logger.annotate(rows=len(stores_df), rejected=len(rejected_df))
         print(f"Loaded {len(stores_df)} stores")
 
+SALES_INSERT = sql.SQL("""
+    INSERT INTO {table} (
+        sale_id, sale_date, store_id, product_id, quantity,
+        sale_year, sale_month, sale_quarter, sale_day_of_week, sale_week
+    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+    ON CONFLICT DO NOTHING
+""")
+
+def _sales_values(row) -> tuple:
+    return (
+        row['sale_id'], row['sale_date'], row['store_id'], row['product_id'], int(row['quantity']),
+        int(row['sale_year']), int(row['sale_month']), int(row['sale_quarter']), 
+        row['sale_day_of_week'], int(row['sale_week'])
+    )
+
+def _sales_inserter(cur):
+    """A function inserting one sales_processed row into the sales table, in whichever layout it has"""
+    layout = sales_layout(cur)
+    if layout == "wide":
+        insert_sql = SALES_INSERT.format(table=sql.Identifier("sales"))
+        return lambda row: cur.execute(insert_sql, _sales_values(row))
+
+    if layout == "partitioned":
+        # Create each month's partition on first use and insert into it directly, skipping tuple routing
+        partitions = {}
+
+        def insert(row):
+            month = (row['sale_date'].year, row['sale_date'].month)
+            if month not in partitions:
+                cur.execute("SELECT ensure_sales_partition(%s::date)::text", (row['sale_date'],))
+                partitions[month] = SALES_INSERT.format(table=sql.Identifier(cur.fetchone()[0]))
+            cur.execute(partitions[month], _sales_values(row))
+        return insert
+
+    # Compact: give every store and product a key, then insert the keys; date parts are generated
+    cur.execute("INSERT INTO store_keys (store_id) SELECT store_id FROM stores EXCEPT SELECT store_id FROM store_keys ORDER BY 1")
+    cur.execute("INSERT INTO product_keys (product_id) SELECT product_id FROM products EXCEPT SELECT product_id FROM product_keys ORDER BY 1")
+    cur.execute("SELECT store_id, store_key FROM store_keys")
+    store_keys = dict(cur.fetchall())
+    cur.execute("SELECT product_id, product_key FROM product_keys")
+    product_keys = dict(cur.fetchall())
+
+    def insert(row):
+        if row['store_id'] not in store_keys:
+            raise KeyError(f"unknown store_id {row['store_id']}")
+        if row['product_id'] not in product_keys:
+            raise KeyError(f"unknown product_id {row['product_id']}")
+        cur.execute("""
+            INSERT INTO sales_compact (sale_id, sale_date, store_key, product_key, quantity)
+            VALUES (%s, %s, %s, %s, %s)
+            ON CONFLICT (sale_id) DO NOTHING
+        """, (
+            row['sale_id'], row['sale_date'], store_keys[row['store_id']],
+            product_keys[row['product_id']], int(row['quantity'])
+        ))
+    return insert
+
+@logger.span("repo.load_sales")
+@logger.rate_limited("load_sales")
 def load_sales():
     """Load sales data from CSV file into the database"""
+    pd, validateService, readers = _loader_modules()
     with get_conn() as conn, conn.cursor() as cur:
         try:
             logger.log_info("Reading sales_processed.csv file")
-            sales_df = pd.read_csv("../dataset/sales_processed.csv")
+            sales_df = readers.read_dataset("sales_processed", dataset_dir=DATASET_DIR)
             logger.log_info(f"sales_processed.csv file read successfully with {len(sales_df)} rows")
         except FileNotFoundError:
             logger.log_error("sales_processed.csv file not found")
@@ -102,37 +286,144 @@ def load_sales():
         batch_size = 1000
         total_rows = len(sales_df)
         
+        insert_sale = _sales_inserter(cur)
+        
         for i in range(0, total_rows, batch_size):
             batch = sales_df.iloc[i:i+batch_size]
             for _, row in batch.iterrows():
                 try:
-                    cur.execute("""
-                        INSERT INTO sales (
-                            sale_id, sale_date, store_id, product_id, quantity,
-                            sale_year, sale_month, sale_quarter, sale_day_of_week, sale_week
-                        ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                        ON CONFLICT (sale_id) DO NOTHING
-                    """, (
-                        row['sale_id'], row['sale_date'], row['store_id'], row['product_id'], int(row['quantity']),
-                        int(row['sale_year']), int(row['sale_month']), int(row['sale_quarter']), 
-                        row['sale_day_of_week'], int(row['sale_week'])
-                    ))
+                    insert_sale(row)
                 except Exception as e:
-                    logger.log_error(f"Error inserting sale {row['sale_id']}: {e}")
+                    logger.log_error("Error inserting sale %s: %s", row['sale_id'], e)
                     continue
             
             if (i + batch_size) % 10000 == 0:
                 logger.log_info(f"Loaded {min(i + batch_size, total_rows)} of {total_rows} sales records")
         
         conn.commit()
+        logger.annotate(rows=len(sales_df), rejected=len(rejected_df))
         print(f"Loaded {len(sales_df)} sales")
 
+#--------------------------------MONTH PARTITIONS------------------------------
+SALES_COPY_COLUMNS = ['sale_id', 'sale_date', 'store_id', 'product_id', 'quantity',
+                      'sale_year', 'sale_month', 'sale_quarter', 'sale_day_of_week', 'sale_week']
+
+def detach_sales_month(cur, year: int, month: int):
+    """Detach a month's partition from sales, leaving it as a plain table. Returns its name, or None if there is none"""
+    name = partition_name(year, month)
+    cur.execute("SELECT to_regclass(%s) IS NOT NULL", (name,))
+    if not cur.fetchone()[0]:
+        return None
+    cur.execute(sql.SQL("ALTER TABLE sales DETACH PARTITION {}").format(sql.Identifier(name)))
+    return name
+
+def attach_sales_month(cur, table: str, year: int, month: int):
+    """
+    Attach `table` as the sales partition for a month. Give it a CHECK
+    constraint on the month's sale_date range first and the attach skips
+    scanning it. Indexes and foreign keys matching the parent's are adopted;
+    any that are missing are built and validated here, under the lock.
+    """
+    cur.execute(
+        sql.SQL("ALTER TABLE sales ATTACH PARTITION {} FOR VALUES FROM (%(start)s) TO (%(end)s)").format(sql.Identifier(table)),
+        sales_date_range(year, (month,))
+    )
+
+def stage_sales_month(cur, table: str, rows, bounds: dict):
+    """
+    Create `table` shaped like a sales partition and COPY `rows` (CSV of
+    SALES_COPY_COLUMNS) into it. It gets the parent's primary key, indexes
+    and foreign keys, plus a CHECK on the month's `bounds`, so attaching it
+    later only links catalog entries instead of building or scanning anything.
+    """
+    cur.execute(sql.SQL("DROP TABLE IF EXISTS {}").format(sql.Identifier(table)))
+    cur.execute(sql.SQL("CREATE TABLE {} (LIKE sales INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING INDEXES)").format(
+        sql.Identifier(table)))
+    cur.execute(sql.SQL("ALTER TABLE {} ADD CONSTRAINT {} CHECK (sale_date >= %(start)s AND sale_date < %(end)s)").format(
+        sql.Identifier(table), sql.Identifier(f"{table}_range")), bounds)
+    cur.copy_expert(sql.SQL("COPY {} ({}) FROM STDIN WITH (FORMAT csv)").format(
+        sql.Identifier(table), sql.SQL(", ").join(map(sql.Identifier, SALES_COPY_COLUMNS))).as_string(cur), rows)
+    cur.execute("""
+        SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint
+        WHERE conrelid = 'sales'::regclass AND contype = 'f' ORDER BY conname
+    """)
+    for name, definition in cur.fetchall():
+        cur.execute(sql.SQL("ALTER TABLE {} ADD CONSTRAINT {} ").format(sql.Identifier(table), sql.Identifier(name))
+                    + sql.SQL(definition))
+    cur.execute(sql.SQL("ANALYZE {}").format(sql.Identifier(table)))
+
+def rename_partition_indexes(cur, table: str, old_prefix: str):
+    """Rename `table`'s indexes (and so its primary key) from `old_prefix`... to `table`..."""
+    cur.execute("""
+        SELECT c.relname FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid
+        WHERE i.indrelid = %s::regclass ORDER BY 1
+    """, (table,))
+    for (index,) in cur.fetchall():
+        if index.startswith(old_prefix):
+            cur.execute(sql.SQL("ALTER INDEX {} RENAME TO {}").format(
+                sql.Identifier(index), sql.Identifier(table + index[len(old_prefix):])))
+
+@logger.span("repo.replace_sales_month")
+def replace_sales_month(year: int, month: int, sales_df=None) -> int:
+    """
+    Replace all sales of one month in the partitioned layout as a bulk swap.
+    The rows are COPYed into a staging table that already has the primary
+    key, indexes and foreign keys of a sales partition. The month's partition
+    is then detached and dropped and the staging table attached in its place.
+    The detach holds an ACCESS EXCLUSIVE lock on sales until the commit, so
+    queries on sales wait for the swap. The swap only changes catalogs, so
+    that wait is milliseconds; it does not include the COPY or index builds.
+    Readers see the old month until the commit.
+    `sales_df` defaults to the month's rows of sales_processed.csv, validated
+    as in load_sales. Returns the number of rows in the new partition.
+    """
+    pd, validateService, readers = _loader_modules()
+    if sales_df is None:
+        sales_df = readers.read_dataset("sales_processed", dataset_dir=DATASET_DIR)
+        sales_df, rejected_df = validateService.clean_dataframe(sales_df, False)
+        logger.log_info(f"Skipped {len(rejected_df)} invalid rows of sales_processed.csv")
+
+    bounds = sales_date_range(year, (month,))
+    dates = pd.to_datetime(sales_df['sale_date'])
+    month_df = sales_df[(dates >= pd.Timestamp(bounds['start'])) & (dates < pd.Timestamp(bounds['end']))]
+    month_df = month_df.assign(
+        sale_date=dates, **{c: month_df[c].astype(int) for c in ('quantity', 'sale_year', 'sale_month', 'sale_quarter', 'sale_week')}
+    ).drop_duplicates(['sale_id', 'sale_date'])
+    rows = io.StringIO()
+    month_df[SALES_COPY_COLUMNS].to_csv(rows, index=False, header=False, date_format="%Y-%m-%d")
+    rows.seek(0)
+
+    name = partition_name(year, month)
+    staging = f"{name}_new"
+    with get_conn() as conn, conn.cursor() as cur:
+        if sales_layout(cur) != "partitioned":
+            raise ValueError("replace_sales_month needs the partitioned sales layout (SALES_LAYOUT=partitioned)")
+        stage_sales_month(cur, staging, rows, bounds)
+
+        # From here to the commit sales is locked; every step is a catalog change
+        old = detach_sales_month(cur, year, month)
+        if old:
+            cur.execute(sql.SQL("DROP TABLE {}").format(sql.Identifier(old)))
+        cur.execute(sql.SQL("ALTER TABLE {} RENAME TO {}").format(sql.Identifier(staging), sql.Identifier(name)))
+        attach_sales_month(cur, name, year, month)
+        rename_partition_indexes(cur, name, staging)
+        # The partition bound now enforces the range
+        cur.execute(sql.SQL("ALTER TABLE {} DROP CONSTRAINT {}").format(sql.Identifier(name), sql.Identifier(f"{staging}_range")))
+        conn.commit()
+
+    logger.annotate(rows=len(month_df))
+    logger.log_info(f"Replaced sales for {year}-{month:02d} with {len(month_df)} rows")
+    return len(month_df)
+
+@logger.span("repo.load_store_sales_summary")
+@logger.rate_limited("load_store_sales_summary")
 def load_store_sales_summary():
     """Load store sales summary data from CSV file into the database"""
+    pd, validateService, readers = _loader_modules()
     with get_conn() as conn, conn.cursor() as cur:
         try:
             logger.log_info("Reading store_sales_summary.csv file")
-            summary_df = pd.read_csv("../dataset/store_sales_summary.csv")
+            summary_df = readers.read_dataset("store_sales_summary", dataset_dir=DATASET_DIR)
             logger.log_info(f"store_sales_summary.csv file read successfully with {len(summary_df)} rows")
         except FileNotFoundError:
             logger.log_error("store_sales_summary.csv file not found")
@@ -170,21 +461,24 @@ def load_store_sales_summary():
                     float(row['avg_quantity_per_transaction'])
                 ))
             except Exception as e:
-                logger.log_error(f"Error inserting store sales summary for {row['store_id']}: {e}")
+                logger.log_error("Error inserting store sales summary for %s: %s", row['store_id'], e)
                 continue
         
         conn.commit()
+        logger.annotate(rows=len(summary_df), rejected=len(rejected_df))
         logger.log_info(f"Loaded {len(summary_df)} store sales summary records")
         print(f"Loaded {len(summary_df)} store sales summary records")
 
-def load_data():
-    """ Load data from CSV files into the database """
-    with get_conn() as conn, conn.cursor() as cur: # # TODO : add try catch
-
-        #---------------LOAD CATEGORIES CSV FILE---------------
+#--------------------------------LOAD CATEGORIES CSV FILE------------------------------
+@logger.span("repo.load_categories")
+@logger.rate_limited("load_categories")
+def load_categories():
+    """Load categories data from CSV file into the database"""
+    pd, validateService, readers = _loader_modules()
+    with get_conn() as conn, conn.cursor() as cur:
         try:
             logger.log_info("Reading category.csv file")
-            category_df = pd.read_csv("../dataset/category.csv")
+            category_df = readers.read_dataset("category", dataset_dir=DATASET_DIR)
             logger.log_info(f"Category.csv file read successfully with {len(category_df)} rows")
         except FileNotFoundError:
             logger.log_error("Category.csv file not found")
@@ -210,10 +504,20 @@ def load_data():
             (row["category_id"], row["category_name"])
             )
 
-        #---------------LOAD PRODUCTS CSV FILE---------------
+        conn.commit()
+        logger.annotate(rows=len(category_df), rejected=len(rejected_df))
+        print(f"Loaded {len(category_df)} categories")
+
+#--------------------------------LOAD PRODUCTS CSV FILE------------------------------
+@logger.span("repo.load_products")
+@logger.rate_limited("load_products")
+def load_products():
+    """Load products data from CSV file into the database (categories must be loaded first)"""
+    pd, validateService, readers = _loader_modules()
+    with get_conn() as conn, conn.cursor() as cur:
         try:
             logger.log_info("Reading products_with_images.csv file")
-            product_df = pd.read_csv("../dataset/products_with_images.csv")
+            product_df = readers.read_dataset("products_with_images", dataset_dir=DATASET_DIR)
             logger.log_info(f"products_with_images.csv file read successfully with {len(product_df)} rows")
         except FileNotFoundError:
             logger.log_error("products_with_images.csv file not found")
@@ -241,9 +545,16 @@ def load_data():
             )
 
         conn.commit()
-        print(f"Loaded {len(category_df)} categories and {len(product_df)} products")
-        load_stores()
-        load_sales()
-        load_store_sales_summary()
+        logger.annotate(rows=len(product_df), rejected=len(rejected_df))
+        print(f"Loaded {len(product_df)} products")
+
+@logger.span("repo.load_data")
+def load_data():
+    """ Load data from CSV files into the database, one table after another (see pipeline.py for the parallel run) """
+    load_categories()
+    load_products()
+    load_stores()
+    load_sales()
+    load_store_sales_summary()
 
 #
\ No newline at end of file
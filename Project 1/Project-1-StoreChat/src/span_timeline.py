@@ -0,0 +1,82 @@
+"""
+Turn the span log written by logger.span into a timeline.
+
+    python span_timeline.py logs/spans.jsonl --trace logs/trace.json
+
+The trace file uses the Chrome trace event format, so it opens as a flame
+chart in chrome://tracing, https://ui.perfetto.dev or speedscope. Without
+--trace the span tree is printed with durations and row counts.
+"""
+import json
+import argparse
+
+
+def load_spans(path) -> list:
+    """Span dicts from a JSON-lines span log, skipping lines that are not spans"""
+    spans = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(record, dict) and "span" in record and "start" in record:
+                spans.append(record)
+    return spans
+
+def to_trace_events(spans) -> dict:
+    """Chrome trace "complete" events (timestamps in microseconds)"""
+    events = []
+    for span in sorted(spans, key=lambda s: s["start"]):
+        args = {**span.get("fields", {}), "status": span.get("status")}
+        if span.get("rows") is not None:
+            args["rows"] = span["rows"]
+        if span.get("error"):
+            args["error"] = span["error"]
+        events.append({
+            "name": span["span"],
+            "cat": span["span"].split(".")[0],
+            "ph": "X",
+            "ts": round(span["start"] * 1e6),
+            "dur": round(span["duration_s"] * 1e6),
+            "pid": span.get("pid", 0),
+            "tid": span.get("thread", "main"),
+            "args": args,
+        })
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+def render_tree(spans) -> str:
+    """Indented span tree, children under their parent in start order"""
+    children = {}
+    ids = {span["id"] for span in spans}
+    for span in sorted(spans, key=lambda s: s["start"]):
+        parent = span.get("parent") if span.get("parent") in ids else None
+        children.setdefault(parent, []).append(span)
+
+    lines = []
+    def walk(parent, depth):
+        for span in children.get(parent, []):
+            rows = f"  {span['rows']:,} rows" if span.get("rows") is not None else ""
+            status = "  FAILED" if span.get("status") == "error" else ""
+            lines.append(f"{'  ' * depth}{span['span']}  {span['duration_s'] * 1000:.1f} ms{rows}{status}")
+            walk(span["id"], depth + 1)
+    walk(None, 0)
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert a StoreChat span log to a timeline")
+    parser.add_argument("spans", nargs="?", default="logs/spans.jsonl")
+    parser.add_argument("--trace", help="Write a Chrome trace JSON file here instead of printing the tree")
+    args = parser.parse_args()
+
+    spans = load_spans(args.spans)
+    if args.trace:
+        with open(args.trace, "w", encoding="utf-8") as f:
+            json.dump(to_trace_events(spans), f)
+        print(f"Wrote {len(spans)} spans to {args.trace}")
+    else:
+        print(render_tree(spans))
@@ -0,0 +1,97 @@
+import gzip
+import json
+import pytest
+import pandas as pd
+from src.app import app
+from src.dashboard_service import DashboardService
+
+#--------------------------------Fixtures--------------------------------
+@pytest.fixture
+def client(dataset_dir, monkeypatch):
+    service = DashboardService(str(dataset_dir), disk_cache=False)
+    monkeypatch.setitem(app.config, "DASHBOARD_SERVICE", service)
+    return app.test_client()
+
+#--------------------------------Tests for endpoints--------------------------------
+def test_summary_defaults_to_latest_year(client):
+    body = client.get("/api/summary").get_json()
+    assert body['year'] == body['years'][-1]
+    assert body['total_quantity'] == sum(row['total_quantity'] for row in body['quantity_by_store'])
+
+def test_revenue_by_store(client, dataset_dir):
+    body = client.get("/api/revenue-by-store?year=2021").get_json()
+    expected = DashboardService(str(dataset_dir), disk_cache=False).get_revenue_by_store(2021)
+    assert [row['store_id'] for row in body['data']] == expected['store_id'].tolist()
+
+def test_store_trend_requires_store(client):
+    response = client.get("/api/store-trend?year=2021")
+    assert response.status_code == 400
+    assert "store_id" in response.get_json()['error']
+
+@pytest.mark.parametrize("query", ["/api/summary?year=abc", "/api/revenue-by-store?year=20x4", "/api/top?n=ten"])
+def test_non_integer_args_are_rejected(client, query):
+    response = client.get(query)
+    assert response.status_code == 400
+    assert "must be an integer" in response.get_json()['error']
+    assert 'ETag' not in response.headers
+
+def test_store_trend(client):
+    body = client.get("/api/store-trend?store_id=ST-1&year=2021").get_json()
+    assert [row['sale_month'] for row in body['data']] == sorted(row['sale_month'] for row in body['data'])
+    assert body['data'][0]['month_name']
+
+def test_top_products_limited_and_sorted(client):
+    body = client.get("/api/top-products?year=2022&n=5").get_json()
+    revenues = [row['revenue'] for row in body['data']]
+    assert len(revenues) == 5
+    assert revenues == sorted(revenues, reverse=True)
+
+def test_top_leaderboard(client):
+    body = client.get("/api/top?dimension=product_id&metric=units&window=2022-Q3&n=3").get_json()
+    units = [row['units'] for row in body['data']]
+    assert len(units) == 3
+    assert units == sorted(units, reverse=True)
+
+def test_top_rejects_unknown_metric(client):
+    response = client.get("/api/top?metric=profit")
+    assert response.status_code == 400
+
+#--------------------------------Tests for caching headers--------------------------------
+def test_matching_etag_returns_304(client):
+    first = client.get("/api/revenue-by-store?year=2021")
+    etag = first.headers['ETag']
+    second = client.get("/api/revenue-by-store?year=2021", headers={"If-None-Match": etag})
+    assert second.status_code == 304
+    assert second.data == b""
+    other_year = client.get("/api/revenue-by-store?year=2022", headers={"If-None-Match": etag})
+    assert other_year.status_code == 200
+
+def test_etag_changes_with_data(client, dataset_dir):
+    etag = client.get("/api/summary").headers['ETag']
+    summary_path = dataset_dir / "store_sales_summary.csv"
+    summary = pd.read_csv(summary_path)
+    summary.iloc[:-1].to_csv(summary_path, index=False)
+    try:
+        response = client.get("/api/summary", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers['ETag'] != etag
+    finally:
+        summary.to_csv(summary_path, index=False)
+
+def test_no_etag_while_data_version_is_unknown(client, monkeypatch):
+    etag = client.get("/api/summary").headers['ETag']
+    monkeypatch.setattr(app.config["DASHBOARD_SERVICE"], 'data_version', lambda *names: None)
+    response = client.get("/api/summary", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert 'ETag' not in response.headers
+
+def test_large_payload_is_gzipped(client, monkeypatch):
+    monkeypatch.setattr("src.app.GZIP_MIN_BYTES", 200)
+    response = client.get("/api/summary", headers={"Accept-Encoding": "gzip"})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert json.loads(gzip.decompress(response.data))['years']
+
+def test_small_payload_is_not_gzipped(client, monkeypatch):
+    monkeypatch.setattr("src.app.GZIP_MIN_BYTES", 200)
+    response = client.get("/api/top-products?year=2022&n=1", headers={"Accept-Encoding": "gzip"})
+    assert 'Content-Encoding' not in response.headers
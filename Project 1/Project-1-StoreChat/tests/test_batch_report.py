@@ -0,0 +1,17 @@
+from src.charts.batch_report import generate_report
+
+DATASET_SIZE = {"n_sales": 1000, "n_stores": 3, "n_products": 10}
+
+#--------------------------------Tests for the batch report--------------------------------
+def test_report_renders_every_store_and_year(dataset_dir, tmp_path):
+    result = generate_report(dataset_dir, tmp_path / "report", jobs=2, years=[2022, 2023])
+    assert result['charts'] == 3 + 2 * 2
+    assert sorted(p.name for p in (tmp_path / "report" / "stores").iterdir()) == ['ST-1', 'ST-2', 'ST-3']
+    assert (tmp_path / "report" / "years" / "2023" / "revenue_by_store.html").exists()
+    assert (tmp_path / "report" / "stores" / "ST-2" / "monthly_sales.html").read_text().count("ST-2") > 0
+
+def test_index_links_every_chart(dataset_dir, tmp_path):
+    result = generate_report(dataset_dir, tmp_path / "report", jobs=1, stores=['ST-1'], years=[2021])
+    index = result['index'].read_text()
+    assert index.count("<li>") == result['files'] == 3
+    assert 'href="years/2021/quantity_by_store.html"' in index
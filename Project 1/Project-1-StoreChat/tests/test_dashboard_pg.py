@@ -0,0 +1,135 @@
+import os
+import pytest
+import pandas as pd
+
+# These tests truncate and reload the StoreChat tables in the database named by
+# the PG* environment variables, so they only run when explicitly enabled.
+pytestmark = pytest.mark.skipif(
+    not os.getenv("STORECHAT_PG_TESTS"),
+    reason="set STORECHAT_PG_TESTS=1 to run against a scratch PostgreSQL database"
+)
+
+DATASET_SIZE = {"n_sales": 3000, "n_stores": 12, "n_products": 20}
+
+#--------------------------------Fixtures--------------------------------
+@pytest.fixture(scope="module")
+def loaded_dataset(pg, dataset_dir):
+    with pg.loaded(dataset_dir):
+        yield dataset_dir
+
+@pytest.fixture(scope="module")
+def backends(loaded_dataset):
+    from src.dashboard_service import create_dashboard_service
+    csv_service = create_dashboard_service("csv", dataset_path=str(loaded_dataset))
+    pg_service = create_dashboard_service("postgres", dataset_path=str(loaded_dataset))
+    return csv_service, pg_service
+
+def assert_frames_match(left, right):
+    pd.testing.assert_frame_equal(
+        left.reset_index(drop=True), right.reset_index(drop=True),
+        check_dtype=False, check_exact=False, rtol=1e-9
+    )
+
+#--------------------------------Parity tests--------------------------------
+def test_summary_parity(backends):
+    csv_service, pg_service = backends
+    columns = ['store_id', 'sale_year', 'sale_month', 'total_quantity', 'total_transactions',
+               'avg_quantity_per_transaction', 'date']
+    assert_frames_match(csv_service.load_summary_data()[columns], pg_service.load_summary_data()[columns])
+
+@pytest.mark.parametrize("year", [2019, 2021, 2024, 1999])
+def test_revenue_by_store_parity(backends, year):
+    csv_service, pg_service = backends
+    assert_frames_match(csv_service.get_revenue_by_store(year), pg_service.get_revenue_by_store(year))
+
+@pytest.mark.parametrize("store_id", [None, 'ST-3'])
+def test_revenue_by_month_parity(backends, store_id):
+    csv_service, pg_service = backends
+    assert_frames_match(
+        csv_service.get_revenue_by_month(2022, store_id),
+        pg_service.get_revenue_by_month(2022, store_id)
+    )
+
+def test_revenue_by_category_parity(backends):
+    csv_service, pg_service = backends
+    assert_frames_match(csv_service.get_revenue_by_category(2020), pg_service.get_revenue_by_category(2020))
+
+def test_products_parity(backends):
+    csv_service, pg_service = backends
+    csv_products = csv_service.load_products_data().sort_values('Product_ID', ignore_index=True)
+    pg_products = pg_service.load_products_data().sort_values('Product_ID', ignore_index=True)
+    assert_frames_match(csv_products, pg_products)
+
+def test_quantity_by_store_parity(backends):
+    csv_service, pg_service = backends
+    assert_frames_match(csv_service.get_quantity_by_store(2023), pg_service.get_quantity_by_store(2023))
+
+def test_store_monthly_trend_parity(backends):
+    csv_service, pg_service = backends
+    columns = ['sale_month', 'total_quantity', 'total_transactions', 'month_name']
+    assert_frames_match(
+        csv_service.get_store_monthly_trend('ST-2', 2021)[columns],
+        pg_service.get_store_monthly_trend('ST-2', 2021)[columns]
+    )
+
+@pytest.mark.parametrize("store_id, year", [('ST-5', None), (None, 2020)])
+def test_daily_sales_parity(backends, store_id, year):
+    csv_service, pg_service = backends
+    assert_frames_match(csv_service.get_daily_sales(store_id, year), pg_service.get_daily_sales(store_id, year))
+
+def test_top_products_parity(backends):
+    csv_service, pg_service = backends
+    assert_frames_match(csv_service.get_top_products(2021, 5), pg_service.get_top_products(2021, 5))
+
+@pytest.mark.parametrize("dimension, metric, window", [
+    ('store_id', 'revenue', None), ('product_id', 'units', '2022-Q3'), ('category_id', 'transactions', 2021),
+])
+def test_top_n_parity(backends, dimension, metric, window):
+    csv_service, pg_service = backends
+    assert_frames_match(csv_service.top_n(dimension, metric, window, 7), pg_service.top_n(dimension, metric, window, 7))
+
+def test_pg_results_are_cached(backends):
+    _, pg_service = backends
+    first = pg_service.get_revenue_by_category(2021)
+    assert pg_service.get_revenue_by_category(2021) is first
+
+def test_pg_has_no_revenue_cube(backends):
+    _, pg_service = backends
+    assert pg_service.get_revenue_cube() is None
+
+def test_keyset_page_matches_offset_page(backends):
+    _, pg_service = backends
+    first = pg_service.get_sales_page(page=1, page_size=50, sort_by='sale_date', store_id='ST-4')
+    by_offset = pg_service.get_sales_page(page=2, page_size=50, sort_by='sale_date', store_id='ST-4')
+    by_keyset = pg_service.get_sales_page(page=2, page_size=50, sort_by='sale_date', store_id='ST-4',
+                                          after=first.next_key)
+    assert by_keyset.rows['sale_id'].tolist() == by_offset.rows['sale_id'].tolist()
+    assert first.total_rows == len(csv_store_rows(backends, 'ST-4'))
+
+def test_pg_sales_page_rejects_non_positive_paging(backends):
+    _, pg_service = backends
+    with pytest.raises(ValueError, match="at least 1"):
+        pg_service.get_sales_page(page=1, page_size=0)
+
+def csv_store_rows(backends, store_id):
+    csv_service, _ = backends
+    sales = csv_service.load_sales_data()
+    return sales[sales['store_id'] == store_id]
+
+#--------------------------------Export tests--------------------------------
+def test_export_streams_filtered_sales(backends, tmp_path):
+    from src.export import export_sales
+    rows = export_sales(tmp_path / "st4.csv", "csv", store_id='ST-4', itersize=100)
+    exported = pd.read_csv(tmp_path / "st4.csv")
+    assert rows == len(exported) == len(csv_store_rows(backends, 'ST-4'))
+    assert exported['sale_date'].is_monotonic_increasing
+
+def test_export_endpoint_streams_ndjson(backends):
+    import json
+    from src.app import app
+    response = app.test_client().get("/api/export/sales?format=ndjson&year=2021")
+    assert response.is_streamed
+    lines = response.get_data(as_text=True).splitlines()
+    _, pg_service = backends
+    assert len(lines) == pg_service.get_daily_sales(year=2021)['total_transactions'].sum()
+    assert json.loads(lines[0])['sale_date'].startswith('2021-')
@@ -0,0 +1,93 @@
+import json
+import time
+import pytest
+import pandas as pd
+from src.dashboard_profiler import RenderProfiler
+from src.dashboard_service import DashboardService
+
+class FakeService:
+    data_path = "unused"
+
+    def get_revenue_by_store(self, year):
+        time.sleep(0.01)
+        return year
+
+#--------------------------------Fixtures--------------------------------
+@pytest.fixture
+def revenue_service(tmp_path):
+    pd.DataFrame({'sale_id': ['S1', 'S2'], 'sale_date': ['16-06-2023', '17-06-2023'], 'store_id': ['ST-1', 'ST-2'],
+                  'product_id': ['P-1', 'P-1'], 'quantity': [2, 1]}).to_csv(tmp_path / "sales.csv", index=False)
+    pd.DataFrame({'Product_ID': ['P-1'], 'Product_Name': ['Phone'], 'Category_ID': ['CAT-1'],
+                  'Launch_Date': ['2020-01-01'], 'Price': [100.0]}).to_csv(tmp_path / "products.csv", index=False)
+    return DashboardService(str(tmp_path), disk_cache=False)
+
+def service_calls(profiler):
+    calls = profiler.frame()
+    return calls[calls['kind'] == 'service'][['name', 'section', 'caller']].values.tolist()
+
+#--------------------------------Tests for the profiler--------------------------------
+def test_sections_and_service_calls_are_recorded():
+    profiler = RenderProfiler()
+    service = profiler.wrap(FakeService())
+    with profiler.section("revenue", "aggregate"):
+        assert service.get_revenue_by_store(2023) == 2023
+    with profiler.section("revenue", "figure"):
+        pass
+
+    records = profiler.frame()
+    call = records[records['kind'] == 'service'].iloc[0]
+    assert call['name'] == 'get_revenue_by_store'
+    assert call['section'] == 'revenue'
+    assert call['seconds'] >= 0.01
+    assert set(profiler.phase_totals().index) == {'aggregate', 'figure'}
+
+def test_nested_sections_are_not_double_counted():
+    profiler = RenderProfiler()
+    with profiler.section("outer", "render"):
+        with profiler.section("inner", "render"):
+            time.sleep(0.01)
+    assert profiler.phase_totals()['render'] < 2 * profiler.frame()['seconds'].max()
+
+def test_disabled_profiler_records_nothing():
+    profiler = RenderProfiler(enabled=False)
+    service = FakeService()
+    assert profiler.wrap(service) is service
+    with profiler.section("revenue", "aggregate"):
+        pass
+    assert profiler.records == []
+
+def test_proxy_passes_attributes_through():
+    profiler = RenderProfiler()
+    assert profiler.wrap(FakeService()).data_path == "unused"
+
+def test_write_log_appends_json_lines(tmp_path):
+    path = tmp_path / "logs" / "timings.jsonl"
+    for year in (2022, 2023):
+        profiler = RenderProfiler()
+        with profiler.section("revenue", "aggregate"):
+            pass
+        profiler.write_log(path, year=year)
+    entries = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [entry['year'] for entry in entries] == [2022, 2023]
+    assert entries[0]['records'][0]['name'] == 'revenue'
+    assert 'deployment' in entries[0]
+
+def test_inner_service_calls_are_recorded_under_their_caller(revenue_service):
+    profiler = RenderProfiler()
+    with profiler.section("revenue", "aggregate"):
+        profiler.wrap(revenue_service).get_revenue_by_store(2023)
+        revenue_service.get_revenue_by_category(2023)  # unwrapped, but inside a section
+
+    calls = service_calls(profiler)
+    assert ['get_revenue_by_store', 'revenue', None] in calls
+    assert ['get_revenue_cube', 'revenue', 'get_revenue_by_store'] in calls
+    assert ['load_sales_data', 'revenue', 'get_revenue_cube'] in calls
+    assert ['get_revenue_by_category', 'revenue', None] in calls
+    assert [name for name, *_ in calls].count('get_revenue_by_store') == 1
+
+def test_inner_calls_are_not_recorded_outside_an_enabled_profiler(revenue_service):
+    enabled, disabled = RenderProfiler(), RenderProfiler(enabled=False)
+    revenue_service.get_revenue_by_store(2023)
+    with disabled.section("revenue", "aggregate"):
+        revenue_service.get_revenue_by_category(2023)
+    assert enabled.records == [] and disabled.records == []
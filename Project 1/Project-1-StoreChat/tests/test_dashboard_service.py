@@ -0,0 +1,507 @@
+import os
+import pytest
+import pandas as pd
+import numpy as np
+from src.dashboard_service import DashboardService, create_dashboard_service, parse_window, top_positions
+from src.dashboard_cache import ArrayCache, DiskResultCache, FrameCache, ResultCache, SingleFlight
+from src.dashboard_prefetch import Prefetcher
+from src import columnar, readers
+
+#--------------------------------Fixtures--------------------------------
+@pytest.fixture
+def dataset_dir(tmp_path):
+    pd.DataFrame({
+        'sale_id': ['S1', 'S2', 'S3', 'S4', 'S5'],
+        'sale_date': ['16-06-2023', '17-06-2023', '01-07-2023', '16-06-2022', '02-02-2023'],
+        'store_id': ['ST-1', 'ST-1', 'ST-2', 'ST-2', 'ST-3'],
+        'product_id': ['P-1', 'P-2', 'P-1', 'P-2', 'P-3'],
+        'quantity': [2, 1, 3, 5, 4]
+    }).to_csv(tmp_path / "sales.csv", index=False)
+    pd.DataFrame({
+        'Product_ID': ['P-1', 'P-2', 'P-3'],
+        'Product_Name': ['Phone', 'Tablet', 'Watch'],
+        'Category_ID': ['CAT-6', 'CAT-9', 'CAT-10'],
+        'Launch_Date': ['2020-01-01', '2021-01-01', '2022-01-01'],
+        'Price': [100.0, 50.0, 10.0]
+    }).to_csv(tmp_path / "products.csv", index=False)
+    pd.DataFrame({
+        'store_id': ['ST-1', 'ST-1', 'ST-2', 'ST-2', 'ST-3'],
+        'sale_year': [2023, 2023, 2023, 2022, 2023],
+        'sale_month': [6, 7, 7, 6, 2],
+        'total_quantity': [3, 1, 3, 5, 4],
+        'total_transactions': [2, 1, 1, 1, 1],
+        'avg_quantity_per_transaction': [1.5, 1.0, 3.0, 5.0, 4.0]
+    }).to_csv(tmp_path / "store_sales_summary.csv", index=False)
+    return tmp_path
+
+@pytest.fixture
+def service(dataset_dir):
+    return DashboardService(str(dataset_dir))
+
+@pytest.fixture
+def count_reads(monkeypatch):
+    """Paths parsed, whether through pandas or the pyarrow reader"""
+    calls = []
+
+    def counting(original):
+        def counted(*args, **kwargs):
+            calls.append(args[0] if args else kwargs.get('filepath_or_buffer'))
+            return original(*args, **kwargs)
+        return counted
+
+    monkeypatch.setattr(pd, 'read_csv', counting(pd.read_csv))
+    monkeypatch.setattr(readers, '_read_arrow', counting(readers._read_arrow))
+    return calls
+
+#--------------------------------Tests for loaders--------------------------------
+def test_load_summary_data_adds_date(service):
+    df = service.load_summary_data()
+    assert len(df) == 5
+    assert pd.api.types.is_datetime64_any_dtype(df['date'])
+
+def test_missing_file_returns_empty_frame(tmp_path):
+    service = DashboardService(str(tmp_path / "missing"))
+    assert service.load_sales_data().empty
+
+def test_get_revenue_by_store(service):
+    result = service.get_revenue_by_store(2023)
+    assert result['store_id'].tolist() == ['ST-2', 'ST-1', 'ST-3']
+    assert result['revenue'].tolist() == [300.0, 250.0, 40.0]
+
+def test_factory_builds_csv_backend(dataset_dir):
+    service = create_dashboard_service("csv", dataset_path=str(dataset_dir))
+    assert type(service) is DashboardService
+
+def test_factory_rejects_unknown_backend():
+    with pytest.raises(ValueError):
+        create_dashboard_service("parquet")
+
+#--------------------------------Tests for the frame cache--------------------------------
+def test_repeated_loads_parse_once(service, count_reads):
+    first = service.load_sales_data()
+    second = service.load_sales_data()
+    assert first is second
+    assert len(count_reads) == 1
+
+def test_revenue_filter_change_does_not_reparse(service, count_reads):
+    service.get_revenue_by_store(2023)
+    service.get_revenue_by_store(2022)
+    service.get_revenue_by_store(2023)
+    assert len(count_reads) == 2  # sales.csv and products.csv once each
+
+def test_changed_file_is_reloaded(service, dataset_dir, count_reads):
+    assert len(service.load_products_data()) == 3
+    products = pd.read_csv(dataset_dir / "products.csv").iloc[:2]
+    products.to_csv(dataset_dir / "products.csv", index=False)
+    stat = os.stat(dataset_dir / "products.csv")
+    os.utime(dataset_dir / "products.csv", ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert len(service.load_products_data()) == 2
+
+def test_frame_cache_evicts_least_recently_used(dataset_dir):
+    sales_bytes = int(DashboardService._parse_sales(dataset_dir / "sales.csv").memory_usage(deep=True).sum())
+    cache = FrameCache(max_bytes=int(sales_bytes * 1.5))
+    cache.get(dataset_dir / "sales.csv", DashboardService._parse_sales)
+    cache.get(dataset_dir / "store_sales_summary.csv", DashboardService._parse_summary)
+    assert dataset_dir / "sales.csv" not in cache
+    assert dataset_dir / "store_sales_summary.csv" in cache
+    assert cache.evictions == 1
+    assert cache.size_bytes <= cache.max_bytes
+
+def test_frame_larger_than_budget_is_not_cached(dataset_dir):
+    cache = FrameCache(max_bytes=10)
+    df = cache.get(dataset_dir / "sales.csv", DashboardService._parse_sales)
+    assert len(df) == 5
+    assert len(cache) == 0
+
+#--------------------------------Tests for the revenue cube--------------------------------
+def test_revenue_cube_built_once_per_data_version(service):
+    cube = service.get_revenue_cube()
+    service.get_revenue_by_store(2023)
+    service.get_revenue_by_store(2022)
+    assert service.get_revenue_cube() is cube
+
+def test_get_top_products(service):
+    result = service.get_top_products(2023, n=2)
+    assert result['product_id'].tolist() == ['P-1', 'P-2']
+    assert result['revenue'].tolist() == [500.0, 50.0]
+    assert result['units'].tolist() == [5, 1]
+
+def test_top_n_stores_by_revenue(service):
+    result = service.top_n('store_id', 'revenue', 2023, n=2)
+    assert result.columns.tolist() == ['store_id', 'revenue', 'units', 'transactions']
+    assert result['store_id'].tolist() == ['ST-2', 'ST-1']
+    assert result['revenue'].tolist() == [300.0, 250.0]
+
+def test_top_n_window_and_metric(service):
+    result = service.top_n('category_id', 'units', '2023-Q2', n=5)
+    assert result['category_id'].tolist() == ['CAT-6', 'CAT-9']
+    assert result['units'].tolist() == [2, 1]
+    assert service.top_n('product_id', 'transactions', None, n=1)['product_id'].tolist() == ['P-1']
+
+def test_top_n_rejects_unknown_dimension(service):
+    with pytest.raises(ValueError):
+        service.top_n('city', 'revenue')
+
+def test_top_n_cached_per_data_version(service):
+    assert service.top_n('store_id', 'units', 2023) is service.top_n('store_id', 'units', 2023)
+
+@pytest.mark.parametrize("window, expected", [
+    (None, (None, None)), ("all", (None, None)), (2023, (2023, None)),
+    ("2023-Q2", (2023, (4, 5, 6))), ("2023-06", (2023, (6,))),
+])
+def test_parse_window(window, expected):
+    assert parse_window(window) == expected
+
+@pytest.mark.parametrize("window", ["2023-Q5", "2023-13", "last week"])
+def test_parse_window_rejects_bad_windows(window):
+    with pytest.raises(ValueError):
+        parse_window(window)
+
+def test_top_positions_matches_full_sort():
+    import numpy as np
+    rng = np.random.default_rng(1)
+    values = rng.integers(0, 50, 500).astype(float)  # plenty of ties
+    keys = np.array([f"K-{i:03d}" for i in range(500)], dtype=object)
+    expected = sorted(range(500), key=lambda i: (-values[i], keys[i]))[:20]
+    assert top_positions(values, keys, 20).tolist() == expected
+
+def test_revenue_by_store_for_missing_year_is_empty(service):
+    result = service.get_revenue_by_store(1999)
+    assert result.empty
+    assert list(result.columns) == ['store_id', 'revenue']
+
+def test_get_revenue_by_month(service):
+    result = service.get_revenue_by_month(2023)
+    assert result['sale_month'].tolist() == [2, 6, 7]
+    assert result['revenue'].tolist() == [40.0, 250.0, 300.0]
+
+def test_get_revenue_by_month_for_store(service):
+    result = service.get_revenue_by_month(2023, store_id='ST-1')
+    assert result['sale_month'].tolist() == [6]
+    assert service.get_revenue_by_month(2023, store_id='ST-99').empty
+
+def test_get_revenue_by_category(service):
+    result = service.get_revenue_by_category(2023)
+    assert result['category_id'].tolist() == ['CAT-6', 'CAT-9', 'CAT-10']
+    assert result['revenue'].tolist() == [500.0, 50.0, 40.0]
+
+#--------------------------------Tests for the summary index--------------------------------
+def test_summary_index_lists_years_and_stores(service):
+    assert service.get_available_years() == [2022, 2023]
+    assert service.get_available_stores() == ['ST-1', 'ST-2', 'ST-3']
+
+def test_summary_index_built_once_per_data_version(service, count_reads):
+    index = service.get_summary_index()
+    service.get_quantity_by_store(2022)
+    service.get_store_monthly_trend('ST-2', 2022)
+    assert service.get_summary_index() is index
+    assert len(count_reads) == 1
+
+def test_summary_index_partitions(service):
+    index = service.get_summary_index()
+    assert set(index.partitions) == {('ST-1', 2023), ('ST-2', 2023), ('ST-2', 2022), ('ST-3', 2023)}
+    assert index.year_totals[2022]['total_quantity'].tolist() == [5]
+
+def test_missing_partition_is_empty(service):
+    assert service.get_store_monthly_trend('ST-3', 2022).empty
+    assert service.get_quantity_by_store(1999).empty
+
+#--------------------------------Tests for the result cache--------------------------------
+def test_get_quantity_by_store(service):
+    result = service.get_quantity_by_store(2023)
+    assert result['store_id'].tolist() == ['ST-1', 'ST-2', 'ST-3']
+    assert result['total_quantity'].tolist() == [4, 3, 4]
+
+def test_get_store_monthly_trend(service):
+    result = service.get_store_monthly_trend('ST-1', 2023)
+    assert result['sale_month'].tolist() == [6, 7]
+    assert result['month_name'].tolist() == ['June', 'July']
+
+def test_get_daily_sales(service):
+    result = service.get_daily_sales('ST-1')
+    assert result['sale_date'].dt.strftime('%Y-%m-%d').tolist() == ['2023-06-16', '2023-06-17']
+    assert result['total_quantity'].tolist() == [2, 1]
+    assert service.get_daily_sales(year=2022)['total_transactions'].tolist() == [1]
+
+def test_repeated_query_is_served_from_cache(service):
+    first = service.get_revenue_by_store(2023)
+    second = service.get_revenue_by_store(2023)
+    service.get_revenue_by_store(2022)
+    stats = service.cache_stats()
+    assert first is second
+    assert stats['hits'] == 1
+    assert stats['misses'] == 2
+
+def test_data_change_invalidates_cached_results(service, dataset_dir):
+    assert service.get_quantity_by_store(2023)['total_quantity'].sum() == 11
+    summary = pd.read_csv(dataset_dir / "store_sales_summary.csv")
+    summary.loc[0, 'total_quantity'] = 100
+    summary.to_csv(dataset_dir / "store_sales_summary.csv", index=False)
+    stat = os.stat(dataset_dir / "store_sales_summary.csv")
+    os.utime(dataset_dir / "store_sales_summary.csv", ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert service.get_quantity_by_store(2023)['total_quantity'].sum() == 108
+
+def test_unknown_data_version_bypasses_cache(service, monkeypatch):
+    first = service.get_revenue_by_store(2023)
+    monkeypatch.setattr(service, 'data_version', lambda *names: None)
+    uncached = service.get_revenue_by_store(2023)
+    assert uncached is not first
+    assert service.get_revenue_by_store(2023) is not uncached
+    assert service.get_summary_index() is not service.get_summary_index()
+
+def test_pg_data_version_is_reused_briefly(tmp_path, monkeypatch):
+    from src.dashboard_pg import PostgresDashboardService
+    service = PostgresDashboardService(dataset_path=str(tmp_path), disk_cache=False, version_ttl=60)
+    reads = []
+
+    def version_query(query, params=None):
+        reads.append(params)
+        return pd.DataFrame({'relname': ['sales'], 'n_tup_ins': [len(reads)]})
+
+    monkeypatch.setattr(service, '_query', version_query)
+    assert service.data_version() == service.data_version() == (('sales', 1),)
+    assert service.data_version("store_sales_summary") == (('sales', 2),)
+    assert len(reads) == 2
+    service.version_ttl = 0
+    assert service.data_version() == (('sales', 3),)
+
+def test_pg_data_version_failure_is_unknown(tmp_path, monkeypatch):
+    from src.dashboard_pg import PostgresDashboardService
+    service = PostgresDashboardService(dataset_path=str(tmp_path), disk_cache=False)
+
+    def failing_query(query, params=None):
+        raise ConnectionError("server closed the connection")
+
+    monkeypatch.setattr(service, '_query', failing_query)
+    assert service.data_version() is None
+    assert service.data_version() is None  # failures are not reused
+
+def test_result_cache_lru_eviction():
+    cache = ResultCache(max_entries=2, ttl_seconds=60)
+    cache.get_or_compute('a', lambda: 1)
+    cache.get_or_compute('b', lambda: 2)
+    cache.get_or_compute('a', lambda: 1)
+    cache.get_or_compute('c', lambda: 3)
+    assert cache.get_or_compute('b', lambda: 'recomputed') == 'recomputed'
+    assert cache.evictions == 2
+
+def test_result_cache_ttl_expiry():
+    cache = ResultCache(max_entries=10, ttl_seconds=0)
+    cache.get_or_compute('a', lambda: 1)
+    assert cache.get_or_compute('a', lambda: 2) == 2
+    assert cache.stats()['hits'] == 0
+
+#--------------------------------Tests for paginated sales--------------------------------
+@pytest.fixture
+def large_sales_service(tmp_path):
+    pd.DataFrame({
+        'sale_id': [f'S{i}' for i in range(1000)],
+        'sale_date': [f'{(i % 28) + 1:02d}-{(i % 12) + 1:02d}-{2020 + i % 3}' for i in range(1000)],
+        'store_id': [f'ST-{i % 7}' for i in range(1000)],
+        'product_id': [f'P-{i % 5}' for i in range(1000)],
+        'quantity': [(i * 37) % 11 + 1 for i in range(1000)]
+    }).to_csv(tmp_path / "sales.csv", index=False)
+    return DashboardService(str(tmp_path), cache_dir=str(tmp_path / "cache"))
+
+def test_sales_page_in_file_order(large_sales_service):
+    page = large_sales_service.get_sales_page(page=3, page_size=100)
+    assert page.total_rows == 1000
+    assert page.total_pages == 10
+    assert page.rows['sale_id'].tolist() == [f'S{i}' for i in range(200, 300)]
+
+def test_sales_page_does_not_parse_whole_csv(large_sales_service, count_reads):
+    large_sales_service.get_sales_page(page=1, page_size=50)
+    large_sales_service.get_sales_page(page=2, page_size=50)
+    # Only the one-off streaming conversion reads the CSV
+    assert len(count_reads) == 1
+    assert len(large_sales_service.frame_cache) == 0
+
+def test_sales_page_sorted_and_filtered(large_sales_service):
+    page = large_sales_service.get_sales_page(
+        page=1, page_size=20, sort_by='quantity', descending=True, store_id='ST-3', year=2021
+    )
+    expected = large_sales_service.load_sales_data()
+    expected = expected[(expected['store_id'] == 'ST-3') & (expected['sale_date'].dt.year == 2021)]
+    expected = expected.sort_values('quantity', ascending=False, kind='stable')
+    assert page.total_rows == len(expected)
+    assert page.rows['sale_id'].tolist() == expected['sale_id'].head(20).tolist()
+
+def test_sales_positions_are_kept_in_the_byte_bounded_cache(large_sales_service):
+    large_sales_service.get_sales_page(page=1, page_size=20, sort_by='quantity')
+    large_sales_service.get_sales_page(page=1, page_size=20, store_id='ST-3')
+    assert len(large_sales_service.positions_cache) == 2
+    assert large_sales_service.positions_cache.size_bytes == (1000 + 143) * 4  # int32 positions
+    assert len(large_sales_service.result_cache) == 2  # just the two pages
+
+def test_array_cache_evicts_by_size():
+    import numpy as np
+    cache = ArrayCache(max_bytes=100)
+    cache.get_or_compute('a', lambda: np.zeros(10, dtype=np.int32))
+    cache.get_or_compute('b', lambda: np.zeros(10, dtype=np.int32))
+    cache.get_or_compute('a', lambda: np.ones(10, dtype=np.int32))
+    cache.get_or_compute('c', lambda: np.zeros(10, dtype=np.int32))
+    assert cache.size_bytes == 80
+    assert cache.evictions == 1
+    assert cache.get_or_compute('a', lambda: None).sum() == 0  # kept: used more recently than b
+    assert cache.get_or_compute('huge', lambda: np.zeros(100, dtype=np.int32)).size == 100
+    assert len(cache) == 2
+
+def test_sales_page_past_the_end_is_empty(large_sales_service):
+    page = large_sales_service.get_sales_page(page=99, page_size=100)
+    assert page.rows.empty
+    assert page.total_rows == 1000
+
+def test_sales_page_rejects_unknown_sort_column(large_sales_service):
+    with pytest.raises(ValueError):
+        large_sales_service.get_sales_page(sort_by='price')
+
+@pytest.mark.parametrize("page, page_size", [(0, 100), (-1, 100), (1, 0)])
+def test_sales_page_rejects_non_positive_paging(large_sales_service, page, page_size):
+    with pytest.raises(ValueError, match="at least 1"):
+        large_sales_service.get_sales_page(page=page, page_size=page_size)
+
+def test_columnar_read_rows_keeps_requested_order(tmp_path):
+    df = pd.DataFrame({'x': range(10)})
+    df.to_csv(tmp_path / "x.csv", index=False)
+    path = columnar.convert_csv(tmp_path / "x.csv", tmp_path / "x.parquet", lambda chunk: chunk, row_group_size=3)
+    assert columnar.read_rows(path, [9, 0, 4, 5])['x'].tolist() == [9, 0, 4, 5]
+
+
+
+#--------------------------------Tests for the disk cache--------------------------------
+def test_fresh_service_starts_warm_from_disk(dataset_dir, count_reads):
+    expected = DashboardService(str(dataset_dir)).get_revenue_by_store(2023)
+    count_reads.clear()
+    restarted = DashboardService(str(dataset_dir))
+    pd.testing.assert_frame_equal(restarted.get_revenue_by_store(2023), expected)
+    assert count_reads == []
+    assert restarted.cache_stats()['disk_hits'] == 1
+
+def test_disk_cache_misses_after_data_change(dataset_dir):
+    DashboardService(str(dataset_dir)).get_quantity_by_store(2023)
+    summary = pd.read_csv(dataset_dir / "store_sales_summary.csv")
+    summary.loc[0, 'total_quantity'] = 100
+    summary.to_csv(dataset_dir / "store_sales_summary.csv", index=False)
+    restarted = DashboardService(str(dataset_dir))
+    assert restarted.get_quantity_by_store(2023)['total_quantity'].sum() == 108
+    assert restarted.cache_stats()['disk_hits'] == 0
+
+def test_disk_cache_drops_stale_versions(tmp_path):
+    cache = DiskResultCache(tmp_path / "results.sqlite")
+    cache.put(('q', 1), 'v1', 'old')
+    assert cache.get(('q', 1), 'v2') is DiskResultCache.MISSING
+    assert len(cache) == 0
+
+def test_disk_cache_keeps_most_recent_entries(tmp_path):
+    cache = DiskResultCache(tmp_path / "results.sqlite", max_entries=2)
+    for i in range(3):
+        cache.put(('q', i), 'v1', i)
+    assert len(cache) == 2
+    assert cache.get(('q', 2), 'v1') == 2
+
+def test_disk_cache_keys_numpy_scalars_like_python_ints(tmp_path):
+    cache = DiskResultCache(tmp_path / "results.sqlite")
+    cache.put(('get_revenue_by_store', (np.int64(2023),), ()), 'v1', 'cached')
+    assert cache.get(('get_revenue_by_store', (2023,), ()), 'v1') == 'cached'
+    assert cache.get(('get_revenue_by_store', [np.int32(2023)], ()), 'v1') == 'cached'
+
+#--------------------------------Tests for single-flight--------------------------------
+def run_concurrently(n, fn):
+    import threading
+    barrier = threading.Barrier(n)
+    results = [None] * n
+
+    def worker(i):
+        barrier.wait()
+        results[i] = fn()
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(n)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+def test_single_flight_collapses_concurrent_calls():
+    import time
+    flight = SingleFlight()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        time.sleep(0.2)
+        return 'value'
+
+    assert run_concurrently(4, lambda: flight.do('key', slow)) == ['value'] * 4
+    assert len(calls) == 1
+    assert flight.shared == 3
+
+def test_single_flight_shares_exceptions():
+    import time
+    flight = SingleFlight()
+
+    def failing():
+        time.sleep(0.2)
+        raise ValueError("bad data")
+
+    def call():
+        try:
+            flight.do('key', failing)
+        except ValueError as e:
+            return str(e)
+
+    assert run_concurrently(3, call) == ["bad data"] * 3
+    assert flight.executions == 1
+
+def test_concurrent_sessions_build_revenue_cube_once(service, count_reads):
+    cubes = run_concurrently(4, service.get_revenue_cube)
+    assert all(cube is cubes[0] for cube in cubes)
+    assert count_reads.count(service.dataset_path / "sales.csv") == 1
+
+#--------------------------------Tests for prefetch--------------------------------
+def test_prefetch_plan_covers_adjacent_years_and_top_stores(service):
+    plan = Prefetcher(service, max_workers=1, top_stores=2).plan(2023, 'ST-1')
+    assert ('get_revenue_by_store', (2022,)) in plan
+    assert ('get_store_monthly_trend', ('ST-1', 2022)) in plan
+    assert ('get_store_monthly_trend', ('ST-2', 2023)) not in plan  # not a top-2 store
+    assert ('get_store_monthly_trend', ('ST-3', 2023)) in plan
+    assert not any(args == (2024,) for _, args in plan)
+
+def test_prefetch_warms_result_cache(service):
+    prefetcher = Prefetcher(service, max_workers=2)
+    assert prefetcher.prefetch(2023, 'ST-1') > 0
+    prefetcher.wait(timeout=10)
+    misses = service.cache_stats()['misses']
+    service.get_revenue_by_category(2022)
+    service.get_store_monthly_trend('ST-1', 2022)
+    assert service.cache_stats()['misses'] == misses
+    prefetcher.shutdown()
+
+def test_prefetch_respects_pending_cap(service):
+    prefetcher = Prefetcher(service, max_workers=1, max_pending=2)
+    prefetcher.prefetch(2023, 'ST-1')
+    assert prefetcher.stats()['submitted'] <= 2
+    assert prefetcher.stats()['skipped'] > 0
+    prefetcher.shutdown()
+
+def test_prefetch_cancels_queued_work_when_data_changes(service, monkeypatch):
+    import threading
+    release = threading.Event()
+    quantity_by_store = service.get_quantity_by_store
+
+    def slow_quantity_by_store(year):
+        if year != 2023:  # the prefetched year blocks the only worker
+            release.wait(10)
+        return quantity_by_store(year)
+
+    monkeypatch.setattr(service, 'get_quantity_by_store', slow_quantity_by_store)
+    version = ['v1']
+    monkeypatch.setattr(service, 'data_version', lambda *names: tuple(version))
+
+    prefetcher = Prefetcher(service, max_workers=1)
+    prefetcher.prefetch(2023, 'ST-1')
+    version[0] = 'v2'
+    prefetcher.prefetch(2023, 'ST-1')  # new data version: queued tasks are dropped
+    release.set()
+    assert prefetcher.stats()['cancelled'] > 0
+    prefetcher.shutdown()
@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.downsample import downsample, lttb_indices, minmax_indices, point_budget
+
+#--------------------------------Fixtures--------------------------------
+@pytest.fixture
+def daily_series():
+    rng = np.random.default_rng(0)
+    dates = pd.date_range('2015-01-01', periods=50_000, freq='D')
+    quantity = rng.integers(0, 100, len(dates)).astype(float)
+    quantity[12_345] = 10_000  # a single spike
+    quantity[40_000] = -500    # and a single trough
+    return pd.DataFrame({'sale_date': dates, 'total_quantity': quantity})
+
+#--------------------------------Tests for downsample--------------------------------
+def test_point_budget_scales_with_width():
+    assert point_budget(600) == 1200
+    assert point_budget(10) == 100
+
+def test_short_series_is_unchanged(daily_series):
+    short = daily_series.head(50)
+    assert downsample(short, 'sale_date', 'total_quantity', 100) is short
+
+@pytest.mark.parametrize("method", ["minmax", "lttb"])
+def test_downsample_respects_budget_and_keeps_peaks(daily_series, method):
+    result = downsample(daily_series, 'sale_date', 'total_quantity', 1000, method=method)
+    assert len(result) <= 1002
+    assert result['total_quantity'].max() == 10_000
+    assert result['total_quantity'].min() == -500
+    assert result['sale_date'].is_monotonic_increasing
+    assert result['sale_date'].iloc[0] == daily_series['sale_date'].iloc[0]
+    assert result['sale_date'].iloc[-1] == daily_series['sale_date'].iloc[-1]
+
+def test_lttb_returns_exact_budget():
+    y = np.sin(np.linspace(0, 20, 5000))
+    indices = lttb_indices(np.arange(5000), y, 250)
+    assert len(indices) == 250
+    assert np.all(np.diff(indices) > 0)
+
+def test_minmax_keeps_bucket_extremes():
+    y = np.array([5, 1, 9, 3, 7, 2, 8, 4])
+    assert minmax_indices(y, 4).tolist() == [0, 1, 2, 5, 6, 7]
+
+def test_unknown_method_rejected(daily_series):
+    with pytest.raises(ValueError):
+        downsample(daily_series, 'sale_date', 'total_quantity', 100, method='mean')
+
+def test_output_size_is_independent_of_input_length(daily_series):
+    short = downsample(daily_series.head(5000), 'sale_date', 'total_quantity', 500)
+    long = downsample(daily_series, 'sale_date', 'total_quantity', 500)
+    assert abs(len(short) - len(long)) <= 2
@@ -0,0 +1,46 @@
+import csv
+import io
+import json
+import datetime
+import pytest
+from src.export import EXPORT_COLUMNS, format_rows
+
+ROWS = [
+    ('S1', datetime.date(2023, 6, 16), 'ST-1', 'P-1', 2),
+    ('S2', datetime.date(2023, 6, 17), 'ST-1', 'P-2', 1),
+    ('S3', datetime.date(2023, 7, 1), 'ST-2', 'P-1', 3),
+]
+
+#--------------------------------Tests for formatting--------------------------------
+def test_csv_has_header_and_rows():
+    text = "".join(format_rows(iter(ROWS), "csv"))
+    parsed = list(csv.reader(io.StringIO(text)))
+    assert parsed[0] == EXPORT_COLUMNS
+    assert parsed[1] == ['S1', '2023-06-16', 'ST-1', 'P-1', '2']
+    assert len(parsed) == 4
+
+def test_ndjson_one_object_per_line():
+    lines = "".join(format_rows(iter(ROWS), "ndjson")).splitlines()
+    assert [json.loads(line)['sale_id'] for line in lines] == ['S1', 'S2', 'S3']
+    assert json.loads(lines[2]) == {'sale_id': 'S3', 'sale_date': '2023-07-01', 'store_id': 'ST-2',
+                                    'product_id': 'P-1', 'quantity': 3}
+
+def test_output_is_chunked_by_batch_size():
+    chunks = list(format_rows(iter(ROWS), "ndjson", batch_size=2))
+    assert [chunk.count("\n") for chunk in chunks] == [2, 1]
+
+def test_rows_are_consumed_lazily():
+    consumed = []
+
+    def rows():
+        for row in ROWS:
+            consumed.append(row[0])
+            yield row
+
+    chunks = format_rows(rows(), "ndjson", batch_size=1)
+    next(chunks)
+    assert consumed == ['S1']
+
+def test_unknown_format_rejected():
+    with pytest.raises(ValueError):
+        list(format_rows(iter(ROWS), "xml"))
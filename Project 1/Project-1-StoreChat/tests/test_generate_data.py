@@ -0,0 +1,66 @@
+import pytest
+import pandas as pd
+from src.generate_data import (
+    generate_categories,
+    generate_products,
+    generate_stores,
+    generate_dataset,
+)
+from src.extract import process_products, process_sales
+from src.validateService import clean_dataframe
+
+#--------------------------------Fixtures--------------------------------
+@pytest.fixture
+def clean_dataset(tmp_path):
+    return generate_dataset(tmp_path / "clean", n_sales=2000, dirty_rate=0.0, chunk_size=500)
+
+@pytest.fixture
+def dirty_dataset(tmp_path):
+    return generate_dataset(tmp_path / "dirty", n_sales=5000, dirty_rate=0.1, chunk_size=2000)
+
+#--------------------------------Tests for dimension tables--------------------------------
+def test_generate_categories_matches_schema():
+    df = generate_categories()
+    assert list(df.columns) == ['category_id', 'category_name']
+    assert df['category_id'].is_unique
+
+def test_generate_products_matches_schema():
+    df = generate_products(n_products=20)
+    assert list(df.columns) == ['Product_ID', 'Product_Name', 'Category_ID', 'Launch_Date', 'Price']
+    assert len(df) == 20
+    assert (df['Price'] > 0).all()
+
+def test_generate_stores_matches_schema():
+    df = generate_stores(n_stores=10)
+    assert list(df.columns) == ['Store_ID', 'Store_Name', 'City', 'Country']
+    assert df['Store_ID'].tolist()[:2] == ['ST-1', 'ST-2']
+
+#--------------------------------Tests for full dataset--------------------------------
+def test_generate_dataset_row_counts(clean_dataset):
+    sales = pd.read_csv(clean_dataset['sales'])
+    assert list(sales.columns) == ['sale_id', 'sale_date', 'store_id', 'product_id', 'quantity']
+    assert len(sales) == 2000
+    assert sales['sale_id'].is_unique
+
+def test_generated_clean_data_passes_extract(tmp_path, clean_dataset):
+    products, product_results = process_products(clean_dataset['products'], tmp_path / "p.csv")
+    sales, sales_results = process_sales(clean_dataset['sales'], tmp_path / "s.csv")
+    assert product_results['negative_price'] == 0
+    assert sales_results['invalid_date_format'] == 0
+    assert sales_results['zero_or_negative_quantity'] == 0
+    assert len(sales) == 2000
+
+def test_generated_dirty_data_is_rejected(tmp_path, dirty_dataset):
+    sales, results = process_sales(dirty_dataset['sales'], tmp_path / "s.csv")
+    assert len(sales) < 5000
+    assert results['invalid_date_format'] > 0
+    assert results['zero_or_negative_quantity'] > 0
+
+    cleaned, rejected = clean_dataframe(pd.read_csv(tmp_path / "s.csv"), False)
+    assert len(rejected) > 0
+    assert len(cleaned) + len(rejected) == len(sales)
+
+def test_generate_dataset_is_deterministic(tmp_path):
+    first = generate_dataset(tmp_path / "a", n_sales=300, dirty_rate=0.05, seed=7)
+    second = generate_dataset(tmp_path / "b", n_sales=300, dirty_rate=0.05, seed=7)
+    pd.testing.assert_frame_equal(pd.read_csv(first['sales']), pd.read_csv(second['sales']))
@@ -0,0 +1,136 @@
+import logging
+import threading
+from src import logger
+
+class ListHandler(logging.Handler):
+    def __init__(self, block: threading.Event = None):
+        super().__init__()
+        self.messages = []
+        self.block = block
+
+    def emit(self, record):
+        if self.block is not None:
+            self.block.wait(5)
+        self.messages.append(record.getMessage())
+
+def make_logger(name, queue_handler):
+    test_logger = logging.getLogger(name)
+    test_logger.propagate = False
+    test_logger.handlers = [queue_handler]
+    test_logger.setLevel(logging.INFO)
+    return test_logger
+
+#--------------------------------Tests for queue logging--------------------------------
+def test_records_are_written_by_the_listener():
+    target = ListHandler()
+    queue_handler = logger.build_queue_logging([target], maxsize=100)
+    queue_handler.listener.start()
+    test_logger = make_logger("test.queue", queue_handler)
+    for i in range(10):
+        test_logger.info("row %d", i)
+    queue_handler.flush()
+    queue_handler.listener.stop()
+    assert target.messages == [f"row {i}" for i in range(10)]
+
+def test_full_queue_drops_without_blocking_and_reports():
+    release = threading.Event()
+    target = ListHandler(block=release)
+    queue_handler = logger.build_queue_logging([target], maxsize=3)
+    queue_handler.listener.start()
+    test_logger = make_logger("test.overflow", queue_handler)
+    for i in range(50):
+        test_logger.error("bad row %d", i)  # returns immediately even though the writer is stuck
+    assert queue_handler.dropped >= 40
+    release.set()
+    queue_handler.flush()
+    test_logger.error("after")
+    queue_handler.flush()
+    queue_handler.listener.stop()
+    assert any("dropped" in message for message in target.messages)
+    assert target.messages[-1] == "after"
+
+def test_module_logging_goes_through_one_queue_handler():
+    logger.log_info("queued message")
+    logger.configure()
+    names = [h.get_name() for h in logging.getLogger().handlers]
+    assert names.count(logger.QUEUE_HANDLER_NAME) == 1
+    logger.flush()
+
+#--------------------------------Tests for rate limiting--------------------------------
+def test_rate_limit_passes_first_n_then_every_kth():
+    rate_filter = logger.RateLimitFilter(first_n=3, every_k=10)
+    target = ListHandler()
+    test_logger = make_logger("test.rate", target)
+    test_logger.addFilter(rate_filter)
+    for i in range(103):
+        test_logger.error(f"Error inserting sale S{i}: duplicate key")
+    test_logger.info("progress 1")
+    test_logger.info("progress 2")
+
+    # 3 up front, then the 10th, 20th ... 100th after those
+    assert len(target.messages) == 3 + 10 + 2
+    assert target.messages[:3] == [f"Error inserting sale S{i}: duplicate key" for i in range(3)]
+    assert sum(rate_filter.suppressed.values()) == 90
+
+def test_rate_limited_stage_reports_suppressed_count(caplog):
+    with caplog.at_level(logging.INFO):
+        with logger.rate_limited("load_sales", first_n=2, every_k=0):
+            for i in range(500):
+                logger.log_error("Error inserting sale %s: %s", f"S{i}", "current transaction is aborted")
+            logger.log_warning("Slow batch")
+    errors = [r.getMessage() for r in caplog.records if r.levelno == logging.ERROR]
+    assert len(errors) == 3
+    assert errors[-1] == "load_sales: suppressed 498 similar errors like: Error inserting sale %s: %s"
+    assert not logging.getLogger(logger.logger.name).filters
+
+def test_rate_limited_works_as_decorator(caplog):
+    @logger.rate_limited("stage", first_n=1, every_k=0)
+    def noisy():
+        for _ in range(5):
+            logger.log_warning("row %s rejected", 1)
+
+    with caplog.at_level(logging.INFO):
+        noisy()
+    messages = [r.getMessage() for r in caplog.records]
+    assert messages == ["row 1 rejected", "stage: suppressed 4 similar warnings like: row %s rejected"]
+
+#--------------------------------Tests for spans--------------------------------
+def span_records(caplog):
+    return {r.span["span"]: r.span for r in caplog.records if hasattr(r, "span")}
+
+def test_spans_nest_and_record_rows_and_fields(caplog):
+    import pandas as pd
+
+    @logger.span("child")
+    def child():
+        return pd.DataFrame({"a": range(4)})
+
+    with caplog.at_level(logging.INFO):
+        with logger.span("parent", file="sales.csv") as parent:
+            child()
+            logger.annotate(rows=7, rejected=2)
+    spans = span_records(caplog)
+    assert spans["child"]["parent"] == spans["parent"]["id"]
+    assert spans["child"]["rows"] == 4
+    assert spans["parent"]["rows"] == 7
+    assert spans["parent"]["fields"] == {"file": "sales.csv", "rejected": 2}
+    assert spans["parent"]["start"] <= spans["child"]["start"] <= spans["child"]["end"] <= spans["parent"]["end"]
+    assert spans["parent"]["parent"] is None
+
+def test_span_records_failures(caplog):
+    with caplog.at_level(logging.INFO):
+        try:
+            with logger.span("broken"):
+                raise KeyError("sale_id")
+        except KeyError:
+            pass
+    span = span_records(caplog)["broken"]
+    assert span["status"] == "error"
+    assert "KeyError" in span["error"]
+
+def test_span_formatter_writes_json():
+    import json
+    import numpy as np
+    record = logging.LogRecord("x", logging.INFO, __file__, 0, "SPAN", None, None)
+    record.span = {"span": "s", "rows": np.int64(3)}
+    assert json.loads(logger.SpanFormatter().format(record)) == {"span": "s", "rows": 3}
@@ -0,0 +1,134 @@
+import os
+import pytest
+import pandas as pd
+
+# These tests drop and recreate the sales table in the database named by the
+# PG* environment variables, so they only run when explicitly enabled.
+pytestmark = pytest.mark.skipif(
+    not os.getenv("STORECHAT_PG_TESTS"),
+    reason="set STORECHAT_PG_TESTS=1 to run against a scratch PostgreSQL database"
+)
+
+PARTITIONS_QUERY = """
+    SELECT inhrelid::regclass::text AS name FROM pg_inherits
+    WHERE inhparent = 'sales'::regclass ORDER BY 1
+"""
+
+#--------------------------------Fixtures--------------------------------
+@pytest.fixture(scope="module")
+def partitioned(pg, dataset_dir):
+    """Load the wide layout, snapshot it, then migrate to the partitioned layout"""
+    from src import repo
+    with pg.loaded(dataset_dir, "wide"):
+        wide = pg.sales()
+        repo.init_db("partitioned", "time_range")
+        yield dataset_dir, wide
+
+#--------------------------------Tests for the partitioned layout--------------------------------
+def test_migration_moves_every_sale_into_monthly_partitions(pg, partitioned):
+    _, wide = partitioned
+    pd.testing.assert_frame_equal(wide, pg.sales(), check_dtype=False)
+    months = pd.to_datetime(wide['sale_date']).dt.to_period('M').unique()
+    expected = sorted(f"sales_y{m.year:04d}m{m.month:02d}" for m in months)
+    assert pg.query(PARTITIONS_QUERY)['name'].tolist() == expected
+
+def test_init_db_is_repeatable_on_the_partitioned_layout(partitioned):
+    from src import repo
+    repo.init_db("partitioned", "time_range")
+    with repo.get_conn() as conn, conn.cursor() as cur:
+        assert repo.sales_layout(cur) == "partitioned"
+        cur.execute("SELECT indexname FROM pg_indexes WHERE tablename = 'sales_y2020m03'")
+        assert {"sales_y2020m03_store_id_sale_date_quantity_product_id_idx"} <= {n for n, in cur.fetchall()}
+
+def test_loader_creates_partitions_on_demand(pg, partitioned):
+    from src import repo
+    _, wide = partitioned
+    partitions = pg.query(PARTITIONS_QUERY)['name'].tolist()
+    pg.execute("DROP TABLE " + ", ".join(partitions))
+    repo.load_sales()
+    assert pg.query(PARTITIONS_QUERY)['name'].tolist() == partitions
+    pd.testing.assert_frame_equal(wide, pg.sales(), check_dtype=False)
+
+def test_replace_month_swaps_one_partition(pg, partitioned):
+    from src import repo
+    from src import readers
+    dataset_dir, wide = partitioned
+    sales = readers.read_dataset("sales_processed", dataset_dir=str(dataset_dir))
+    june = sales[(sales['sale_date'].dt.year == 2022) & (sales['sale_date'].dt.month == 6)]
+    before = pg.query("SELECT sale_month, SUM(quantity) AS units FROM sales WHERE sale_year = 2022 GROUP BY 1 ORDER BY 1")
+
+    assert repo.replace_sales_month(2022, 6, june.assign(quantity=june['quantity'] * 2)) == len(june)
+    after = pg.query("SELECT sale_month, SUM(quantity) AS units FROM sales WHERE sale_year = 2022 GROUP BY 1 ORDER BY 1")
+    changed = after.set_index('sale_month')['units'] - before.set_index('sale_month')['units']
+    assert changed.drop(6).eq(0).all()
+    assert changed[6] == june['quantity'].sum()
+    assert "sales_y2022m06" in pg.query(PARTITIONS_QUERY)['name'].tolist()
+    assert pg.query("SELECT to_regclass('sales_y2022m06_new') IS NULL AS gone")['gone'].iloc[0]
+
+    # Replace it again from sales_processed.csv to restore the original rows
+    repo.replace_sales_month(2022, 6)
+    pd.testing.assert_frame_equal(wide, pg.sales(), check_dtype=False)
+
+def test_replace_month_indexes_the_new_partition_before_the_swap(pg, partitioned, monkeypatch):
+    from src import repo
+    staged = {}
+    detach_sales_month = repo.detach_sales_month
+
+    def inspecting_detach(cur, year, month):
+        cur.execute("""
+            SELECT (SELECT COUNT(*) FROM pg_index WHERE indrelid = 'sales_y2022m07_new'::regclass),
+                   (SELECT COUNT(*) FROM pg_constraint WHERE conrelid = 'sales_y2022m07_new'::regclass AND contype = 'f')
+        """)
+        staged['indexes'], staged['foreign_keys'] = cur.fetchone()
+        return detach_sales_month(cur, year, month)
+
+    monkeypatch.setattr(repo, "detach_sales_month", inspecting_detach)
+    repo.replace_sales_month(2022, 7)
+    parent_indexes = pg.query("SELECT COUNT(*) AS n FROM pg_index WHERE indrelid = 'sales'::regclass")['n'].iloc[0]
+    assert staged == {'indexes': parent_indexes, 'foreign_keys': 2}
+
+    # The attach adopted the staged indexes and foreign keys rather than building new ones
+    indexes = pg.query("""
+        SELECT c.relname, p.inhparent IS NOT NULL AS attached
+        FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid LEFT JOIN pg_inherits p ON p.inhrelid = i.indexrelid
+        WHERE i.indrelid = 'sales_y2022m07'::regclass
+    """)
+    assert len(indexes) == parent_indexes and indexes['attached'].all()
+    assert indexes['relname'].str.startswith('sales_y2022m07_').all() and not indexes['relname'].str.contains('_new').any()
+    foreign_keys = pg.query("""
+        SELECT conparentid <> 0 AS inherited FROM pg_constraint
+        WHERE conrelid = 'sales_y2022m07'::regclass AND contype = 'f'
+    """)
+    assert len(foreign_keys) == 2 and foreign_keys['inherited'].all()
+
+def test_year_queries_only_scan_that_years_partitions(partitioned):
+    from src import repo
+    from src.export import EXPORT_QUERY
+    with repo.get_conn() as conn, conn.cursor() as cur:
+        cur.execute("EXPLAIN (FORMAT JSON) " + EXPORT_QUERY, {"store_id": "ST-3", **repo.sales_date_range(2021)})
+        plan = cur.fetchone()[0][0]["Plan"]
+
+    def relations(node):
+        if "Relation Name" in node:
+            yield node["Relation Name"]
+        for child in node.get("Plans", []):
+            yield from relations(child)
+
+    scanned = set(relations(plan))
+    assert scanned and all(name.startswith("sales_y2021m") for name in scanned)
+
+def test_dashboard_queries_match_csv_on_the_partitioned_layout(partitioned):
+    from src.dashboard_service import create_dashboard_service
+    dataset_dir, _ = partitioned
+    csv_service = create_dashboard_service("csv", dataset_path=str(dataset_dir))
+    pg_service = create_dashboard_service("postgres", dataset_path=str(dataset_dir), disk_cache=False)
+    for csv_result, pg_result in [
+        (csv_service.get_revenue_by_store(2021), pg_service.get_revenue_by_store(2021)),
+        (csv_service.get_revenue_by_month(2022, 'ST-3'), pg_service.get_revenue_by_month(2022, 'ST-3')),
+        (csv_service.get_daily_sales('ST-5', 2020), pg_service.get_daily_sales('ST-5', 2020)),
+        (csv_service.top_n('category_id', 'transactions', '2023-Q1', 5),
+         pg_service.top_n('category_id', 'transactions', '2023-Q1', 5)),
+    ]:
+        pd.testing.assert_frame_equal(csv_result.reset_index(drop=True), pg_result.reset_index(drop=True),
+                                      check_dtype=False, check_exact=False, rtol=1e-9)
+    assert any(name.startswith("sales_y") for name, *_ in pg_service.data_version())
@@ -0,0 +1,123 @@
+import logging
+import threading
+import pytest
+from src import logger, pipeline
+from src.pipeline import Stage, StageCache, run_pipeline
+
+def make_stages(tmp_path, calls, barrier=None):
+    """raw.csv -> a (writes a.csv) -> c; b independent; c depends on a and b"""
+    raw = tmp_path / "raw.csv"
+    if not raw.exists():
+        raw.write_text("x\n1\n")
+
+    def step(name, write=None):
+        def run():
+            if barrier is not None and name in ("a", "b"):
+                barrier.wait(timeout=5)
+            calls.append(name)
+            if write:
+                (tmp_path / write).write_text(raw.read_text())
+        return run
+
+    return [
+        Stage("a", step("a", "a.csv"), inputs=(str(raw),), outputs=(str(tmp_path / "a.csv"),)),
+        Stage("b", step("b")),
+        Stage("c", step("c"), inputs=(str(tmp_path / "a.csv"),), deps=("a", "b")),
+    ]
+
+#--------------------------------Tests for the pipeline runner--------------------------------
+def test_independent_stages_run_concurrently(tmp_path):
+    calls = []
+    # a and b each wait for the other; a serial runner would time out here
+    barrier = threading.Barrier(2)
+    results = run_pipeline(make_stages(tmp_path, calls, barrier), StageCache(tmp_path / "state.json"), jobs=2)
+    assert {r["status"] for r in results.values()} == {"ran"}
+    assert calls[-1] == "c"
+
+def test_unchanged_stages_are_cached(tmp_path):
+    calls = []
+    run_pipeline(make_stages(tmp_path, calls), StageCache(tmp_path / "state.json"))
+    calls.clear()
+    results = run_pipeline(make_stages(tmp_path, calls), StageCache(tmp_path / "state.json"))
+    assert calls == []
+    assert {r["status"] for r in results.values()} == {"cached"}
+
+def test_changed_input_reruns_stage_and_dependents(tmp_path):
+    calls = []
+    run_pipeline(make_stages(tmp_path, calls), StageCache(tmp_path / "state.json"))
+    (tmp_path / "raw.csv").write_text("x\n2\n")
+    calls.clear()
+    results = run_pipeline(make_stages(tmp_path, calls), StageCache(tmp_path / "state.json"))
+    assert sorted(calls) == ["a", "c"]
+    assert results["b"]["status"] == "cached"
+
+def test_missing_output_reruns_stage(tmp_path):
+    calls = []
+    run_pipeline(make_stages(tmp_path, calls), StageCache(tmp_path / "state.json"))
+    (tmp_path / "a.csv").unlink()
+    calls.clear()
+    run_pipeline(make_stages(tmp_path, calls), StageCache(tmp_path / "state.json"))
+    assert "a" in calls
+
+def test_force_reruns_named_stage_and_downstream(tmp_path):
+    calls = []
+    run_pipeline(make_stages(tmp_path, calls), StageCache(tmp_path / "state.json"))
+    calls.clear()
+    run_pipeline(make_stages(tmp_path, calls), StageCache(tmp_path / "state.json"), force={"b"})
+    assert sorted(calls) == ["b", "c"]
+    calls.clear()
+    run_pipeline(make_stages(tmp_path, calls), StageCache(tmp_path / "state.json"), force=True)
+    assert sorted(calls) == ["a", "b", "c"]
+
+def test_failed_stage_skips_dependents(tmp_path):
+    calls = []
+    stages = make_stages(tmp_path, calls)
+    stages[1] = Stage("b", lambda: 1 / 0)
+    results = run_pipeline(stages, StageCache(tmp_path / "state.json"))
+    assert results["b"]["status"] == "failed"
+    assert "ZeroDivisionError" in results["b"]["error"]
+    assert results["c"]["status"] == "skipped"
+    assert results["a"]["status"] == "ran"
+    assert "c" not in calls
+
+def test_concurrent_rate_limited_stages_sample_their_own_records(tmp_path, caplog):
+    barrier = threading.Barrier(2)
+
+    def noisy_stage(name, count):
+        @logger.rate_limited(name, first_n=2, every_k=0)
+        def run():
+            barrier.wait(timeout=5)  # both stages have their filters installed before either logs
+            for i in range(count):
+                logger.log_error(f"{name}: bad row {i}")
+            barrier.wait(timeout=5)
+        return Stage(name, run)
+
+    with caplog.at_level(logging.INFO):
+        results = run_pipeline([noisy_stage("load_stores", 50), noisy_stage("load_sales", 300)],
+                               StageCache(tmp_path / "state.json"), jobs=2)
+    assert {r["status"] for r in results.values()} == {"ran"}
+    errors = [r.getMessage() for r in caplog.records if r.levelno == logging.ERROR]
+    for name, count in (("load_stores", 50), ("load_sales", 300)):
+        assert [m for m in errors if m.startswith(f"{name}: bad row")] == [f"{name}: bad row {i}" for i in range(2)]
+        assert f"{name}: suppressed {count - 2} similar errors like: {name}: bad row #" in errors
+
+def test_cycles_and_unknown_dependencies_are_rejected():
+    with pytest.raises(ValueError, match="cycle"):
+        pipeline.check_dag([Stage("a", print, deps=("b",)), Stage("b", print, deps=("a",))])
+    with pytest.raises(ValueError, match="unknown"):
+        pipeline.check_dag([Stage("a", print, deps=("missing",))])
+
+def test_storechat_dag_orders_loads_by_foreign_keys(tmp_path, monkeypatch):
+    from src import repo
+    monkeypatch.setattr(repo, "DATASET_DIR", repo.DATASET_DIR)
+    stages = {stage.name: stage for stage in pipeline.storechat_stages(str(tmp_path))}
+    pipeline.check_dag(list(stages.values()))
+    assert "load_categories" in stages["load_products"].deps
+    assert {"load_stores", "load_products"} <= set(stages["load_sales"].deps)
+    assert stages["extract_products"].deps == () and stages["extract_sales"].deps == ()
+
+def test_summary_lists_every_stage(tmp_path):
+    results = run_pipeline(make_stages(tmp_path, []), StageCache(tmp_path / "state.json"))
+    summary = pipeline.format_summary(results, 1.5)
+    assert all(name in summary for name in "abc")
+    assert "3 ran" in summary.splitlines()[-1]
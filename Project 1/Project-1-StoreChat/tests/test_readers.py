@@ -0,0 +1,84 @@
+import pandas as pd
+import pytest
+from src import readers
+
+ENGINES = ["c"] + (["pyarrow"] if readers.pa_csv is not None else [])
+
+@pytest.fixture
+def raw_sales(tmp_path):
+    path = tmp_path / "sales.csv"
+    path.write_text(
+        "sale_id,sale_date,store_id,product_id,quantity\n"
+        "S1,16-06-2023,ST-1,P-1,2\n"
+        "S2,bad-date,,P-2,\n"
+        "S3,01-07-2023,ST-2,P-1,5\n"
+    )
+    return path
+
+@pytest.fixture
+def raw_products(tmp_path):
+    path = tmp_path / "products.csv"
+    path.write_text(
+        "Product_ID,Product_Name,Category_ID,Launch_Date,Price\n"
+        "P-1,Product 1,CAT-6,2020-01-20,1283.0\n"
+        "P-2,Product 2,CAT-9,2021-07-10,\n"
+    )
+    return path
+
+#--------------------------------Tests for typed reading--------------------------------
+@pytest.mark.parametrize("engine", ENGINES)
+def test_typed_read_matches_default_read(raw_sales, engine):
+    df = readers.read_dataset("sales", raw_sales, engine=engine)
+    pd.testing.assert_frame_equal(df, pd.read_csv(raw_sales), check_dtype=False)
+    assert df['store_id'].isna().tolist() == [False, True, False]
+    assert pd.api.types.is_float_dtype(df['quantity'])
+    assert df['sale_date'].tolist()[1] == "bad-date"
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_columns_are_pruned_and_matched_case_insensitively(raw_products, engine):
+    df = readers.read_dataset("products", raw_products, columns=["product_id", "price", "not_there"], engine=engine)
+    assert df.columns.tolist() == ["Product_ID", "Price"]
+    assert df['Price'].dtype == "float64"
+    assert df['Product_ID'].tolist() == ["P-1", "P-2"]
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_processed_sales_dates_are_parsed(tmp_path, engine):
+    path = tmp_path / "sales_processed.csv"
+    path.write_text(
+        "sale_id,sale_date,store_id,product_id,quantity,sale_year,sale_month,sale_quarter,sale_day_of_week,sale_week\n"
+        "S1,2023-06-16,ST-1,P-1,2,2023.0,6.0,2.0,Friday,24\n"
+        "S2,,ST-1,P-2,1,,,,,\n"
+    )
+    df = readers.read_dataset("sales_processed", path, engine=engine)
+    assert pd.api.types.is_datetime64_any_dtype(df['sale_date'])
+    assert df['sale_date'].iloc[0] == pd.Timestamp("2023-06-16")
+    assert pd.isna(df['sale_date'].iloc[1])
+    assert df['sale_year'].iloc[0] == 2023.0
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_dirty_values_fall_back_to_an_untyped_read(raw_sales, engine):
+    raw_sales.write_text(raw_sales.read_text() + "S4,02-07-2023,ST-3,P-3,three\n")
+    df = readers.read_dataset("sales", raw_sales, engine=engine)
+    assert df['quantity'].tolist()[-1] == "three"
+    assert len(df) == 4
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_untyped_read_still_parses_dates(tmp_path, engine):
+    path = tmp_path / "sales_processed.csv"
+    path.write_text(
+        "sale_id,sale_date,store_id,product_id,quantity\n"
+        "S1,2023-06-16,ST-1,P-1,2\n"
+        "S2,16-06-2023,ST-1,P-1,three\n"
+    )
+    df = readers.read_dataset("sales_processed", path, engine=engine)
+    assert df['quantity'].tolist() == ["2", "three"]
+    assert df['sale_date'].iloc[0] == pd.Timestamp("2023-06-16")
+    assert pd.isna(df['sale_date'].iloc[1])
+
+def test_default_path_comes_from_dataset_dir(tmp_path, raw_sales):
+    assert len(readers.read_dataset("sales", dataset_dir=str(tmp_path))) == 3
+
+def test_read_header_handles_bom(tmp_path):
+    path = tmp_path / "stores.csv"
+    path.write_bytes("﻿Store_ID,Store_Name\nST-1,A\n".encode("utf-8"))
+    assert readers.read_header(path) == ["Store_ID", "Store_Name"]
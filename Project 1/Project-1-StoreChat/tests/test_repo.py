@@ -0,0 +1,57 @@
+import psycopg2
+import pytest
+from src import repo
+
+
+class FakeConn:
+    def __init__(self, closed=0, rollback_error=None):
+        self.closed = closed
+        self.rollback_error = rollback_error
+
+    def rollback(self):
+        if self.rollback_error:
+            raise self.rollback_error
+
+
+class FakePool:
+    def __init__(self, conn):
+        self.conn = conn
+        self.returned = []
+
+    def getconn(self):
+        return self.conn
+
+    def putconn(self, conn, close=False):
+        self.returned.append((conn, close))
+
+#--------------------------------Fixtures--------------------------------
+@pytest.fixture
+def fake_pool(monkeypatch):
+    def install(conn):
+        pool = FakePool(conn)
+        monkeypatch.setattr(repo, "_pool", pool)
+        return pool
+    return install
+
+#--------------------------------Tests for pooled_conn--------------------------------
+def test_connection_is_returned_open(fake_pool):
+    conn = FakeConn()
+    pool = fake_pool(conn)
+    with repo.pooled_conn() as borrowed:
+        assert borrowed is conn
+    assert pool.returned == [(conn, False)]
+
+def test_connection_that_fails_to_roll_back_is_closed_and_returned(fake_pool):
+    conn = FakeConn(rollback_error=psycopg2.OperationalError("server closed the connection"))
+    pool = fake_pool(conn)
+    with pytest.raises(ValueError):
+        with repo.pooled_conn():
+            raise ValueError("query failed")
+    assert pool.returned == [(conn, True)]
+
+def test_closed_connection_is_not_rolled_back(fake_pool):
+    conn = FakeConn(closed=2, rollback_error=AssertionError("rollback on a closed connection"))
+    pool = fake_pool(conn)
+    with repo.pooled_conn():
+        pass
+    assert pool.returned == [(conn, True)]
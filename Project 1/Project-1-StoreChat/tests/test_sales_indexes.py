@@ -0,0 +1,116 @@
+import os
+import pytest
+
+# These tests replace the sales indexes and rows in the database named by the
+# PG* environment variables, so they only run when explicitly enabled.
+pytestmark = pytest.mark.skipif(
+    not os.getenv("STORECHAT_PG_TESTS"),
+    reason="set STORECHAT_PG_TESTS=1 to run against a scratch PostgreSQL database"
+)
+
+SRC_DIR = os.path.join(os.path.dirname(__file__), '..', 'src')
+
+def plan_nodes(plan):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from plan_nodes(child)
+
+def index_scans(plans) -> set:
+    """(node type, index name) of every index scan in the EXPLAIN plans"""
+    return {(node["Node Type"], node["Index Name"])
+            for plan in plans for node in plan_nodes(plan) if "Index Name" in node}
+
+#--------------------------------Fixtures--------------------------------
+@pytest.fixture(scope="module")
+def time_range_db(pg):
+    """Six years of date-ordered sales under the time_range indexes"""
+    from src import repo
+    cwd = os.getcwd()
+    os.chdir(SRC_DIR)  # init_db reads ../schema.sql and ../indexes_*.sql
+    try:
+        repo.init_db("wide", "time_range")
+        pg.execute("""
+            TRUNCATE sales, store_sales_summary, products, categories, stores, rejected_fields CASCADE;
+            INSERT INTO categories VALUES ('CAT-1', 'Audio');
+            INSERT INTO stores SELECT 'ST-' || i, 'Store ' || i, 'City', 'Country' FROM generate_series(1, 20) i;
+            INSERT INTO products SELECT 'P-' || i, 'Product ' || i, 'CAT-1', DATE '2019-01-01', 10 + i, 'img'
+                FROM generate_series(1, 50) i;
+            INSERT INTO sales (sale_id, sale_date, store_id, product_id, quantity,
+                               sale_year, sale_month, sale_quarter, sale_day_of_week, sale_week)
+            SELECT 'S-' || i, d, 'ST-' || (1 + i % 20), 'P-' || (1 + i % 50), 1 + i % 10,
+                   EXTRACT(YEAR FROM d), EXTRACT(MONTH FROM d), EXTRACT(QUARTER FROM d),
+                   to_char(d, 'FMDay'), EXTRACT(WEEK FROM d)
+            FROM generate_series(1, 200000) i, LATERAL (SELECT DATE '2019-01-01' + i * 2190 / 200000 AS d) day;
+        """)
+        pg.execute("VACUUM (ANALYZE) sales", autocommit=True)
+        yield
+    finally:
+        pg.execute("TRUNCATE sales, store_sales_summary, products, categories, stores, rejected_fields CASCADE")
+        repo.init_db("wide", "btree")
+        os.chdir(cwd)
+
+@pytest.fixture
+def explained(time_range_db, tmp_path):
+    """A PostgresDashboardService that records the EXPLAIN plan of every query it runs"""
+    import json
+    from psycopg2 import sql
+    from src import repo
+    from src.dashboard_pg import PostgresDashboardService
+
+    class ExplainedService(PostgresDashboardService):
+        plans = []
+
+        def _query(self, query, params=None):
+            query = query if isinstance(query, sql.Composable) else sql.SQL(query)
+            with repo.pooled_conn() as conn, conn.cursor() as cur:
+                cur.execute(sql.SQL("EXPLAIN (FORMAT JSON) ") + query, params)
+                plan = cur.fetchone()[0]
+            self.plans.append((json.loads(plan) if isinstance(plan, str) else plan)[0]["Plan"])
+            return super()._query(query, params)
+
+    return ExplainedService(dataset_path=str(tmp_path), disk_cache=False)
+
+def uncached(service, name, *args):
+    from src.dashboard_pg import PostgresDashboardService
+    service.plans.clear()
+    getattr(PostgresDashboardService, name).__wrapped__(service, *args)
+    return index_scans(service.plans)
+
+#--------------------------------Tests for the time-range indexes--------------------------------
+def test_time_range_option_replaces_the_date_and_store_btrees(time_range_db):
+    from src import repo
+    with repo.get_conn() as conn, conn.cursor() as cur:
+        cur.execute("SELECT indexname FROM pg_indexes WHERE tablename = 'sales'")
+        names = {name for name, in cur.fetchall()}
+    assert {"idx_sales_date_brin", "idx_sales_store_date"} <= names
+    assert not {"idx_sales_date", "idx_sales_store"} & names
+
+@pytest.mark.parametrize("name, args", [
+    ("get_daily_sales", ("ST-3", 2021)),
+    ("get_revenue_by_month", (2021, "ST-3")),
+])
+def test_store_over_a_year_is_an_index_only_scan(explained, name, args):
+    assert ("Index Only Scan", "idx_sales_store_date") in uncached(explained, name, *args)
+
+def test_store_count_is_an_index_only_scan(explained):
+    explained.plans.clear()
+    explained._count_sales("ST-3", 2021)
+    assert ("Index Only Scan", "idx_sales_store_date") in index_scans(explained.plans)
+
+@pytest.mark.parametrize("name, args", [
+    ("top_n", ("store_id", "revenue", "2021-06", 5)),
+    ("top_n", ("product_id", "units", "2022-Q3", 5)),
+    ("get_revenue_by_store", (2021,)),
+])
+def test_all_stores_over_a_window_use_the_brin_index(explained, name, args):
+    assert ("Bitmap Index Scan", "idx_sales_date_brin") in uncached(explained, name, *args)
+
+def test_export_for_a_store_and_year_uses_the_covering_index(time_range_db):
+    from psycopg2 import sql
+    from src import repo
+    from src.export import EXPORT_QUERY
+    with repo.pooled_conn() as conn, conn.cursor() as cur:
+        cur.execute(sql.SQL("EXPLAIN (FORMAT JSON) ") + sql.SQL(EXPORT_QUERY),
+                    {"store_id": "ST-3", **repo.sales_date_range(2021)})
+        plan = cur.fetchone()[0][0]["Plan"]
+    assert {node.get("Index Name") for node in plan_nodes(plan)} & {"idx_sales_store_date"}
@@ -0,0 +1,70 @@
+import os
+import pytest
+import pandas as pd
+
+# These tests drop and recreate the sales table in the database named by the
+# PG* environment variables, so they only run when explicitly enabled.
+pytestmark = pytest.mark.skipif(
+    not os.getenv("STORECHAT_PG_TESTS"),
+    reason="set STORECHAT_PG_TESTS=1 to run against a scratch PostgreSQL database"
+)
+
+#--------------------------------Fixtures--------------------------------
+@pytest.fixture(scope="module")
+def wide_then_compact(pg, dataset_dir):
+    """Load the wide layout, snapshot it, then migrate to the compact layout"""
+    from src import repo
+    with pg.loaded(dataset_dir, "wide"):
+        wide = pg.sales()
+        repo.init_db("compact")
+        yield dataset_dir, wide
+
+#--------------------------------Tests for the compact layout--------------------------------
+def test_migration_keeps_every_sale_and_derived_column(pg, wide_then_compact):
+    _, wide = wide_then_compact
+    compact = pg.sales()
+    assert len(wide) > 0
+    pd.testing.assert_frame_equal(wide, compact, check_dtype=False)
+
+def test_init_db_is_repeatable_on_the_compact_layout(wide_then_compact):
+    from src import repo
+    repo.init_db("compact")
+    repo.init_db("wide")  # schema.sql alone must not trip over the view
+    with repo.get_conn() as conn, conn.cursor() as cur:
+        assert repo.sales_layout(cur) == "compact"
+
+def test_loader_writes_keys_into_the_compact_table(pg, wide_then_compact):
+    from src import repo
+    _, wide = wide_then_compact
+    pg.execute("TRUNCATE sales_compact")
+    repo.load_sales()
+    pd.testing.assert_frame_equal(wide, pg.sales(), check_dtype=False)
+    keys = pg.query("SELECT COUNT(*) AS n, MAX(store_key) AS top FROM store_keys")
+    assert keys['n'].iloc[0] == keys['top'].iloc[0]  # reloading did not burn key values
+
+def test_compact_rows_are_narrower(pg, wide_then_compact):
+    widths = pg.query("""
+        SELECT (SELECT AVG(pg_column_size(s.*))::float8 FROM sales_compact s) AS compact,
+               (SELECT AVG(pg_column_size(w.*))::float8 FROM (
+                    SELECT sale_id, sale_date, store_id, product_id, quantity, sale_year::int,
+                           sale_month::int, sale_quarter, sale_day_of_week, sale_week, now()::timestamp
+                    FROM sales) w) AS wide
+    """)
+    assert widths['compact'].iloc[0] < 0.7 * widths['wide'].iloc[0]
+
+def test_dashboard_queries_match_csv_on_the_compact_layout(wide_then_compact):
+    from src.dashboard_service import create_dashboard_service
+    dataset_dir, _ = wide_then_compact
+    csv_service = create_dashboard_service("csv", dataset_path=str(dataset_dir))
+    pg_service = create_dashboard_service("postgres", dataset_path=str(dataset_dir))
+    for csv_result, pg_result in [
+        (csv_service.get_revenue_by_store(2021), pg_service.get_revenue_by_store(2021)),
+        (csv_service.get_revenue_by_month(2022, 'ST-3'), pg_service.get_revenue_by_month(2022, 'ST-3')),
+        (csv_service.get_daily_sales('ST-5', None), pg_service.get_daily_sales('ST-5', None)),
+        (csv_service.top_n('product_id', 'units', '2022-Q3', 5), pg_service.top_n('product_id', 'units', '2022-Q3', 5)),
+    ]:
+        pd.testing.assert_frame_equal(csv_result.reset_index(drop=True), pg_result.reset_index(drop=True),
+                                      check_dtype=False, check_exact=False, rtol=1e-9)
+    page = pg_service.get_sales_page(page=1, page_size=20, sort_by='sale_date', store_id='ST-4')
+    assert (page.rows['store_id'] == 'ST-4').all()
+    assert any(name == 'sales_compact' for name, *_ in pg_service.data_version())
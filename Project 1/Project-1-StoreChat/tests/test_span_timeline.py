@@ -0,0 +1,32 @@
+import json
+from src import span_timeline
+
+SPANS = [
+    {"span": "extract.process_sales", "id": "1-1", "parent": None, "start": 100.0, "end": 101.0,
+     "duration_s": 1.0, "rows": 10, "status": "ok", "pid": 1, "thread": "MainThread", "fields": {}},
+    {"span": "extract.read_csv", "id": "1-2", "parent": "1-1", "start": 100.1, "end": 100.3,
+     "duration_s": 0.2, "rows": 12, "status": "ok", "pid": 1, "thread": "MainThread", "fields": {"file": "sales.csv"}},
+    {"span": "extract.deduplicate_sales", "id": "1-3", "parent": "1-1", "start": 100.5, "end": 100.6,
+     "duration_s": 0.1, "rows": None, "status": "error", "error": "KeyError: 'sale_id'",
+     "pid": 1, "thread": "MainThread", "fields": {}},
+]
+
+def test_load_spans_skips_non_span_lines(tmp_path):
+    path = tmp_path / "spans.jsonl"
+    path.write_text("\n".join([json.dumps(SPANS[0]), "not json", json.dumps({"other": 1}), ""]))
+    assert span_timeline.load_spans(path) == [SPANS[0]]
+
+def test_trace_events_are_complete_events_in_microseconds():
+    events = span_timeline.to_trace_events(SPANS)["traceEvents"]
+    assert [e["name"] for e in events] == ["extract.process_sales", "extract.read_csv", "extract.deduplicate_sales"]
+    read = events[1]
+    assert read["ph"] == "X"
+    assert read["ts"] == 100_100_000 and read["dur"] == 200_000
+    assert read["args"] == {"file": "sales.csv", "status": "ok", "rows": 12}
+    assert events[2]["args"]["error"] == "KeyError: 'sale_id'"
+
+def test_render_tree_indents_children():
+    lines = span_timeline.render_tree(SPANS).splitlines()
+    assert lines[0].startswith("extract.process_sales  1000.0 ms  10 rows")
+    assert lines[1].startswith("  extract.read_csv")
+    assert lines[2].endswith("FAILED")
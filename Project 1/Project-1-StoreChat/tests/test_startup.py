@@ -0,0 +1,47 @@
+import os
+import sys
+import subprocess
+import pytest
+
+SRC_DIR = os.path.join(os.path.dirname(__file__), '..', 'src')
+# Import-time budget for the command-line modules, in milliseconds
+STARTUP_BUDGET_MS = float(os.getenv("STARTUP_BUDGET_MS", "200"))
+HEAVY_MODULES = ("pandas", "numpy", "plotly", "streamlit", "pyarrow")
+
+
+def import_profile(module: str, cwd=SRC_DIR, env=None) -> dict:
+    """`python -X importtime -c "import module"` as {module name: cumulative microseconds}"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=cwd, env=env, capture_output=True, text=True, check=True,
+    )
+    profile = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        profile[name.strip()] = int(cumulative)
+    return profile
+
+#--------------------------------Tests for startup cost--------------------------------
+@pytest.mark.parametrize("module", ["logger", "repo", "export", "span_timeline", "pipeline"])
+def test_cli_modules_import_within_budget(module):
+    best_ms = min(import_profile(module)[module] for _ in range(3)) / 1000
+    assert best_ms < STARTUP_BUDGET_MS, f"import {module} took {best_ms:.0f} ms"
+
+@pytest.mark.parametrize("module", ["logger", "repo", "export", "span_timeline", "pipeline"])
+def test_cli_modules_skip_heavy_imports(module):
+    imported = set(import_profile(module))
+    assert not imported & set(HEAVY_MODULES)
+
+def test_importing_logger_has_no_side_effects(tmp_path):
+    log_file = tmp_path / "logs" / "app.log"
+    env = {**os.environ, "LOG_FILE": str(log_file), "PYTHONPATH": os.path.abspath(SRC_DIR)}
+    script = (
+        "import threading, logger, logging; "
+        "assert threading.active_count() == 1; "
+        "assert not logging.getLogger().handlers; "
+        "logger.log_info('first use')"
+    )
+    subprocess.run([sys.executable, "-c", script], cwd=tmp_path, env=env, check=True)
+    assert "first use" in log_file.read_text()